@@ -0,0 +1,86 @@
+"""백테스트 엔진 벤치마크.
+
+합성 일봉으로 (연수 × 종목 수) 조합마다 이벤트 엔진과 벡터 엔진 시간을 재고,
+두 엔진의 거래 목록이 같은지 확인합니다. 기준 파일을 주면 느려진 조합이
+있을 때 종료 코드 1 로 끝나서 CI 에서 회귀를 잡을 수 있습니다.
+
+    python benchmarks/bench_backtest.py --years 1 5 --tickers 10 100
+    python benchmarks/bench_backtest.py --save-baseline bench_baseline.json
+    python benchmarks/bench_backtest.py --baseline bench_baseline.json --tolerance 1.3
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from turtle_trading.backtest import TRADING_DAYS, run_event, run_vectorized  # noqa: E402
+from turtle_trading.indicators import TurtleParams, build_panel  # noqa: E402
+from turtle_trading.synthetic import synthetic_universe  # noqa: E402
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='터틀 백테스트 엔진 벤치마크')
+    parser.add_argument('--years', type=int, nargs='+', default=[1, 5])
+    parser.add_argument('--tickers', type=int, nargs='+', default=[10, 100])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--skip-event', action='store_true', help='이벤트 엔진 생략 (큰 조합용)')
+    parser.add_argument('--baseline', help='비교할 기준 JSON')
+    parser.add_argument('--tolerance', type=float, default=1.25, help='기준 대비 허용 배수')
+    parser.add_argument('--save-baseline', help='이번 결과를 기준 JSON 으로 저장')
+    args = parser.parse_args(argv)
+
+    params = TurtleParams()
+    rows = []
+    failed = False
+
+    print(f"{'years':>5} {'tickers':>7} {'bars':>9} {'event(s)':>9} {'vector(s)':>9} {'speedup':>8} {'trades':>7} same")
+    for years in args.years:
+        for n_tickers in args.tickers:
+            panel = build_panel(synthetic_universe(n_tickers, years * TRADING_DAYS))
+            vec_time, vec = best_of(lambda: run_vectorized(panel, params), args.repeat)
+
+            event_time, same = float('nan'), None
+            if not args.skip_event:
+                event_time, event = best_of(lambda: run_event(panel, params), 1)
+                same = event.trades == vec.trades
+                failed |= not same
+
+            rows.append({'years': years, 'tickers': n_tickers, 'event': event_time, 'vectorized': vec_time})
+            print(f'{years:>5} {n_tickers:>7} {panel.close.size:>9,} {event_time:>9.3f} {vec_time:>9.3f} '
+                  f'{event_time / vec_time:>7.1f}x {len(vec.trades):>7} {"-" if same is None else same}')
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {(r['years'], r['tickers']): r for r in json.load(f)}
+        for row in rows:
+            base = baseline.get((row['years'], row['tickers']))
+            if base and row['vectorized'] > base['vectorized'] * args.tolerance:
+                print(f"회귀: {row['years']}년 × {row['tickers']}종목 "
+                      f"{base['vectorized']:.3f}s -> {row['vectorized']:.3f}s")
+                failed = True
+
+    if failed:
+        print('실패: 엔진 결과 불일치 또는 성능 회귀')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""시작 속도 벤치마크.
+
+새 인터프리터에서 모듈별 import 시간(``python -X importtime``)을 재고,
+turtle_trading 모듈을 import 해도 pykrx/plotly 같은 무거운 패키지가 딸려오지
+않는지 확인합니다. 첫 화면 경로(turtle_trading import → 합성 일봉으로 신호 분석
+→ 진입 신호 첫 페이지 → 첫 종목 차트 데이터)도 새 프로세스에서 잽니다.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --save-baseline startup_baseline.json
+    python benchmarks/bench_startup.py --baseline startup_baseline.json --tolerance 1.3
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    'numpy', 'pandas',
+    'turtle_trading.indicators', 'turtle_trading.screen', 'turtle_trading.lazy_render',
+    'turtle_trading.charting', 'turtle_trading.symbols', 'turtle_trading.position_store',
+    'pykrx.stock', 'plotly.graph_objects', 'streamlit',
+]
+# turtle_trading 을 import 할 때 딸려오면 안 되는 패키지
+DEFERRED = ['pykrx', 'plotly', 'matplotlib', 'lxml', 'bs4', 'requests']
+
+
+def _python(code, *flags):
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    return subprocess.run([sys.executable, *flags, '-c', code], capture_output=True, text=True,
+                          cwd=ROOT, env=env)
+
+
+def import_time(module, repeat=3):
+    """새 프로세스에서 ``module`` import 누적 시간(초), 설치돼 있지 않으면 None"""
+    best = None
+    for _ in range(repeat):
+        proc = _python(f'import {module}', '-X', 'importtime')
+        if proc.returncode != 0:
+            return None
+        for line in proc.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            parts = line.split('|')
+            if len(parts) == 3 and parts[2].strip() == module:
+                seconds = int(parts[1]) / 1e6
+                best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def leaked_modules(modules=None):
+    """turtle_trading 모듈을 모두 import 했을 때 같이 올라온 DEFERRED 패키지 목록"""
+    modules = modules or [m for m in MODULES if m.startswith('turtle_trading.')]
+    code = ('import sys\n' + ''.join(f'import {m}\n' for m in modules)
+            + f'print(",".join(m for m in {DEFERRED!r} if m in sys.modules))')
+    proc = _python(code)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+    return [m for m in proc.stdout.strip().split(',') if m]
+
+
+def first_screen_time(tickers=500, days=300):
+    """새 프로세스에서 첫 화면 경로에 걸린 시간(초, turtle_trading import 포함).
+
+    합성 일봉을 만드는 시간은 빼고, 신호 분석(scan_frames) → 진입 신호 첫 페이지
+    (paginate) → 첫 종목 차트 데이터(build_payload) 까지를 잽니다.
+    """
+    code = (
+        'import time\n'
+        'from turtle_trading.synthetic import synthetic_universe\n'
+        f'frames = synthetic_universe({tickers}, {days})\n'
+        'started = time.perf_counter()\n'
+        'from turtle_trading.charting import build_payload\n'
+        'from turtle_trading.indicators import scan_frames\n'
+        'from turtle_trading.lazy_render import paginate\n'
+        'results = scan_frames(frames)\n'
+        "page = paginate(results[results['진입신호']], 0)\n"
+        'build_payload(frames[results.iloc[0, 0]])\n'
+        'print(time.perf_counter() - started, page.total)\n'
+    )
+    proc = _python(code)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else '첫 화면 실패')
+    return float(proc.stdout.split()[0])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='시작 속도 벤치마크 (import 시간, 첫 화면까지 시간)')
+    parser.add_argument('--modules', nargs='+', default=MODULES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--screen-tickers', type=int, default=500,
+                        help='첫 화면 경로에 쓸 합성 종목 수 (0 이면 생략)')
+    parser.add_argument('--baseline', help='비교할 기준 JSON')
+    parser.add_argument('--tolerance', type=float, default=1.3, help='기준 대비 허용 배수')
+    parser.add_argument('--save-baseline', help='이번 결과를 기준 JSON 으로 저장')
+    args = parser.parse_args(argv)
+
+    failed = False
+    results = {}
+
+    print(f"{'module':<32} {'import(ms)':>10}")
+    for module in args.modules:
+        seconds = import_time(module, args.repeat)
+        if seconds is None:
+            print(f'{module:<32} {"-":>10}  (설치 안 됨)')
+            continue
+        results[module] = seconds
+        print(f'{module:<32} {seconds * 1000:>10.1f}')
+
+    leaked = leaked_modules()
+    print(f"지연 import 확인: {'통과' if not leaked else '실패 - ' + ', '.join(leaked)}")
+    failed |= bool(leaked)
+
+    if args.screen_tickers:
+        try:
+            results['first_screen'] = min(first_screen_time(args.screen_tickers) for _ in range(args.repeat))
+            print(f"{'first_screen':<32} {results['first_screen'] * 1000:>10.1f}")
+        except RuntimeError as e:
+            print(f"{'first_screen':<32} {'-':>10}  ({e})")
+            failed = True
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for name, seconds in results.items():
+            base = baseline.get(name)
+            if base and seconds > base * args.tolerance:
+                print(f'회귀: {name} {base * 1000:.1f}ms -> {seconds * 1000:.1f}ms')
+                failed = True
+
+    if failed:
+        print('실패: 무거운 모듈이 미리 import 되거나 시작 시간이 느려짐')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
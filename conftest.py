@@ -0,0 +1 @@
+# 저장소 루트를 sys.path 에 올려 tests/ 에서 turtle_trading 을 import 할 수 있게 함
@@ -0,0 +1,54 @@
+"""백테스트 엔진: 현금 한도와 두 엔진 결과 일치"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from turtle_trading.backtest import run_event, run_vectorized
+from turtle_trading.indicators import TurtleParams, build_panel
+from turtle_trading.synthetic import synthetic_universe
+
+
+@pytest.fixture(scope='module')
+def panel():
+    return build_panel(synthetic_universe(60, 750))
+
+
+def cash_path(trades, dates, capital):
+    """거래 목록으로 다시 계산한 봉별 현금 잔고"""
+    flows = pd.Series(0.0, index=dates)
+    for trade in trades:
+        for date, price, shares in trade.fills:
+            flows[date] -= price * shares
+        if trade.reason != '기간종료':
+            flows[trade.exit_date] += trade.exit_price * trade.shares
+    return capital + flows.cumsum()
+
+
+@pytest.mark.parametrize('capital', [10_000_000, 100_000_000, 1_000_000_000])
+@pytest.mark.parametrize('params', [TurtleParams(), TurtleParams(stop_multiple=1.5, risk_pct=0.01)])
+def test_engines_agree_under_cash_limit(panel, capital, params):
+    event = run_event(panel, params, capital)
+    vector = run_vectorized(panel, params, capital)
+
+    assert len(event.trades) > 0
+    assert event.trades == vector.trades
+    np.testing.assert_allclose(event.equity.to_numpy(), vector.equity.to_numpy())
+
+
+@pytest.mark.parametrize('engine', [run_event, run_vectorized])
+def test_cash_never_goes_negative(panel, engine):
+    capital = 100_000_000
+    result = engine(panel, TurtleParams(), capital)
+
+    cash = cash_path(result.trades, pd.DatetimeIndex(panel.dates), capital)
+    assert cash.min() >= -1e-6
+    # 종목이 많으면 한도가 실제로 걸림: 현금이 유닛 하나 값 아래로 떨어지는 구간이 있다
+    assert cash.min() < capital * TurtleParams().risk_pct
+
+
+def test_equity_matches_cash_plus_holdings(panel):
+    capital = 100_000_000
+    result = run_vectorized(panel, TurtleParams(), capital)
+    assert result.equity.iloc[0] == capital
+    assert (result.equity > 0).all()
@@ -0,0 +1,112 @@
+"""포지션 백업: CSV 왕복, 중복, 잘못된 행"""
+
+import io
+
+import pandas as pd
+import pytest
+
+from turtle_trading.backup import export_frame, export_positions, restore_positions
+from turtle_trading.position_store import STATUS_CLOSED, STATUS_OPEN, PositionStore
+
+
+def position(pid, **overrides):
+    row = {'포지션ID': pid, '종목코드': '000660', '종목명': 'SK하이닉스', '진입일': '2026-09-01',
+           '진입가': 100000.0, '현재가': 120000.0, '수량': 3, '투자금액': 300000.0,
+           'ATR(N)': 2500.5, '손절가': 95000.0, '다음매수가': 101250.0, '손익': 60000.0,
+           '손익률': 19.999999999999996, '상태': STATUS_OPEN}
+    row.update(overrides)
+    return row
+
+
+def export(store, **kwargs):
+    out = io.BytesIO()
+    export_positions(store, out, chunk_size=2, **kwargs)
+    out.seek(0)
+    return out
+
+
+def csv_file(rows):
+    out = io.BytesIO()
+    export_frame(pd.DataFrame(rows), out)
+    out.seek(0)
+    return out
+
+
+def test_csv_round_trip_is_exact():
+    source = PositionStore(':memory:')
+    source.add_many([position('a'), position('b', 종목코드='005930'),
+                     position('c', 상태=STATUS_CLOSED, 청산일='2026-10-01', 청산가=120000.0)])
+    target = PositionStore(':memory:')
+
+    report = restore_positions(target, export(source), chunk_size=2)
+
+    assert (report.read, report.inserted, report.duplicates, report.invalid_count) == (3, 3, 0, 0)
+    assert target.all() == source.all()
+    assert target.get('b')['종목코드'] == '005930'
+    assert target.get('a')['손익률'] == 19.999999999999996
+
+
+def test_export_closed_only():
+    store = PositionStore(':memory:')
+    store.add_many([position('a'), position('c', 상태=STATUS_CLOSED)])
+    frame = pd.read_csv(export(store, status=STATUS_CLOSED), dtype={'포지션ID': str})
+    assert list(frame['포지션ID']) == ['c']
+
+
+def test_duplicates_in_file_and_store():
+    store = PositionStore(':memory:')
+    store.add(position('a', 수량=7))
+    rows = [position('a'), position('b'), position('b', 수량=9), position('c'), position('b')]
+
+    progress = []
+    report = restore_positions(store, csv_file(rows), chunk_size=2, on_progress=progress.append)
+
+    assert (report.inserted, report.duplicates) == (2, 3)
+    assert store.get('a')['수량'] == 7          # 저장소 값이 우선
+    assert store.get('b')['수량'] == 3          # 파일 안에서는 처음 행이 우선
+    assert len(progress) == 3
+
+
+def test_invalid_rows_are_reported_not_inserted():
+    rows = [position('ok'),
+            position(''),
+            position('t', 종목코드='1234567'),
+            position('s', 상태='모름'),
+            position('q', 수량=1.5),
+            position('p', 진입가=0)]
+    store = PositionStore(':memory:')
+
+    report = restore_positions(store, csv_file(rows))
+
+    assert report.inserted == 1
+    assert report.invalid_count == 5
+    assert [line for line, _ in report.invalid] == [2, 3, 4, 5, 6]
+    assert report.invalid[0][1] == '포지션ID 없음'
+    assert store.get('t') is None
+
+
+def test_leading_zero_ticker_survives():
+    rows = [position('z', 종목코드='000020')]
+    store = PositionStore(':memory:')
+    restore_positions(store, csv_file(rows))
+    assert store.get('z')['종목코드'] == '000020'
+
+
+def test_missing_required_column_is_rejected():
+    frame = pd.DataFrame([position('a')]).drop(columns=['손절가'])
+    with pytest.raises(ValueError, match='손절가'):
+        restore_positions(PositionStore(':memory:'), csv_file(frame.to_dict('records')))
+
+
+@pytest.mark.parametrize('bad', [{'수량': float('inf')}, {'수량': float('-inf')},
+                                 {'진입가': float('inf')}, {'진입가': float('-inf')}])
+def test_infinite_values_are_reported_not_inserted(bad):
+    rows = [position('a'), position('b', **bad), position('c')]
+    store = PositionStore(':memory:')
+
+    report = restore_positions(store, csv_file(rows), chunk_size=2)
+
+    assert report.inserted == 2
+    assert report.invalid_count == 1
+    assert report.invalid[0][0] == 2
+    assert store.get('b') is None and store.get('c') is not None
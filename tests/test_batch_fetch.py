@@ -0,0 +1,188 @@
+"""batch_fetch 재시도/속도 제한과 캐시 경유 일괄 조회 (synthetic.FakeKrx 사용, 네트워크 없음)"""
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from turtle_trading import batch_fetch
+from turtle_trading.batch_fetch import (EmptyDataError, RateLimiter, attach, fetch_with_retry,
+                                        get_market_data_many)
+from turtle_trading.data_service import MarketDataService
+from turtle_trading.market_cache import OHLCVCache
+from turtle_trading.synthetic import FakeKrx
+
+INTRADAY = datetime(2026, 10, 16, 10, 0)
+
+
+class FlakyFetch:
+    """처음 ``failures`` 번은 ConnectionError, 그 뒤로는 FakeKrx 결과"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+        self.source = FakeKrx()
+
+    def __call__(self, ticker, days):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError('일시 오류')
+        return self.source.get_market_data(ticker, days)
+
+
+class CountingLimiter(RateLimiter):
+    """acquire 횟수를 세는 limiter"""
+
+    def __init__(self):
+        super().__init__(1000, burst=1000)
+        self.acquired = 0
+
+    def acquire(self):
+        self.acquired += 1
+        super().acquire()
+
+
+def test_retry_backs_off_exponentially():
+    sleeps = []
+    fetch = FlakyFetch(failures=3)
+    df, attempts = fetch_with_retry(fetch, '005930', 60, retries=3, backoff=0.5, sleep=sleeps.append)
+
+    assert attempts == 3 and fetch.calls == 4
+    assert not df.empty
+    # backoff * 2^n * (0.5 ~ 1.5)
+    for n, seconds in enumerate(sleeps):
+        assert 0.5 * 2 ** n * 0.5 <= seconds <= 0.5 * 2 ** n * 1.5
+
+
+def test_retry_gives_up_with_last_error():
+    sleeps = []
+    fetch = FlakyFetch(failures=10)
+    with pytest.raises(ConnectionError):
+        fetch_with_retry(fetch, '005930', 60, retries=2, sleep=sleeps.append)
+    assert fetch.calls == 3 and len(sleeps) == 2
+
+
+def test_empty_data_is_not_retried():
+    source = FakeKrx(missing={'999999'})
+    calls = []
+
+    def fetch(ticker, days):
+        calls.append(ticker)
+        return source.get_market_data(ticker, days)
+
+    with pytest.raises(EmptyDataError):
+        fetch_with_retry(fetch, '999999', 60, sleep=lambda s: None)
+    assert calls == ['999999']
+
+
+def test_rate_limiter_waits_for_token():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(10, burst=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        limiter.acquire()
+    # 버스트 2개는 바로, 나머지는 0.1초 간격
+    assert sleeps == pytest.approx([0.1, 0.1])
+    assert now[0] == pytest.approx(0.2)
+
+
+def test_many_retries_transient_failures():
+    source = FakeKrx(fail_rate=0.3, seed=1)
+    tickers = [f'{i:06d}' for i in range(20)]
+    result = get_market_data_many(source, tickers, days=60,
+                                  retries=10, sleep=lambda s: None)
+
+    assert result.ok and sorted(result.frames) == tickers
+    assert result.retries > 0
+    assert source.calls == len(tickers) + result.retries
+
+
+def test_many_reports_missing_tickers():
+    source = FakeKrx(missing={'000003'})
+    result = get_market_data_many(source, ['000001', '000003'])
+
+    assert list(result.frames) == ['000001']
+    assert isinstance(result.failures['000003'], EmptyDataError)
+
+
+def test_many_serves_cached_frames_without_fetching(tmp_path):
+    source = FakeKrx()
+    limiter = CountingLimiter()
+    cache = OHLCVCache(str(tmp_path), fetcher=source, limiter=limiter, clock=lambda: INTRADAY)
+    tickers = ['005930', '000660', '035420']
+
+    first = get_market_data_many(cache, tickers, days=60)
+    calls = source.calls
+    assert calls == len(tickers)
+
+    second = get_market_data_many(cache, tickers, days=60)
+    assert source.calls == calls
+    assert cache.hits == len(tickers)
+    # 속도 제한은 네트워크 조회에만
+    assert limiter.acquired == calls
+    for ticker in tickers:
+        pd.testing.assert_frame_equal(first.frames[ticker], second.frames[ticker])
+
+    # 장중이면 새 인스턴스도 디스크 캐시에서 읽고 최신 구간만 확인
+    reopened = OHLCVCache(str(tmp_path), fetcher=source, clock=lambda: INTRADAY)
+    third = get_market_data_many(reopened, tickers, days=60)
+    assert third.ok
+    assert source.calls == calls + len(tickers)
+
+
+def test_cached_reads_never_wait_for_limiter(tmp_path):
+    source = FakeKrx()
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    # 초당 8회 (1/8 초는 부동소수점으로 정확히 표현됨), 한 스레드로 돌려 대기 시간을 고정
+    limiter = RateLimiter(8, burst=1, clock=lambda: now[0], sleep=sleep)
+    cache = OHLCVCache(str(tmp_path), fetcher=source, limiter=limiter)
+    tickers = [f'{i:06d}' for i in range(30)]
+
+    get_market_data_many(cache, tickers, days=60, max_workers=1)
+    waited = sum(sleeps)
+    assert waited == pytest.approx(29 / 8)
+
+    for _ in range(5):
+        result = get_market_data_many(cache, tickers, days=60, max_workers=1)
+        assert result.ok
+    assert sum(sleeps) == waited
+    assert source.calls == len(tickers)
+
+
+def test_uncached_fetch_defaults_to_host_limiter(tmp_path, monkeypatch):
+    shared = CountingLimiter()
+    monkeypatch.setattr(batch_fetch, 'limiter_for', lambda *args, **kwargs: shared)
+    source = FakeKrx()
+    tickers = ['000001', '000002', '000003']
+
+    class TurtleSystem:
+        """캐시 없이 매번 네트워크로 가는 get_market_data"""
+
+        def get_market_data(self, ticker, days=60):
+            return source.get_market_data(ticker, days)
+
+    system = attach(TurtleSystem())
+    assert system.get_market_data_many(tickers).ok
+    assert shared.acquired == len(tickers)
+
+    # 캐시/공용 서비스 경유면 일괄 조회는 제한하지 않음 (캐시가 네트워크 조회 앞에서 직접 제한)
+    cache = OHLCVCache(str(tmp_path), fetcher=source, limiter=CountingLimiter(), clock=lambda: INTRADAY)
+    get_market_data_many(cache, tickers)
+    get_market_data_many(MarketDataService(cache.get_market_data), tickers)
+    assert shared.acquired == len(tickers)
+    assert cache.limiter.acquired == len(tickers)
+
+    # 캐시 없는 조회 앞의 공용 서비스는 미스가 네트워크로 가므로 제한
+    get_market_data_many(MarketDataService(TurtleSystem().get_market_data), tickers)
+    assert shared.acquired == 2 * len(tickers)
@@ -0,0 +1,90 @@
+"""차트 데이터: LTTB/구간 묶음 점 개수, 묶음 OHLC 값, 캐시 키와 LRU"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from turtle_trading.charting import ChartCache, bucket_ohlc, build_payload, lttb
+from turtle_trading.synthetic import business_days, synthetic_ohlcv
+
+
+def daily(bars, ticker='005930'):
+    return synthetic_ohlcv(ticker, business_days('2015-01-01', '2026-10-16')[-bars:])
+
+
+@pytest.mark.parametrize('n, threshold', [(1000, 100), (1000, 3), (401, 400), (50, 400)])
+def test_lttb_keeps_endpoints_within_threshold(n, threshold):
+    rng = np.random.default_rng(n)
+    y = np.cumsum(rng.normal(size=n))
+    keep = lttb(np.arange(n), y, threshold)
+
+    assert len(keep) == min(n, threshold)
+    assert keep[0] == 0 and keep[-1] == n - 1
+    assert (np.diff(keep) > 0).all()
+
+
+def test_lttb_picks_spike():
+    y = np.zeros(100)
+    y[37] = 10.0
+    assert 37 in lttb(np.arange(100), y, 10)
+
+
+def test_bucket_ohlc_values():
+    frame = daily(7)
+    out = bucket_ohlc(frame, 3)
+
+    assert len(out) == 3
+    assert list(out.index) == list(frame.index[[0, 3, 6]])
+    first = frame.iloc[:3]
+    assert out.iloc[0].tolist() == [first['시가'].iloc[0], first['고가'].max(), first['저가'].min(),
+                                    first['종가'].iloc[-1], first['거래량'].sum()]
+    # 마지막 묶음은 남은 한 봉
+    assert out.iloc[-1].tolist() == frame.iloc[-1].tolist()
+    assert bucket_ohlc(frame, 1) is frame
+
+
+@pytest.mark.parametrize('bars, max_points', [(2500, 400), (1000, 300), (250, 400)])
+def test_payload_point_counts(bars, max_points):
+    frame = daily(bars)
+    payload = build_payload(frame, max_points=max_points)
+
+    assert payload.bars == bars
+    assert len(payload.candles) <= max_points and len(payload.lines) <= max_points
+    assert len(payload.markers) <= max_points
+    # 처음과 마지막 봉은 항상 남음
+    for part in (payload.candles, payload.lines):
+        assert part.index[0] == frame.index[0]
+    assert payload.lines.index[-1] == frame.index[-1]
+    assert payload.lines['종가'].iloc[-1] == frame['종가'].iloc[-1]
+    assert payload.candles['종가'].iloc[-1] == frame['종가'].iloc[-1]
+    if bars <= max_points:
+        assert payload.bucket == 1 and len(payload.lines) == bars
+
+
+def test_intraday_last_bar_change_misses_cache():
+    cache = ChartCache()
+    frame = daily(300)
+    first = cache.get('005930', frame)
+    assert cache.get('005930', frame.copy()) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # 같은 날짜, 같은 봉 수에서 장중 종가만 바뀜
+    moved = frame.copy()
+    moved.iloc[-1, moved.columns.get_loc('종가')] += 10
+    second = cache.get('005930', moved)
+    assert second is not first and cache.misses == 2
+    assert second.lines['종가'].iloc[-1] == moved['종가'].iloc[-1]
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ChartCache(maxsize=2)
+    frames = {t: daily(100, t) for t in ['A', 'B', 'C']}
+    for ticker in ['A', 'B', 'A', 'C']:
+        cache.get(ticker, frames[ticker])
+    assert cache.misses == 3
+
+    cache.get('A', frames['A'])
+    assert cache.misses == 3
+    cache.get('B', frames['B'])
+    assert cache.misses == 4
+    assert cache.get('A', pd.DataFrame()) is None
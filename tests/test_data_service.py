@@ -0,0 +1,126 @@
+"""공용 시세 계층: single-flight, 실패 전달, TTL/LRU (가짜 조회 함수와 주입한 시계 사용)"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from turtle_trading.data_service import MarketDataService
+from turtle_trading.market_hours import KST
+
+INTRADAY = datetime(2026, 10, 16, 10, 0, tzinfo=KST)
+
+
+def frame(value=100.0):
+    index = pd.bdate_range('2026-09-01', periods=5, name='날짜')
+    return pd.DataFrame({'종가': value}, index=index)
+
+
+class BlockingFetch:
+    """``release`` 가 설정될 때까지 조회를 붙잡아 두는 가짜 조회 함수"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+        self.release = threading.Event()
+
+    def __call__(self, ticker, days):
+        self.calls += 1
+        assert self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return frame()
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def run_concurrently(service, callers):
+    pool = ThreadPoolExecutor(callers)
+    futures = [pool.submit(service.get_market_data, '005930', 60) for _ in range(callers)]
+    # 한 호출자가 조회 중이고 나머지는 모두 그 결과를 기다리는 상태가 될 때까지
+    wait_until(lambda: service.coalesced == callers - 1)
+    return pool, futures
+
+
+def test_concurrent_callers_share_one_fetch():
+    fetch = BlockingFetch()
+    service = MarketDataService(fetch, clock=lambda: INTRADAY)
+    pool, futures = run_concurrently(service, 8)
+
+    fetch.release.set()
+    frames = [f.result(5) for f in futures]
+    pool.shutdown()
+
+    assert fetch.calls == 1
+    assert service.metrics['misses'] == 1 and service.metrics['in_flight'] == 0
+    # 호출자마다 따로 복사본
+    frames[0]['종가'] = -1.0
+    assert all((f['종가'] == 100.0).all() for f in frames[1:])
+
+
+def test_failed_fetch_reaches_every_waiter_and_is_not_cached():
+    fetch = BlockingFetch(error=ConnectionError('KRX 응답 없음'))
+    service = MarketDataService(fetch, clock=lambda: INTRADAY)
+    pool, futures = run_concurrently(service, 4)
+
+    fetch.release.set()
+    for future in futures:
+        with pytest.raises(ConnectionError):
+            future.result(5)
+    pool.shutdown()
+    assert service.errors == 1 and service.metrics['size'] == 0
+
+    # 다음 호출은 실패를 캐시에서 받지 않고 다시 조회
+    fetch.error = None
+    assert (service.get_market_data('005930', 60)['종가'] == 100.0).all()
+    assert fetch.calls == 2
+
+
+def test_intraday_entries_expire_after_ttl():
+    now = [INTRADAY]
+    calls = []
+
+    def fetch(ticker, days):
+        calls.append(ticker)
+        return frame(len(calls))
+
+    service = MarketDataService(fetch, intraday_ttl=60, clock=lambda: now[0])
+    service.get_market_data('005930')
+    now[0] = INTRADAY + timedelta(seconds=59)
+    assert service.get_market_data('005930')['종가'].iloc[-1] == 1
+    now[0] = INTRADAY + timedelta(seconds=60)
+    assert service.get_market_data('005930')['종가'].iloc[-1] == 2
+    assert service.hits == 1 and service.misses == 2
+
+
+def test_after_close_entries_live_until_next_open():
+    now = [datetime(2026, 10, 16, 16, 0, tzinfo=KST)]   # 금요일 장 마감 뒤
+    calls = []
+    service = MarketDataService(lambda ticker, days: calls.append(ticker) or frame(),
+                                clock=lambda: now[0])
+    service.get_market_data('005930')
+    now[0] = datetime(2026, 10, 19, 8, 59, tzinfo=KST)
+    service.get_market_data('005930')
+    assert len(calls) == 1
+    now[0] = datetime(2026, 10, 19, 9, 0, tzinfo=KST)
+    service.get_market_data('005930')
+    assert len(calls) == 2
+
+
+def test_lru_keeps_most_recently_used():
+    calls = []
+    service = MarketDataService(lambda ticker, days: calls.append(ticker) or frame(),
+                                maxsize=2, clock=lambda: INTRADAY)
+    for ticker in ['A', 'B', 'A', 'C', 'A', 'B']:
+        service.get_market_data(ticker)
+    # C 가 들어오면서 가장 오래 안 쓴 B 가 밀려남
+    assert calls == ['A', 'B', 'C', 'B']
+    assert service.metrics['size'] == 2
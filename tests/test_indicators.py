@@ -0,0 +1,48 @@
+"""패널 지표 엔진: pandas 기준 계산과 비교"""
+
+import numpy as np
+
+from turtle_trading.indicators import (RESULT_COLUMNS, TurtleParams, build_panel,
+                                       compute_indicators, scan, wilder_atr)
+from turtle_trading.synthetic import synthetic_universe
+
+
+def test_channels_match_pandas_rolling():
+    frames = synthetic_universe(5, 120)
+    panel = build_panel(frames)
+    params = TurtleParams()
+    ind = compute_indicators(panel, params)
+
+    for j, ticker in enumerate(panel.tickers):
+        df = frames[ticker]
+        upper = df['고가'].rolling(params.entry_period).max().shift(1)
+        lower = df['저가'].rolling(params.exit_period).min().shift(1)
+        np.testing.assert_allclose(ind['upper'][:, j], upper.to_numpy(), equal_nan=True)
+        np.testing.assert_allclose(ind['lower'][:, j], lower.to_numpy(), equal_nan=True)
+
+
+def test_wilder_atr_seed_and_smoothing():
+    high = np.array([[11.0], [12.0], [13.0], [12.0], [15.0]])
+    low = np.array([[9.0], [10.0], [11.0], [10.0], [11.0]])
+    close = np.array([[10.0], [11.0], [12.0], [11.0], [14.0]])
+    atr = wilder_atr(high, low, close, 3)[:, 0]
+
+    assert np.isnan(atr[:2]).all()
+    assert atr[2] == (2 + 2 + 2) / 3
+    assert atr[3] == (atr[2] * 2 + 2) / 3
+    assert atr[4] == (atr[3] * 2 + 4) / 3
+
+
+def test_scan_uses_last_bar_and_drops_short_history():
+    frames = synthetic_universe(4, 80)
+    frames['SHORT1'] = next(iter(frames.values())).iloc[-10:]
+    panel = build_panel(frames)
+    results = scan(panel, {panel.tickers[0]: '첫종목'})
+    ind = compute_indicators(panel)
+
+    assert list(results.columns) == RESULT_COLUMNS
+    assert 'SHORT1' not in set(results['종목코드'])
+    assert results['종목명'].iloc[0] == '첫종목'
+    j = list(panel.tickers).index(results['종목코드'].iloc[1])
+    assert results['ATR(N)'].iloc[1] == ind['atr'][-1, j]
+    assert bool(results['진입신호'].iloc[1]) == bool(ind['entry'][-1, j])
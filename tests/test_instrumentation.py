@@ -0,0 +1,83 @@
+"""계측: 구간 중첩, 카운터, timed 데코레이터, JSONL 내보내기"""
+
+import io
+import json
+import time
+
+import pytest
+
+from turtle_trading import instrumentation
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    instrumentation.reset()
+    yield
+    instrumentation.reset()
+
+
+def test_nested_spans_record_both_stages():
+    with instrumentation.span('scan'):
+        for _ in range(3):
+            with instrumentation.span('fetch', ticker='005930'):
+                time.sleep(0.002)
+
+    stages = instrumentation.summary()['stages']
+    assert stages['fetch']['count'] == 3 and stages['scan']['count'] == 1
+    # 바깥 구간은 안쪽 구간 시간을 포함
+    assert stages['scan']['total_ms'] >= stages['fetch']['total_ms'] >= 6
+
+
+def test_span_records_when_block_raises():
+    with pytest.raises(ValueError):
+        with instrumentation.span('broken'):
+            raise ValueError
+    assert instrumentation.summary()['stages']['broken']['count'] == 1
+
+
+def test_counters_accumulate():
+    instrumentation.count('cache.hit')
+    instrumentation.count('cache.hit', 2)
+    instrumentation.count('cache.miss')
+    assert instrumentation.summary()['counters'] == {'cache.hit': 3, 'cache.miss': 1}
+
+
+def test_timed_keeps_function_and_records_label():
+    @instrumentation.timed('sizing')
+    def size(price, quantity):
+        """포지션 크기"""
+        return price * quantity
+
+    @instrumentation.timed()
+    def unnamed():
+        return None
+
+    assert size(100, 3) == 300 and size.__doc__ == '포지션 크기'
+    unnamed()
+    stages = instrumentation.summary()['stages']
+    assert stages['sizing']['count'] == 1
+    assert any(name.endswith('unnamed') for name in stages)
+
+
+def test_disabled_records_nothing(monkeypatch):
+    monkeypatch.setattr(instrumentation, 'enabled', False)
+    with instrumentation.span('scan'):
+        instrumentation.count('cache.hit')
+    assert instrumentation.summary() == {'stages': {}, 'counters': {}}
+
+
+def test_export_overwrites_file(tmp_path):
+    path = tmp_path / 'metrics.jsonl'
+    with instrumentation.span('fetch', ticker='005930'):
+        pass
+    instrumentation.count('cache.hit')
+
+    assert instrumentation.export_jsonl(str(path)) == 2
+    assert instrumentation.export_jsonl(str(path)) == 2
+    events = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert [(e['type'], e['name']) for e in events] == [('span', 'fetch'), ('counter', 'cache.hit')]
+    assert events[0]['ticker'] == '005930'
+
+    buffer = io.StringIO()
+    instrumentation.export_jsonl(buffer)
+    assert len(buffer.getvalue().splitlines()) == 2
@@ -0,0 +1,24 @@
+"""지연 import: 무거운 모듈은 처음 쓸 때만"""
+
+import os
+import subprocess
+import sys
+
+from turtle_trading.lazy import LazyModule, lazy_import
+
+
+def test_lazy_module_imports_on_first_attribute():
+    sys.modules.pop('colorsys', None)
+    module = lazy_import('colorsys')
+    assert isinstance(module, LazyModule) and not module.loaded
+    assert module.rgb_to_hsv(1, 0, 0) == (0, 1, 1)
+    assert module.loaded
+    assert lazy_import('colorsys') is sys.modules['colorsys']
+
+
+def test_data_modules_do_not_import_pykrx_or_plotly():
+    code = ('import sys, turtle_trading.market_cache, turtle_trading.charting, turtle_trading.symbols; '
+            'print(sorted(m for m in sys.modules if m.split(".")[0] in ("pykrx", "plotly")))')
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert out.stdout.strip() == '[]'
@@ -0,0 +1,98 @@
+"""진입 신호/보유 포지션 목록: 페이지 나누기, 페이지 번호 맞춤, 포지션 계산 메모이즈"""
+
+import sys
+import types
+from contextlib import nullcontext
+
+import pandas as pd
+import pytest
+
+from turtle_trading.lazy_render import (_position_size, cached_position_size, fragment,
+                                        page_controls, paginate)
+from turtle_trading.sizing import calculate_position_size
+
+
+def signals(n):
+    return pd.DataFrame({'종목코드': [f'{i:06d}' for i in range(n)], '현재가': 1000})
+
+
+@pytest.mark.parametrize('page, expected', [(0, 0), (2, 2), (-1, 0), (9, 2), ('1', 1)])
+def test_paginate_clamps_page(page, expected):
+    result = paginate(signals(25), page, page_size=10)
+    assert (result.number, result.pages, result.total) == (expected, 3, 25)
+    assert list(result.rows['종목코드']) == [f'{i:06d}' for i in range(expected * 10, min(expected * 10 + 10, 25))]
+
+
+def test_paginate_empty_list_has_one_page():
+    result = paginate(signals(0), 3)
+    assert (result.number, result.pages, result.total) == (0, 1, 0)
+    assert result.rows.empty
+
+
+class FakeStreamlit:
+    """page_controls 가 쓰는 만큼만 흉내"""
+
+    def __init__(self):
+        self.session_state = {}
+        self.buttons = {}
+
+    def columns(self, spec):
+        return [nullcontext() for _ in spec]
+
+    def button(self, label, key, disabled=False, on_click=None, args=()):
+        self.buttons[key] = (disabled, on_click, args)
+        return False
+
+    def caption(self, text):
+        self.caption_text = text
+
+    def click(self, key):
+        _, on_click, args = self.buttons[key]
+        on_click(*args)
+
+
+def test_page_controls_clamp_when_list_shrinks():
+    st = FakeStreamlit()
+    assert page_controls(st, 'entry', 45, page_size=10) == 0
+    st.click('entry_next')
+    st.click('entry_next')
+    assert page_controls(st, 'entry', 45, page_size=10) == 2
+    assert st.caption_text == '3 / 5 페이지 (21-30 / 45)'
+
+    # 다음 스캔에서 신호가 줄면 마지막 페이지로
+    assert page_controls(st, 'entry', 12, page_size=10) == 1
+    assert st.session_state['entry_page'] == 1
+    assert st.buttons['entry_next'][0]    # 마지막 페이지에서는 다음 버튼 비활성
+    assert page_controls(st, 'entry', 3, page_size=10) == 0
+
+
+def test_cached_position_size_matches_and_returns_copies():
+    _position_size.cache_clear()
+    first = cached_position_size(100_000_000, 50_000, 1_200)
+    assert first == calculate_position_size(100_000_000, 50_000, 1_200)
+
+    first['shares'] = -1
+    second = cached_position_size(100_000_000.0, 50_000, 1_200)
+    assert second['shares'] > 0
+    assert _position_size.cache_info().hits == 1
+    assert cached_position_size(100_000_000, 50_000, 0) is None
+
+
+@pytest.mark.parametrize('attrs, wrapped', [
+    ({}, False),                                              # 1.28: fragment 없음
+    ({'experimental_fragment': True}, True),                  # 1.33~1.36
+    ({'fragment': True, 'experimental_fragment': True}, True),
+])
+def test_fragment_falls_back_without_st_fragment(monkeypatch, attrs, wrapped):
+    decorated = []
+
+    def decorator(func):
+        decorated.append(func)
+        return func
+
+    st = types.SimpleNamespace(**{name: decorator for name in attrs})
+    monkeypatch.setitem(sys.modules, 'streamlit', st)
+
+    card = fragment(lambda x: x * 2)
+    assert card(3) == 6 and card(4) == 8
+    assert len(decorated) == int(wrapped)
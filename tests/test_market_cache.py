@@ -0,0 +1,128 @@
+"""OHLCV 캐시: 돌려준 프레임을 고쳐도 캐시는 그대로"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from turtle_trading.market_cache import OHLCVCache
+from turtle_trading.synthetic import FakeKrx
+
+NOW = datetime(2026, 10, 16, 16, 0)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    source = FakeKrx()
+    OHLCVCache(str(tmp_path), fetcher=source, clock=lambda: NOW).get_market_data('005930', 60)
+    # 새 인스턴스는 디스크의 memory-map 파일을 읽음
+    return OHLCVCache(str(tmp_path), fetcher=source, clock=lambda: NOW)
+
+
+@pytest.mark.parametrize('read', [
+    lambda c: c.get_market_data('005930', 60),
+    lambda c: c.get_range('005930', NOW - timedelta(days=60), NOW),
+    lambda c: c.peek('005930'),
+])
+def test_returned_frames_are_independent_copies(cache, read):
+    before = cache.peek('005930')
+    frame = read(cache)
+
+    frame.loc[:, '종가'] = -1.0
+    frame['N'] = 1.0
+
+    after = cache.peek('005930')
+    assert list(after.columns) == list(before.columns)
+    assert (after['종가'] > 0).all()
+    assert after.equals(before)
+
+
+def test_mismatched_files_are_refetched(tmp_path):
+    source = FakeKrx()
+    cache = OHLCVCache(str(tmp_path), fetcher=source, clock=lambda: NOW)
+    cache.get_market_data('005930', 60)
+    dates_path, values_path = cache._paths('005930')
+    np.save(values_path, np.zeros((3, 5)))   # 두 파일 교체 사이에 중단된 상태
+
+    reopened = OHLCVCache(str(tmp_path), fetcher=source, clock=lambda: NOW)
+    calls = source.calls
+    frame = reopened.get_market_data('005930', 60)
+    assert source.calls == calls + 1
+    assert len(frame) > 3 and (frame['종가'] > 0).all()
+
+
+@pytest.mark.parametrize('later', [
+    datetime(2026, 10, 16, 18, 0),   # 같은 날 장 마감 뒤
+    datetime(2026, 10, 17, 11, 0),   # 토요일
+    datetime(2026, 10, 19, 8, 30),   # 월요일 개장 전
+])
+def test_closed_market_rescan_skips_tail_fetch(tmp_path, later):
+    source = FakeKrx()
+    OHLCVCache(str(tmp_path), fetcher=source, clock=lambda: NOW).get_market_data('005930', 60)
+
+    # 새 프로세스에서 다시 스캔해도 마지막 봉이 마감된 거래일이면 조회하지 않음
+    reopened = OHLCVCache(str(tmp_path), fetcher=source, clock=lambda: later)
+    calls = source.calls
+    frame = reopened.get_market_data('005930', 60)
+    assert source.calls == calls
+    assert reopened.hits == 1 and reopened.fetches == 0
+    assert frame.index[-1].date() == NOW.date()
+
+
+def test_intraday_bar_is_refetched_after_close(tmp_path):
+    source = FakeKrx()
+    now = [datetime(2026, 10, 16, 10, 0)]
+    cache = OHLCVCache(str(tmp_path), fetcher=source, clock=lambda: now[0], refresh_seconds=60)
+    cache.get_market_data('005930', 60)
+
+    now[0] = datetime(2026, 10, 16, 10, 0, 30)
+    cache.get_market_data('005930', 60)
+    assert cache.fetches == 1
+
+    now[0] = datetime(2026, 10, 16, 10, 5)
+    cache.get_market_data('005930', 60)
+    assert cache.fetches == 2
+
+    # 장중에 받은 마지막 봉은 마감 뒤 한 번만 다시 받음
+    now[0] = datetime(2026, 10, 16, 16, 0)
+    cache.get_market_data('005930', 60)
+    cache.get_market_data('005930', 60)
+    assert cache.fetches == 3
+
+
+def test_default_clock_is_kst(tmp_path):
+    cache = OHLCVCache(str(tmp_path), fetcher=FakeKrx())
+    assert cache.clock().utcoffset() == timedelta(hours=9)
+
+
+def test_weekday_holiday_is_not_refetched_after_close(tmp_path):
+    source = FakeKrx()
+    holiday = datetime(2026, 10, 9)   # 한글날 (금요일)
+
+    def fetch(ticker, start, end):
+        frame = source(ticker, start, end)
+        return frame.drop(holiday, errors='ignore')
+
+    now = [datetime(2026, 10, 9, 16, 0)]
+    cache = OHLCVCache(str(tmp_path), fetcher=fetch, clock=lambda: now[0])
+    for _ in range(3):
+        frame = cache.get_market_data('005930', 60)
+    assert cache.fetches == 1
+    assert frame.index[-1] == datetime(2026, 10, 8)
+
+    # 다음 거래일 마감 뒤에는 다시 받음
+    now[0] = datetime(2026, 10, 12, 16, 0)
+    cache.get_market_data('005930', 60)
+    cache.get_market_data('005930', 60)
+    assert cache.fetches == 2
+
+
+def test_evict_skips_tickers_in_use(tmp_path):
+    cache = OHLCVCache(str(tmp_path), fetcher=FakeKrx(), clock=lambda: NOW)
+    for ticker in ['A', 'B', 'C']:
+        cache.get_market_data(ticker, 60)
+
+    with cache._lock_for('B'):
+        removed = cache.evict(max_bytes=0)
+    assert sorted(removed) == ['A', 'C']
+    assert cache.peek('B') is not None and cache.peek('A') is None
@@ -0,0 +1,54 @@
+"""매개변수 탐색: 워커 결과와 순위표"""
+
+from dataclasses import replace
+
+import numpy as np
+
+from turtle_trading.backtest import run_vectorized
+from turtle_trading.indicators import TurtleParams, build_panel
+from turtle_trading.optimizer import (Leaderboard, SharedPanel, SweepResult, attach_panel, grid,
+                                      random_combos, sweep)
+from turtle_trading.synthetic import synthetic_universe
+
+
+def test_grid_and_random_combos():
+    combos = grid(entry_period=[20, 55], stop_multiple=[1.5, 2.0, 2.5])
+    assert len(combos) == 6
+    assert {'entry_period': 55, 'stop_multiple': 1.5} in combos
+    sample = random_combos(10, seed=1)
+    assert len(sample) == len({tuple(sorted(c.items())) for c in sample}) == 10
+    assert sample == random_combos(10, seed=1)
+
+
+def test_shared_panel_round_trip():
+    panel = build_panel(synthetic_universe(3, 50))
+    with SharedPanel(panel) as shared:
+        attached, shm = attach_panel(shared.descriptor)
+        try:
+            np.testing.assert_array_equal(attached.close, panel.close)
+            np.testing.assert_array_equal(attached.volume, panel.volume)
+            assert list(attached.tickers) == list(panel.tickers)
+        finally:
+            del attached
+            shm.close()
+
+
+def test_sweep_matches_direct_backtest():
+    panel = build_panel(synthetic_universe(10, 300))
+    combos = grid(entry_period=[20, 55], exit_period=[10], stop_multiple=[1.5, 2.0])
+
+    results = list(sweep(panel, combos, max_workers=1, batch_size=3))
+
+    assert sorted(map(str, (r.params for r in results))) == sorted(map(str, combos))
+    for result in results:
+        expected = run_vectorized(panel, replace(TurtleParams(), **result.params)).stats
+        assert result.stats == expected
+
+
+def test_leaderboard_keeps_best():
+    board = Leaderboard('Sharpe', size=3)
+    for i, sharpe in enumerate([0.5, 2.0, -1.0, 1.5, 1.0]):
+        board.add(SweepResult({'i': i}, {'Sharpe': sharpe}))
+    assert [r.params['i'] for r in board.top()] == [1, 3, 4]
+    assert board.count == 5
+    assert list(board.frame(2)['i']) == [1, 3]
@@ -0,0 +1,117 @@
+"""포트폴리오 리스크: 유닛/상관 묶음/전체 한도와 누적 상관행렬"""
+
+import numpy as np
+import pytest
+
+from turtle_trading.indicators import Panel
+from turtle_trading.portfolio_risk import PortfolioRiskEngine, RiskLimits, RollingCorrelation
+from turtle_trading.position_store import STATUS_OPEN, STATUS_STOP, PositionStore
+
+DAYS = 80
+
+
+def panel(closes):
+    """{종목코드: 종가 배열} → Panel (종가 외 열은 종가로 채움)"""
+    tickers = list(closes)
+    close = np.column_stack([closes[t] for t in tickers]).astype('float64')
+    dates = np.arange(np.datetime64('2026-01-01'), np.datetime64('2026-01-01') + len(close))
+    return Panel(dates, tickers, close, close, close, close, np.ones_like(close))
+
+
+def walk(seed):
+    rng = np.random.default_rng(seed)
+    return 10000 * np.exp(np.cumsum(rng.normal(0, 0.02, DAYS)))
+
+
+def positions(units):
+    """{종목코드: 유닛 수} → open_positions() 형태 목록 (위험 금액 0)"""
+    return [{'종목코드': t, '현재가': 100.0, '손절가': 100.0, '수량': 1, '상태': STATUS_OPEN,
+             '투자금액': 100.0} for t, n in units.items() for _ in range(n)]
+
+
+def engine(units, closes=None, limits=RiskLimits()):
+    engine = PortfolioRiskEngine(1e9, limits)
+    if closes is not None:
+        engine.set_prices(panel(closes))
+    engine.load_positions(positions(units))
+    return engine
+
+
+def test_per_ticker_and_total_limits():
+    independent = {f'{i:06d}': walk(i) for i in range(6)}
+    assert engine({'000000': 3}, independent).check('000000', 100, 1, 90).allowed
+    decision = engine({'000000': 4}, independent).check('000000', 100, 1, 90)
+    assert not decision.allowed and decision.metrics['ticker_units'] == 5
+
+    limits = RiskLimits(close_cluster=99, loose_cluster=99)
+    held = {f'{i:06d}': 2 for i in range(6)}   # 12유닛
+    decision = engine(held, independent, limits).check('000000', 100, 1, 90)
+    assert decision.metrics['total_units'] == 13
+    assert any('전체 유닛' in r for r in decision.reasons)
+
+
+def test_close_cluster_counts_correlated_tickers():
+    base = walk(0)
+    closes = {'A': base, 'B': base * 2, 'C': base * 3, 'D': walk(1)}
+    decision = engine({'A': 3, 'B': 3}, closes).check('C', 100, 1, 90)
+    assert not decision.allowed
+    assert decision.metrics['close_cluster_units'] == 7
+    # 상관 없는 종목은 묶음에 들지 않음
+    decision = engine({'A': 3, 'B': 3}, closes).check('D', 100, 1, 90)
+    assert decision.allowed and decision.metrics['close_cluster_units'] == 1
+
+
+@pytest.mark.parametrize('closes', [
+    None,                                                             # 상관행렬 없음
+    {'A': walk(0), 'B': walk(1)},                                     # 후보 종목 이력 없음
+    {'A': walk(0), 'B': walk(1), 'C': np.r_[np.full(DAYS - 5, np.nan), walk(2)[-5:]]},   # 이력 짧음
+])
+def test_unknown_correlation_counts_in_cluster(closes):
+    decision = engine({'A': 3, 'B': 3}, closes).check('C', 100, 1, 90)
+    assert not decision.allowed
+    assert decision.metrics['close_cluster_units'] == 7
+    assert not decision.metrics['correlation_known']
+    assert decision.metrics['unknown_correlation'] == ['A', 'B']
+
+
+def test_incremental_matches_corrcoef():
+    rng = np.random.default_rng(3)
+    mixing = rng.normal(size=(4, 4))
+    returns = rng.normal(0, 0.02, (200, 4)) @ mixing
+    window = 30
+    rolling = RollingCorrelation(list('ABCD'), returns[:40], window)
+    for t in range(40, len(returns)):
+        rolling.update(returns[t])
+        expected = np.corrcoef(returns[t + 1 - window:t + 1].T)
+        np.testing.assert_allclose(rolling.matrix(), expected, atol=1e-9)
+
+
+def test_missing_returns_use_pairwise_overlap():
+    rng = np.random.default_rng(4)
+    returns = rng.normal(0, 0.02, (60, 3))
+    returns[:30, 2] = np.nan
+    corr = RollingCorrelation(list('ABC'), returns, 60, min_periods=20).matrix()
+    expected = np.corrcoef(returns[30:, [0, 2]].T)[0, 1]
+    assert corr[0, 2] == pytest.approx(expected)
+
+    short = RollingCorrelation(list('ABC'), returns, 60, min_periods=40).matrix()
+    assert np.isnan(short[0, 2]) and not np.isnan(short[0, 1])
+
+
+def test_capital_held_by_exit_signal_positions_is_not_free():
+    store = PositionStore(':memory:')
+    held = store.add_position('A', '가', 10000, 80, 100.0)        # 800,000원
+    store.apply_changes([{'포지션ID': held['포지션ID'], '상태': STATUS_STOP}])
+    closed = store.add_position('B', '나', 10000, 50, 100.0)
+    store.close_position(closed['포지션ID'], price=10000)
+    assert store.used_capital() == 800000
+
+    engine = PortfolioRiskEngine(1000000)
+    engine.load_positions(store.open_positions() + [store.get(closed['포지션ID'])])
+    assert engine.used_capital == 800000 and engine.units == {'A': 1}
+
+    decision = engine.check('C', 10000, 30, 9800)                 # 300,000원 > 남은 200,000원
+    assert not decision.allowed
+    assert decision.metrics['remaining_capital'] == 200000
+    assert any('투자금 부족' in r for r in decision.reasons)
+    assert engine.check('C', 10000, 20, 9800).allowed
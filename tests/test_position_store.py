@@ -0,0 +1,105 @@
+"""포지션 저장소: 중복/누락 처리, 이관, 청산"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from turtle_trading.position_store import STATUS_CLOSED, STATUS_OPEN, PositionStore
+
+
+def position(pid, **overrides):
+    row = {'포지션ID': pid, '종목코드': '005930', '종목명': '삼성전자', '진입일': '2026-09-01',
+           '진입가': 70000.0, '현재가': 70000.0, '수량': 10, '투자금액': 700000.0,
+           'ATR(N)': 1400.0, '손절가': 67200.0, '다음매수가': 70700.0, '손익': 0.0,
+           '손익률': 0.0, '상태': STATUS_OPEN}
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def store():
+    return PositionStore(':memory:')
+
+
+def test_add_many_skips_only_duplicate_ids(store):
+    assert store.add(position('a'))
+    assert not store.add(position('a', 수량=99))
+    assert store.add_many([position('a'), position('b'), position('c')]) == 2
+    assert store.get('a')['수량'] == 10
+    assert store.count() == 3
+
+
+def test_add_many_rejects_missing_id(store):
+    with pytest.raises(ValueError):
+        store.add_many([position('a'), position(None)])
+    with pytest.raises(ValueError):
+        store.add(position(''))
+    assert store.count() == 0
+
+
+def test_add_many_raises_on_missing_required_value(store):
+    # 필수 값 누락을 중복(False) 으로 숨기지 않고 전체를 되돌림
+    with pytest.raises(sqlite3.IntegrityError):
+        store.add_many([position('a'), {'포지션ID': 'x'}])
+    assert store.count() == 0
+
+
+def test_import_positions_reports_each_row(store):
+    store.add(position('a'))
+    legacy = [position('a'), position('b'), {'포지션ID': 'x'}, position(None)]
+    del legacy[1]['다음매수가']
+
+    report = store.import_positions(legacy)
+
+    assert (report.inserted, report.duplicates, len(report.rejected)) == (1, 1, 2)
+    assert int(report) == 1
+    assert store.get('b')['다음매수가'] == 0
+    assert store.count() == 2
+
+
+def test_close_position(store):
+    opened = store.add_position('005930', '삼성전자', 70000, 10, 1400.0)
+    closed = store.close_position(opened['포지션ID'], price=77000, date='2026-10-01')
+
+    assert closed['상태'] == STATUS_CLOSED
+    assert closed['손익'] == 70000
+    assert closed['손익률'] == pytest.approx(10.0)
+    assert store.close_position('없음') is None
+    # 두 번 청산해도 처음 청산가가 남음
+    assert store.close_position(opened['포지션ID'], price=1)['청산가'] == 77000
+    assert store.used_capital() == 0
+
+
+def test_concurrent_close_keeps_first_price(store):
+    opened = store.add_position('005930', '삼성전자', 70000, 10, 1400.0)
+    start = threading.Barrier(20)
+    results = {}
+
+    def close(price):
+        start.wait(5)
+        results[price] = store.close_position(opened['포지션ID'], price)
+
+    threads = [threading.Thread(target=close, args=(price,)) for price in range(71000, 71020)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 가격이 모두 달라서 자기 가격으로 청산된 호출이 실제로 청산한 호출
+    winners = [price for price, result in results.items() if result['청산가'] == price]
+    assert len(winners) == 1
+    closed = store.get(opened['포지션ID'])
+    assert closed['청산가'] == closed['현재가'] == winners[0]
+    assert closed['손익'] == (winners[0] - 70000) * 10
+    # 나머지 19개 호출은 이미 청산완료된 포지션(먼저 청산한 가격)을 받음
+    losers = [result for price, result in results.items() if price != winners[0]]
+    assert len(losers) == 19
+    assert all(r['상태'] == STATUS_CLOSED and r['청산가'] == winners[0] for r in losers)
+
+
+def test_iter_chunks_covers_every_row(store):
+    store.add_many([position(f'p{i:03d}') for i in range(25)])
+    chunks = list(store.iter_chunks(chunk_size=10))
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    assert [row['포지션ID'] for c in chunks for row in c] == [f'p{i:03d}' for i in range(25)]
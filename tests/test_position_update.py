@@ -0,0 +1,59 @@
+"""보유 포지션 일괄 갱신: 청산신호 유지와 동시 청산 보호"""
+
+from turtle_trading.position_store import (STATUS_CLOSED, STATUS_OPEN, STATUS_STOP,
+                                           PositionStore)
+from turtle_trading.position_update import update_positions
+from turtle_trading.synthetic import PriceFeed
+
+
+def test_stop_signal_survives_price_recovery():
+    store = PositionStore(':memory:')
+    position = store.add_position('000001', '가상', 100, 10, 5.0)   # 손절가 90
+    feed = PriceFeed(**{'000001': 90.0})
+
+    report = update_positions(store, feed)
+    assert store.get(position['포지션ID'])['상태'] == STATUS_STOP
+    assert [row['포지션ID'] for row in report.crossed] == [position['포지션ID']]
+
+    feed.prices['000001'] = 103.0
+    report = update_positions(store, feed)
+    saved = store.get(position['포지션ID'])
+    assert saved['상태'] == STATUS_STOP
+    assert saved['현재가'] == 103.0
+    assert report.crossed == [] and report.add_ready == []
+
+
+def test_update_skips_position_closed_while_fetching():
+    store = PositionStore(':memory:')
+    position = store.add_position('000001', '가상', 100, 10, 5.0)
+    feed = PriceFeed(**{'000001': 89.0})
+    # 시세를 받는 사이 다른 세션이 청산
+    feed.before_return = lambda: store.close_position(position['포지션ID'], price=95)
+
+    report = update_positions(store, feed)
+    saved = store.get(position['포지션ID'])
+    assert saved['상태'] == STATUS_CLOSED
+    assert saved['현재가'] == 95 and saved['손익'] == -50
+    assert report.updated == 0 and report.crossed == []
+
+
+def test_open_position_price_is_updated():
+    store = PositionStore(':memory:')
+    position = store.add_position('000001', '가상', 100, 10, 5.0)
+    report = update_positions(store, PriceFeed(**{'000001': 101.0}))
+
+    saved = store.get(position['포지션ID'])
+    assert report.updated == 1
+    assert saved['상태'] == STATUS_OPEN and saved['손익'] == 10
+
+
+def test_background_update_creates_executor_on_first_use(monkeypatch):
+    from turtle_trading import position_update
+
+    monkeypatch.setattr(position_update, '_executor', None)
+    store = PositionStore(':memory:')
+    store.add_position('000001', '가상', 100, 10, 5.0)
+
+    report = position_update.start_update(store, PriceFeed(**{'000001': 101.0})).result(5)
+    assert report.updated == 1
+    assert position_update._executor is not None
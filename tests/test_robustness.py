@@ -0,0 +1,49 @@
+"""견고성 검증: 거래별 R 배수와 몬테카를로 재현성"""
+
+import numpy as np
+import pytest
+
+from turtle_trading.backtest import run
+from turtle_trading.indicators import TurtleParams, build_panel
+from turtle_trading.optimizer import grid
+from turtle_trading.robustness import monte_carlo, r_multiples, walk_forward
+from turtle_trading.synthetic import synthetic_universe
+
+
+@pytest.fixture(scope='module')
+def frames():
+    return synthetic_universe(15, 700)
+
+
+@pytest.mark.parametrize('stop_multiple', [1.5, 2.0, 3.0])
+def test_r_multiples_use_each_trades_stop_distance(frames, stop_multiple):
+    trades = run(frames, TurtleParams(stop_multiple=stop_multiple)).trades
+    r = r_multiples(trades)
+
+    expected = [t.pnl / (stop_multiple * t.atr * t.fills[0][2]) for t in trades]
+    assert len(trades) > 20
+    np.testing.assert_allclose(r, expected)
+    # 손절 거래는 대략 -1R 근처 (종가 체결이라 넘어설 수 있음)
+    stops = r[[t.reason == '손절' and t.units == 1 for t in trades]]
+    assert np.all(stops < 0)
+
+
+def test_monte_carlo_is_deterministic_across_workers(frames):
+    r = r_multiples(run(frames).trades)
+    single = monte_carlo(r, n_paths=3000, seed=7, max_workers=1, chunk=1000)
+    pooled = monte_carlo(r, n_paths=3000, seed=7, max_workers=2, chunk=1000)
+
+    np.testing.assert_array_equal(single.max_drawdown, pooled.max_drawdown)
+    np.testing.assert_array_equal(single.final, pooled.final)
+    assert 0.0 <= single.ruin_probability <= 1.0
+
+
+def test_walk_forward_trades_keep_window_stop_multiple(frames):
+    panel = build_panel(frames)
+    combos = grid(entry_period=[20], exit_period=[10], stop_multiple=[1.5, 3.0])
+    wf = walk_forward(panel, combos, train_bars=250, test_bars=120, max_workers=1)
+
+    assert len(wf.params) == len(wf.windows) > 1
+    stops = {round(t.stop_distance / t.atr, 6) for t in wf.trades}
+    assert stops <= {1.5, 3.0}
+    np.testing.assert_allclose(r_multiples(wf.trades), [t.r_multiple for t in wf.trades])
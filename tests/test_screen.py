@@ -0,0 +1,94 @@
+"""스냅샷 증분 갱신이 전체 재스캔과 같은지"""
+
+import pandas as pd
+import pytest
+
+from turtle_trading import screen
+from turtle_trading.indicators import build_panel, scan
+from turtle_trading.synthetic import synthetic_universe
+
+END = pd.Timestamp('2026-10-16')
+
+
+class Source:
+    """``END`` 기준 최근 ``days`` 달력 일수만 돌려주는 get_market_data"""
+
+    # 메모리 프레임이라 호스트 속도 제한이 필요 없음
+    rate_limited = True
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.requested = {}
+
+    def get_market_data(self, ticker, days=60):
+        self.requested[ticker] = days
+        frame = self.frames[ticker]
+        return frame.loc[frame.index >= END - pd.Timedelta(days=days)]
+
+
+@pytest.fixture
+def universe():
+    frames = synthetic_universe(30, 300, end=str(END.date()))
+    names = {t: f'종목{t}' for t in frames}
+    return frames, names
+
+
+def snapshot_before(frames, names, bars, root):
+    history = {t: df.iloc[:-bars] for t, df in frames.items()}
+    panel = build_panel(history)
+    path = screen.write_snapshot(scan(panel, names), screen.states_from_panel(panel), str(root))
+    return screen.load_snapshot(path)
+
+
+def full_scan(frames, names):
+    results = scan(build_panel(frames), names)
+    return results.sort_values('종목코드').reset_index(drop=True)
+
+
+@pytest.mark.parametrize('bars', [1, 3, 25])
+def test_refresh_from_matches_full_rescan(tmp_path, universe, bars):
+    frames, names = universe
+    snapshot = snapshot_before(frames, names, bars, tmp_path)
+    source = Source(frames)
+
+    results, states = screen.refresh_from(snapshot, source, today=END)
+    got = results.sort_values('종목코드').reset_index(drop=True)
+    pd.testing.assert_frame_equal(got, full_scan(frames, names))
+    assert len(states) == len(frames)
+
+
+def test_refresh_rebuilds_state_when_bars_are_missing(tmp_path, universe):
+    frames, names = universe
+    snapshot = snapshot_before(frames, names, 25, tmp_path)
+    recent = {t: df.iloc[-60:] for t, df in frames.items()}
+    # 스냅샷 이후 25봉 중 최근 10봉만 받은 종목: 중간 봉을 건너뛰지 않고 받은 일봉으로 다시 계산
+    recent['000003'] = frames['000003'].iloc[-10:]
+
+    results, states = screen.refresh(snapshot, recent)
+    assert states['000001'].count == len(frames['000001'])
+    assert states['000003'].count == 10 and not states['000003'].ready
+    got = results.sort_values('종목코드').reset_index(drop=True)
+    expected = full_scan(frames, names)
+    others = expected['종목코드'] != '000003'
+    pd.testing.assert_frame_equal(got[others], expected[others])
+
+
+@pytest.mark.parametrize('argv, expected', [
+    ([], ['000001', '000002']),
+    (['--markets', 'KOSPI', 'KOSDAQ', 'KONEX'], ['000001', '000002', '000003']),
+])
+def test_main_screens_kospi_kosdaq_by_default(tmp_path, monkeypatch, argv, expected):
+    from turtle_trading import market_cache, symbols
+    from turtle_trading.synthetic import FakeKrx
+
+    index = symbols.SymbolIndex.build([('000001', '가', 'KOSPI', False), ('000002', '나', 'KOSDAQ', False),
+                                       ('000003', '다', 'KONEX', False), ('000004', '라', 'KOSPI', True)])
+    source = FakeKrx()
+    requested = []
+    monkeypatch.setattr(symbols, 'load_or_build', lambda root: index)
+    monkeypatch.setattr(market_cache, 'pykrx_fetch',
+                        lambda ticker, start, end: requested.append(ticker) or source(ticker, start, end))
+
+    screen.main(['--root', str(tmp_path / 'screens'), '--cache', str(tmp_path / 'ohlcv'), *argv])
+    assert sorted(requested) == expected
+    assert sorted(screen.latest_snapshot(str(tmp_path / 'screens')).results()['종목코드']) == expected
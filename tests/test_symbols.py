@@ -0,0 +1,148 @@
+"""종목 색인: 이름/코드 조회, 정규화/초성/접두어 검색, 목록 조회가 잘리거나 실패해도 이전 색인 유지"""
+
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from turtle_trading import symbols
+from turtle_trading.market_hours import KST
+from turtle_trading.symbols import SymbolIndex, load_or_build, merge_with_previous
+
+LISTINGS = ([('005930', '삼성전자', 'KOSPI', False), ('035420', 'NAVER', 'KOSPI', False)]
+            + [(f'{i:06d}', f'종목{i}', 'KOSDAQ', False) for i in range(100, 200)])
+
+
+def failing(trading_day):
+    raise ConnectionError('KRX 응답 없음')
+
+
+@pytest.mark.parametrize('fetch', [lambda day: [], lambda day: LISTINGS[:10], failing])
+def test_failed_listing_keeps_previous_index(tmp_path, fetch):
+    root = str(tmp_path)
+    load_or_build(root, '20261015', lambda day: LISTINGS)
+
+    index = load_or_build(root, '20261016', fetch)
+    tickers, unresolved = index.resolve('삼성전자\nNAVER')
+    assert tickers == {'005930': '삼성전자', '035420': 'NAVER'} and not unresolved
+    # 오늘 색인은 쓰지 않음
+    assert os.listdir(root) == ['20261015-v1']
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_failed_day_retries_after_backoff(tmp_path):
+    root = str(tmp_path)
+    clock = Clock()
+    calls = []
+
+    def fetch(day):
+        calls.append(day)
+        return LISTINGS if len(calls) > 1 else []
+
+    load_or_build(root, '20261015', lambda day: LISTINGS)
+    load_or_build(root, '20261016', fetch, retry_seconds=600, clock=clock)
+    clock.now = 599
+    index = load_or_build(root, '20261016', fetch, retry_seconds=600, clock=clock)
+    assert calls == ['20261016']
+    assert index.meta['trading_day'] == '20261015'
+
+    clock.now = 600
+    index = load_or_build(root, '20261016', fetch, retry_seconds=600, clock=clock)
+    assert calls == ['20261016', '20261016']
+    assert index.meta['trading_day'] == '20261016'
+    assert sorted(os.listdir(root)) == ['20261015-v1', '20261016-v1']
+
+
+def test_small_delisting_builds_new_index(tmp_path):
+    root = str(tmp_path)
+    load_or_build(root, '20261015', lambda day: LISTINGS)
+
+    index = load_or_build(root, '20261016', lambda day: LISTINGS[:-3])
+    assert sorted(os.listdir(root)) == ['20261015-v1', '20261016-v1']
+    assert index.is_delisted('000199')
+    assert index.resolve('NAVER')[0] == {'035420': 'NAVER'}
+
+
+def test_empty_listing_without_previous_index_raises(tmp_path):
+    with pytest.raises(ValueError):
+        load_or_build(str(tmp_path), '20261016', lambda day: [])
+
+
+@pytest.fixture
+def index():
+    current = [('005930', '삼성전자', 'KOSPI', False), ('005935', '삼성전자우', 'KOSPI', False),
+               ('035420', 'NAVER', 'KOSPI', False), ('051910', 'LG화학', 'KOSPI', False),
+               ('000660', 'SK하이닉스', 'KOSPI', False), ('068270', '셀트리온', 'KOSPI', False)]
+    # 이전 색인: NAVER 의 예전 이름 NHN, 이후 상장폐지된 셀트리온헬스케어
+    previous = SymbolIndex.build([item if item[0] != '035420' else ('035420', 'NHN', 'KOSPI', False)
+                                  for item in current] + [('091990', '셀트리온헬스케어', 'KOSDAQ', False)])
+    merged, aliases = merge_with_previous(current, previous)
+    return SymbolIndex.build(merged, aliases, '20261016')
+
+
+def test_name_and_code_lookup(index):
+    assert index.code_of('삼성전자') == '005930'
+    assert index.name_of('005930') == '삼성전자'
+    assert index.name_of('999999') is None
+    tickers, unresolved = index.resolve('005930\nSK하이닉스\n\n')
+    assert tickers == {'005930': '삼성전자', '000660': 'SK하이닉스'} and not unresolved
+
+
+@pytest.mark.parametrize('text', ['lg화학', 'LG 화학', 'ＬＧ화학', '(주)LG화학', ' lg-화학 '])
+def test_normalized_names_resolve(index, text):
+    assert index.resolve_one(text) == '051910'
+
+
+def test_prefix_and_choseong_search(index):
+    assert index.prefix('삼성') == ['005930', '005935']
+    assert [code for code, _ in index.suggest('ㅅㅅㅈㅈ')] == ['005930', '005935']
+    assert index.suggest('삼송전자')[0] == ('005930', '삼성전자')
+
+
+def test_delisted_and_alias(index):
+    assert index.resolve('NHN')[0] == {'035420': 'NAVER'}
+    assert index.is_delisted('091990')
+    tickers, unresolved = index.resolve('셀트리온헬스케어')
+    assert not tickers and '셀트리온헬스케어' in unresolved
+    # 상장폐지 종목은 제안에서 빠짐
+    assert all(code != '091990' for code, _ in unresolved['셀트리온헬스케어'])
+    assert index.resolve('셀트리온헬스케어', include_delisted=True)[0] == {'091990': '셀트리온헬스케어'}
+
+
+def test_many_unresolved_lines_resolve_quickly():
+    rng = np.random.default_rng(0)
+    syllables = [chr(0xAC00 + int(i)) for i in rng.integers(0, 11172, size=(2700, 4)).ravel()]
+    names = {''.join(syllables[i * 4:i * 4 + 2 + i % 3]) for i in range(2700)}
+    index = SymbolIndex.build([(f'{i:06d}', name, 'KOSPI', False) for i, name in enumerate(sorted(names))])
+    lines = [f'없는종목{i}' for i in range(300)] + ['000001']
+
+    started = time.perf_counter()
+    tickers, unresolved = index.resolve('\n'.join(lines))
+    elapsed = time.perf_counter() - started
+
+    assert list(tickers) == ['000001'] and len(unresolved) == 300
+    assert sum(1 for found in unresolved.values() if found) <= symbols.SUGGEST_FIRST
+    assert elapsed < 0.5
+
+
+def test_default_trading_day_is_last_weekday(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(symbols, 'now_kst', lambda: datetime(2026, 10, 18, 12, 0, tzinfo=KST))   # 일요일
+
+    def fetch(day):
+        calls.append(day)
+        return LISTINGS
+
+    index = load_or_build(str(tmp_path), fetch_listings=fetch)
+    assert index.meta['trading_day'] == '20261016'
+    load_or_build(str(tmp_path), fetch_listings=fetch)
+    assert calls == ['20261016']
@@ -0,0 +1,99 @@
+"""장중 감시: SimulatedClock 과 가짜 시세로 실제 시간을 기다리지 않고 확인"""
+
+from datetime import datetime
+
+from turtle_trading.market_hours import KST
+from turtle_trading.position_store import STATUS_STOP, PositionStore
+from turtle_trading.synthetic import PriceFeed
+from turtle_trading.watcher import Alert, AlertQueue, MarketWatcher, SimulatedClock
+
+TICKER = '000001'
+
+
+def make_watcher(price, start=datetime(2026, 10, 16, 9, 0, tzinfo=KST), **options):
+    store = PositionStore(':memory:')
+    store.add_position(TICKER, '가상', 100, 10, 5.0)   # 손절가 90, 다음매수가 102
+    feed = PriceFeed(**{TICKER: price})
+    clock = SimulatedClock(start)
+    watcher = MarketWatcher(store, feed, interval=60, clock=clock, sleep=clock.sleep,
+                            **options)
+    return watcher, feed, clock, store
+
+
+def alert(kind, price, ticker=TICKER):
+    return Alert(ticker, '가상', kind, price, price, datetime(2026, 10, 16, 9, 0, tzinfo=KST))
+
+
+def test_queue_keeps_stop_when_add_alert_follows():
+    queue = AlertQueue()
+    queue.publish(alert('손절', 90))
+    queue.publish(alert('추가매수', 103))
+    queue.publish(alert('추가매수', 104))
+
+    drained = queue.drain()
+    assert [(a.kind, a.price) for a in drained] == [('손절', 90), ('추가매수', 104)]
+    assert queue.coalesced == 1 and len(queue) == 0
+
+
+def test_waits_for_market_open_without_polling():
+    watcher, feed, clock, _ = make_watcher(100, start=datetime(2026, 10, 16, 8, 0, tzinfo=KST))
+    watcher.run(max_steps=3)
+
+    assert watcher.polls == 0 and feed.calls == 0
+    assert clock() > datetime(2026, 10, 16, 8, 0, tzinfo=KST)
+
+
+def test_stop_alert_is_not_lost_before_drain():
+    watcher, feed, clock, store = make_watcher(103)
+
+    watcher.run(max_steps=1)   # 추가매수
+    feed.prices[TICKER] = 89
+    watcher.run(max_steps=1)   # 손절
+    feed.prices[TICKER] = 103
+    watcher.run(max_steps=2)   # 회복돼도 손절 신호와 알림이 남아야 함
+
+    drained = watcher.queue.drain()
+    assert [a.kind for a in drained] == ['추가매수', '손절']
+    assert drained[1].price == 89 and drained[1].level == 90
+    assert [p['상태'] for p in store.open_positions()] == [STATUS_STOP]
+    assert watcher.polls == 4 and watcher.errors == 0
+    assert clock() == datetime(2026, 10, 16, 9, 4, tzinfo=KST)
+
+
+def test_add_alert_is_sent_once_per_level():
+    watcher, feed, _, _ = make_watcher(103)
+    watcher.run(max_steps=3)
+    assert len(watcher.queue.drain()) == 1
+
+    feed.prices[TICKER] = 101   # 다음매수가 아래로 내려갔다가
+    watcher.run(max_steps=1)
+    feed.prices[TICKER] = 103   # 다시 넘으면 다시 알림
+    watcher.run(max_steps=1)
+    assert [a.kind for a in watcher.queue.drain()] == ['추가매수']
+    assert watcher.queue.published == 2
+
+
+def test_fetch_errors_do_not_stop_the_loop():
+    watcher, feed, _, _ = make_watcher(100, retries=0)
+
+    def broken(ticker, days=60):
+        raise ValueError('시세 형식 오류')
+
+    feed.get_market_data = broken
+    watcher.run(max_steps=2)
+    # 종목별 조회 실패는 보고서에 남고 감시는 계속됨
+    assert watcher.polls == 2 and watcher.errors == 0
+    assert len(watcher.queue) == 0
+
+
+def test_alert_level_is_the_crossed_level():
+    # 평평한 일봉의 직전 10일 저가 99 (청산기준) 아래, 손절가 90 위 → 익절
+    watcher, _, _, _ = make_watcher(95)
+    watcher.run(max_steps=1)
+    (exit_alert,) = watcher.queue.drain()
+    assert (exit_alert.kind, exit_alert.price, exit_alert.level) == ('익절', 95, 99)
+
+    watcher, _, _, _ = make_watcher(89)
+    watcher.run(max_steps=1)
+    (stop_alert,) = watcher.queue.drain()
+    assert (stop_alert.kind, stop_alert.price, stop_alert.level) == ('손절', 89, 90)
@@ -0,0 +1,5 @@
+"""터틀 트레이딩 웹앱 백엔드 모듈 모음.
+
+app.py 의 화면 코드에서 가져다 쓰는 데이터/계산 계층입니다.
+시작 속도를 위해 여기서는 하위 모듈을 미리 import 하지 않습니다.
+"""
@@ -0,0 +1,287 @@
+"""터틀 규칙 백테스트.
+
+앱과 같은 규칙을 씁니다.
+- 진입: 종가 > 직전 20일 고가 (진입신호), 1유닛 = calculate_position_size 2% 룰 수량
+- 피라미딩: 종가가 진입가 + 0.5N / 1.0N / 1.5N 이상이면 한 유닛씩 추가 (최대 4유닛, 봉당 1회)
+- 손절: 종가 <= 마지막 매수가 - 2N
+- 청산: 종가 < 직전 10일 저가 (청산신호)
+- 같은 봉에서는 손절 > 청산 > 추가매수 순으로 판단, 체결은 모두 종가
+
+엔진은 두 가지입니다.
+- ``run_event``: 봉 단위 이벤트 엔진. 종목마다 IndicatorState 로 지표를 증분 계산 (정확성 기준)
+- ``run_vectorized``: 패널 지표를 한 번에 계산하고, 다음 이벤트가 일어나는 봉을
+  NumPy 로 찾아 건너뛰는 빠른 엔진 (매개변수 탐색용)
+
+두 엔진은 같은 거래 목록을 만듭니다. 유닛 크기는 초기 자본 기준(복리 아님)이고,
+앱의 투자금 부족 확인처럼 남은 현금(초기 자본 + 누적 현금흐름)으로 살 수 없는
+진입/추가매수는 건너뜁니다 (다음 봉에 조건이 맞으면 다시 시도). 같은 봉에서는
+종목 순서대로 처리하므로 앞 종목의 청산 대금을 뒤 종목이 쓸 수 있습니다.
+"""
+
+import heapq
+import math
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .indicators import TurtleParams, build_panel, compute_indicators
+from .sizing import unit_shares
+from .streaming import IndicatorState
+
+MAX_UNITS = 4
+TRADING_DAYS = 252
+
+
+@dataclass(frozen=True)
+class Trade:
+    """한 번의 진입부터 청산까지 (추가매수 포함)"""
+    ticker: str
+    entry_date: pd.Timestamp
+    exit_date: pd.Timestamp
+    fills: tuple          # ((날짜, 가격, 수량), ...) 진입 + 추가매수
+    exit_price: float
+    reason: str           # '손절' / '익절' / '기간종료'
+    atr: float            # 진입 시점 N
+    stop_distance: float  # 첫 진입의 주당 리스크 (stop_multiple × N)
+
+    @property
+    def shares(self):
+        return sum(f[2] for f in self.fills)
+
+    @property
+    def units(self):
+        return len(self.fills)
+
+    @property
+    def cost(self):
+        return sum(f[1] * f[2] for f in self.fills)
+
+    @property
+    def pnl(self):
+        return self.exit_price * self.shares - self.cost
+
+    @property
+    def r_multiple(self):
+        """첫 유닛 리스크(진입 손절폭 × 첫 수량) 대비 손익 배수"""
+        first_risk = self.stop_distance * self.fills[0][2]
+        return self.pnl / first_risk if first_risk else 0.0
+
+
+@dataclass
+class BacktestResult:
+    trades: list
+    equity: pd.Series
+    capital: float
+    params: TurtleParams = field(default_factory=TurtleParams)
+
+    @property
+    def stats(self):
+        return summarize(self.trades, self.equity, self.capital)
+
+
+def summarize(trades, equity, capital):
+    """README 백테스트 표 항목: 연평균 수익률, 최대 낙폭, 샤프 비율, 승률"""
+    values = equity.to_numpy(dtype='float64')
+    if len(values) < 2:
+        return {'CAGR': 0.0, 'MDD': 0.0, 'Sharpe': 0.0, 'WinRate': 0.0, 'Trades': len(trades)}
+
+    years = len(values) / TRADING_DAYS
+    cagr = (values[-1] / capital) ** (1 / years) - 1 if values[-1] > 0 else -1.0
+    peak = np.maximum.accumulate(values)
+    mdd = float(np.min(values / peak - 1))
+    returns = np.diff(values) / values[:-1]
+    std = returns.std()
+    sharpe = float(returns.mean() / std * math.sqrt(TRADING_DAYS)) if std > 0 else 0.0
+    wins = sum(1 for t in trades if t.pnl > 0)
+    return {
+        'CAGR': float(cagr),
+        'MDD': mdd,
+        'Sharpe': sharpe,
+        'WinRate': wins / len(trades) if trades else 0.0,
+        'Trades': len(trades),
+    }
+
+
+def _unit_shares(capital, price, atr, params):
+    return unit_shares(capital, price, atr, params.risk_pct, params.stop_multiple)
+
+
+class _Position:
+    """이벤트 엔진의 보유 상태"""
+
+    def __init__(self, date, price, shares, atr, params):
+        self.entry_date = date
+        self.entry_price = price
+        self.atr = atr
+        self.fills = [(date, price, shares)]
+        self.stop_distance = params.stop_multiple * atr
+        self.stop = price - self.stop_distance
+        self.next_add = price + params.add_step * atr
+
+    def add(self, date, price, shares, params):
+        self.fills.append((date, price, shares))
+        self.stop = price - params.stop_multiple * self.atr
+        self.next_add = self.entry_price + len(self.fills) * params.add_step * self.atr
+
+    def close(self, ticker, date, price, reason):
+        return Trade(ticker, self.entry_date, date, tuple(self.fills), price, reason, self.atr,
+                     self.stop_distance)
+
+
+def run_event(panel, params=TurtleParams(), capital=100_000_000):
+    """봉 단위 이벤트 엔진"""
+    dates = pd.DatetimeIndex(panel.dates)
+    stamps = list(dates)
+    n_dates, n_tickers = panel.shape
+    states = [IndicatorState(params) for _ in range(n_tickers)]
+    positions = [None] * n_tickers
+    trades = []
+    cash = 0.0
+    equity = np.full(n_dates, float(capital))
+
+    for t in range(n_dates):
+        date = stamps[t]
+        held_value = 0.0
+        for j in range(n_tickers):
+            close = panel.close[t, j]
+            if np.isnan(close):
+                continue
+            bar = {'고가': panel.high[t, j], '저가': panel.low[t, j], '종가': close, '거래량': panel.volume[t, j]}
+            signal = states[j].update(bar, date)
+            pos = positions[j]
+
+            if pos is None:
+                if signal['entry'] and not math.isnan(signal['atr']):
+                    shares = _unit_shares(capital, close, signal['atr'], params)
+                    if shares > 0 and close * shares <= capital + cash:
+                        positions[j] = _Position(date, close, shares, signal['atr'], params)
+                        cash -= close * shares
+            elif close <= pos.stop:
+                trades.append(pos.close(panel.tickers[j], date, close, '손절'))
+                cash += close * sum(f[2] for f in pos.fills)
+                positions[j] = None
+            elif signal['exit']:
+                trades.append(pos.close(panel.tickers[j], date, close, '익절'))
+                cash += close * sum(f[2] for f in pos.fills)
+                positions[j] = None
+            elif len(pos.fills) < MAX_UNITS and close >= pos.next_add:
+                shares = _unit_shares(capital, close, pos.atr, params)
+                if shares > 0 and close * shares <= capital + cash:
+                    pos.add(date, close, shares, params)
+                    cash -= close * shares
+
+            if positions[j] is not None:
+                held_value += close * sum(f[2] for f in positions[j].fills)
+        equity[t] = capital + cash + held_value
+
+    # 끝까지 들고 있는 포지션은 마지막 종가로 정리
+    for j, pos in enumerate(positions):
+        if pos is not None:
+            last = np.flatnonzero(~np.isnan(panel.close[:, j]))[-1]
+            trades.append(pos.close(panel.tickers[j], stamps[last], panel.close[last, j], '기간종료'))
+
+    trades.sort(key=lambda tr: (tr.entry_date, tr.ticker))
+    return BacktestResult(trades, pd.Series(equity, index=dates, name='equity'), capital, params)
+
+
+def run_vectorized(panel, params=TurtleParams(), capital=100_000_000, indicators=None):
+    """패널 지표 + 이벤트 지점 탐색 엔진.
+
+    종목마다 다음 이벤트(진입 후보, 손절/청산/추가매수 가격 도달)가 일어나는 봉을
+    NumPy 로 찾아 그 사이 봉은 건너뛰고, 모든 종목의 이벤트는 (봉, 종목 순서) 순으로
+    처리해서 이벤트 엔진과 같은 순서로 현금 한도를 적용합니다.
+    ``indicators`` 에 compute_indicators 결과를 넘기면 재사용합니다 (매개변수 탐색 시
+    같은 기간 조합끼리 공유).
+    """
+    ind = indicators if indicators is not None else compute_indicators(panel, params)
+    dates = pd.DatetimeIndex(panel.dates)
+    stamps = list(dates)  # 루프 안에서 Timestamp 를 매번 만들지 않도록 미리 변환
+    n_dates, n_tickers = panel.shape
+    trades = []
+    held = np.zeros((n_dates, n_tickers))      # 봉 종료 시점 보유 수량 변화
+    flows = np.zeros((n_dates, n_tickers))     # 현금 흐름
+    cash = 0.0
+
+    entry_mask = ind['entry'] & np.isfinite(ind['atr'])
+    candidates = [np.flatnonzero(entry_mask[:, j]) for j in range(n_tickers)]
+    last_bars = [0] * n_tickers
+    positions = [None] * n_tickers
+    events = []   # (봉, 종목) 힙
+    for j in range(n_tickers):
+        if len(candidates[j]):
+            last_bars[j] = np.flatnonzero(~np.isnan(panel.close[:, j]))[-1]
+            events.append((int(candidates[j][0]), j))
+    heapq.heapify(events)
+
+    def next_entry(j, bar):
+        k = np.searchsorted(candidates[j], bar, side='right')
+        if k < len(candidates[j]):
+            heapq.heappush(events, (int(candidates[j][k]), j))
+
+    def next_hit(j, s):
+        """``s`` 봉부터 손절/청산/추가매수 가격에 닿는 첫 봉 예약, 없으면 기간종료로 정리"""
+        pos = positions[j]
+        last_bar = last_bars[j]
+        if s <= last_bar:
+            seg = panel.close[s:last_bar + 1, j]
+            hit = (seg <= pos.stop) | (seg < ind['lower'][s:last_bar + 1, j])
+            if len(pos.fills) < MAX_UNITS:
+                hit |= seg >= pos.next_add
+            k = np.argmax(hit)
+            if hit[k]:
+                heapq.heappush(events, (s + int(k), j))
+                return
+        trades.append(pos.close(panel.tickers[j], stamps[last_bar], panel.close[last_bar, j], '기간종료'))
+        positions[j] = None
+
+    while events:
+        t, j = heapq.heappop(events)
+        c = panel.close[t, j]
+        pos = positions[j]
+
+        if pos is None:
+            n = ind['atr'][t, j]
+            shares = _unit_shares(capital, c, n, params)
+            if shares > 0 and c * shares <= capital + cash:
+                positions[j] = _Position(stamps[t], c, shares, n, params)
+                held[t, j] += shares
+                flows[t, j] -= c * shares
+                cash -= c * shares
+                next_hit(j, t + 1)
+            else:
+                next_entry(j, t)
+            continue
+
+        if c <= pos.stop or c < ind['lower'][t, j]:
+            total = sum(f[2] for f in pos.fills)
+            trades.append(pos.close(panel.tickers[j], stamps[t], c, '손절' if c <= pos.stop else '익절'))
+            held[t, j] -= total
+            flows[t, j] += c * total
+            cash += c * total
+            positions[j] = None
+            next_entry(j, t)
+            continue
+
+        shares = _unit_shares(capital, c, pos.atr, params)
+        if shares > 0 and c * shares <= capital + cash:
+            pos.add(stamps[t], c, shares, params)
+            held[t, j] += shares
+            flows[t, j] -= c * shares
+            cash -= c * shares
+        next_hit(j, t + 1)
+
+    # 평가금액 = 자본 + 누적 현금흐름 + 보유수량 × 종가 (거래정지 전 종가 유지)
+    position = np.cumsum(held, axis=0)
+    marked = np.where(position != 0, position * np.nan_to_num(panel.close), 0.0)
+    equity = capital + np.cumsum(flows, axis=0).sum(axis=1) + marked.sum(axis=1)
+
+    trades.sort(key=lambda tr: (tr.entry_date, tr.ticker))
+    return BacktestResult(trades, pd.Series(equity, index=dates, name='equity'), capital, params)
+
+
+def run(frames, params=TurtleParams(), capital=100_000_000, engine='vectorized'):
+    """{종목코드: 일봉 프레임} 으로 바로 백테스트"""
+    panel = build_panel(frames)
+    runner = run_vectorized if engine == 'vectorized' else run_event
+    return runner(panel, params, capital)
@@ -0,0 +1,243 @@
+"""포지션/청산 기록/스캔 결과 내보내기와 복원.
+
+"💾 백업 저장" 처럼 전체 포지션을 DataFrame 과 CSV 문자열로 한 번에 만들지
+않고, 저장소에서 ``chunk_size`` 건씩 읽어 CSV(utf-8-sig) 또는 Parquet 로
+이어 씁니다. 복원도 업로드 파일을 조각 단위로 읽어 스키마를 확인하고
+포지션ID 중복은 건너뛰면서 저장소에 넣어서, ``maxUploadSize`` (50MB)
+가까운 몇 년치 기록도 메모리 사용량이 일정합니다.
+
+    with open(path, 'wb') as f:
+        export_positions(store, f, fmt='parquet', status=STATUS_CLOSED)
+
+    report = restore_positions(store, uploaded_file)   # st.file_uploader 결과
+    report.inserted, report.duplicates, report.invalid
+
+Parquet 는 pyarrow 가 설치돼 있을 때만 씁니다.
+"""
+
+import io
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .position_store import (FIELDS, KEYS, STATUS_CLOSED, STATUS_EXIT, STATUS_OPEN,
+                             STATUS_STOP)
+
+CHUNK_SIZE = 5000
+FORMATS = ('csv', 'parquet')
+STATUSES = {STATUS_OPEN, STATUS_STOP, STATUS_EXIT, STATUS_CLOSED}
+MAX_REPORTED = 100   # 리포트에 남길 잘못된 행 수
+
+TEXT_KEYS = [key for key, _, kind in FIELDS if kind.startswith('TEXT')]
+NUMBER_KEYS = [key for key, _, kind in FIELDS if not kind.startswith('TEXT')]
+REQUIRED_KEYS = [key for key, _, kind in FIELDS
+                 if ('NOT NULL' in kind and 'DEFAULT' not in kind) or 'PRIMARY KEY' in kind]
+_TICKER = re.compile(r'^[0-9A-Z]{6}$')
+
+
+# ---------------------------------------------------------------- 내보내기
+
+def iter_csv(chunks, columns=None):
+    """DataFrame 조각들을 CSV 바이트 조각으로 (첫 조각에 BOM + 헤더, Excel 에서 한글이 깨지지 않게)"""
+    header = True
+    for chunk in chunks:
+        frame = chunk if isinstance(chunk, pd.DataFrame) else pd.DataFrame(chunk, columns=columns)
+        if columns is not None:
+            frame = frame[columns]
+        text = frame.to_csv(index=False, header=header)
+        yield (('\ufeff' if header else '') + text).encode('utf-8')
+        header = False
+    if header and columns is not None:
+        # 조각이 하나도 없어도 헤더는 씀
+        yield ('\ufeff' + ','.join(columns) + '\n').encode('utf-8')
+
+
+def _arrow_schema(pa):
+    types = {'TEXT': pa.string(), 'REAL': pa.float64(), 'INTEGER': pa.int64()}
+    return pa.schema([(key, types[kind.split()[0]]) for key, _, kind in FIELDS])
+
+
+def write_parquet(out, chunks, schema=None):
+    """DataFrame 조각마다 row group 하나씩 Parquet 로 기록, 쓴 행 수 반환"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    rows = 0
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, schema or table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+        if writer is None and schema is not None:
+            writer = pq.ParquetWriter(out, schema)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def write_csv(out, chunks, columns=None):
+    """CSV 조각을 파일 객체에 이어 씀, 쓴 바이트 수 반환"""
+    written = 0
+    for data in iter_csv(chunks, columns):
+        out.write(data)
+        written += len(data)
+    return written
+
+
+def _position_frames(store, status, chunk_size):
+    for rows in store.iter_chunks(status, chunk_size):
+        frame = pd.DataFrame(rows, columns=KEYS)
+        for key in NUMBER_KEYS:
+            frame[key] = pd.to_numeric(frame[key])
+        yield frame
+
+
+def export_positions(store, out, fmt='csv', status=None, chunk_size=CHUNK_SIZE):
+    """저장소 포지션을 ``out`` (바이너리 파일 객체)에 내보냄. ``status=STATUS_CLOSED`` 면 청산 기록만"""
+    frames = _position_frames(store, status, chunk_size)
+    if fmt == 'parquet':
+        import pyarrow as pa
+
+        return write_parquet(out, frames, _arrow_schema(pa))
+    if fmt == 'csv':
+        return write_csv(out, frames, KEYS)
+    raise ValueError(f'지원하지 않는 형식: {fmt}')
+
+
+def export_frame(df, out, fmt='csv', chunk_size=CHUNK_SIZE):
+    """results_df 같은 DataFrame 을 조각 단위로 내보냄 (종목코드 앞자리 0 유지)"""
+    chunks = (df.iloc[i:i + chunk_size] for i in range(0, len(df), chunk_size))
+    if fmt == 'parquet':
+        return write_parquet(out, chunks)
+    if fmt == 'csv':
+        return write_csv(out, chunks, list(df.columns))
+    raise ValueError(f'지원하지 않는 형식: {fmt}')
+
+
+def file_name(kind, fmt, now=None):
+    """다운로드 파일 이름 (예: turtle_positions_20250102_1530.csv)"""
+    now = now or pd.Timestamp.now()
+    return f"turtle_{kind}_{now.strftime('%Y%m%d_%H%M')}.{fmt}"
+
+
+# ---------------------------------------------------------------- 복원
+
+@dataclass
+class RestoreReport:
+    read: int = 0                                   # 읽은 행
+    inserted: int = 0                               # 새로 저장
+    duplicates: int = 0                             # 포지션ID 중복 (파일 안 또는 저장소에 이미 있음)
+    invalid: list = field(default_factory=list)     # [(행 번호, 사유)] 앞쪽 MAX_REPORTED 개
+    invalid_count: int = 0
+
+
+def detect_format(source):
+    """파일 이름 확장자나 첫 4바이트(PAR1)로 csv/parquet 판단"""
+    name = getattr(source, 'name', source if isinstance(source, str) else '')
+    if str(name).lower().endswith('.parquet'):
+        return 'parquet'
+    if hasattr(source, 'read') and hasattr(source, 'seek'):
+        position = source.tell()
+        magic = source.read(4)
+        source.seek(position)
+        if magic == b'PAR1':
+            return 'parquet'
+    return 'csv'
+
+
+def iter_upload(source, fmt=None, chunk_size=CHUNK_SIZE):
+    """업로드 파일(경로 또는 파일 객체)을 DataFrame 조각으로 읽음"""
+    fmt = fmt or detect_format(source)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    elif fmt == 'csv':
+        wrapper = None
+        if hasattr(source, 'read') and not isinstance(source, io.TextIOBase):
+            source = wrapper = io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+        try:
+            # 포지션ID/종목코드는 문자열로 (앞자리 0 유지)
+            yield from pd.read_csv(source, chunksize=chunk_size, encoding='utf-8-sig',
+                                   dtype={key: str for key in TEXT_KEYS}, keep_default_na=False,
+                                   na_values={key: [''] for key in NUMBER_KEYS},
+                                   float_precision='round_trip')
+        finally:
+            if wrapper is not None:
+                wrapper.detach()   # 업로드 파일 객체는 닫지 않음
+    else:
+        raise ValueError(f'지원하지 않는 형식: {fmt}')
+
+
+def validate_chunk(frame, offset=0):
+    """조각을 저장소 형식으로 정리해 ``(정상 dict 목록, [(행 번호, 사유)])`` 반환.
+
+    필수 열이 없으면 ValueError (파일 전체가 다른 형식).
+    """
+    missing = [key for key in REQUIRED_KEYS if key not in frame.columns]
+    if missing:
+        raise ValueError(f"필수 열이 없습니다: {', '.join(missing)}")
+
+    frame = frame.reindex(columns=KEYS)
+    for key in NUMBER_KEYS:
+        frame[key] = pd.to_numeric(frame[key], errors='coerce')
+    for key in TEXT_KEYS:
+        frame[key] = frame[key].where(frame[key].notna(), None)
+        frame[key] = frame[key].map(lambda v: (v.strip() or None) if isinstance(v, str) else v)
+
+    reasons = pd.Series('', index=frame.index)
+
+    def flag(mask, reason):
+        reasons[mask & (reasons == '')] = reason
+
+    for key in REQUIRED_KEYS:
+        flag(frame[key].isna(), f'{key} 없음')
+    ticker = frame['종목코드'].astype(str).str.zfill(6)
+    flag(~ticker.str.match(_TICKER), '종목코드 형식 오류')
+    flag(~frame['상태'].isin(STATUSES), '상태 값 오류')
+    quantity = frame['수량']
+    flag(~(np.isfinite(quantity) & (quantity > 0) & (np.floor(quantity) == quantity)), '수량 오류')
+    flag(~(np.isfinite(frame['진입가']) & (frame['진입가'] > 0)), '진입가 오류')
+
+    ok = reasons == ''
+    frame['종목코드'] = ticker
+    for key, _, kind in FIELDS:
+        if 'DEFAULT 0' in kind:
+            frame[key] = frame[key].fillna(0)
+    # 거른 행의 inf/NaN 때문에 정수 변환이 실패하지 않도록 정상 행만 변환
+    frame['수량'] = frame['수량'].where(ok, 0).fillna(0).astype(np.int64)
+
+    valid = frame[ok].astype(object)
+    rows = valid.where(valid.notna(), None).to_dict('records')
+    bad = [(offset + int(i) + 1, reasons[i]) for i in frame.index[~ok]]
+    return rows, bad
+
+
+def restore_positions(store, source, fmt=None, chunk_size=CHUNK_SIZE, on_progress=None):
+    """백업 파일을 조각 단위로 검증해 저장소에 추가, RestoreReport 반환.
+
+    ``source`` 는 경로 또는 ``st.file_uploader`` 가 돌려준 파일 객체.
+    ``on_progress(report)`` 는 조각마다 호출됩니다.
+    """
+    report = RestoreReport()
+    for frame in iter_upload(source, fmt, chunk_size):
+        frame = frame.reset_index(drop=True)
+        rows, bad = validate_chunk(frame, report.read)
+        report.read += len(frame)
+        report.invalid_count += len(bad)
+        report.invalid.extend(bad[:MAX_REPORTED - len(report.invalid)])
+
+        # 파일 안 중복도 저장소 기본키 충돌로 걸러지므로 따로 ID 를 모아두지 않음
+        inserted = store.add_many(rows)
+        report.inserted += inserted
+        report.duplicates += len(rows) - inserted
+        if on_progress is not None:
+            on_progress(report)
+    return report
@@ -0,0 +1,182 @@
+"""여러 종목 시세 동시 조회.
+
+관심종목을 한 종목씩 순서대로 받으면 전체 시간이 (지연 × 종목 수)로
+늘어납니다. 여기서는 제한된 스레드 풀로 동시에 받되, 실패하면 지수
+백오프로 재시도하며, 끝난 종목부터 바로 돌려줍니다.
+
+호스트별 요청 속도 제한(``limiter_for``)은 실제 네트워크 조회 직전에 걸어야
+캐시(OHLCVCache, MarketDataService)에서 바로 나오는 조회가 기다리지 않습니다.
+OHLCVCache 는 pykrx 조회 앞에서 직접 걸고 ``rate_limited = True`` 로 표시하므로
+일괄 조회는 그대로 부르고, 표시가 없는 ``fetch_one`` (매번 네트워크로 가는
+turtle_system 등)에는 기본으로 ``limiter_for()`` 를 겁니다.
+
+    for ticker, df, error in iter_market_data(tickers, turtle_system.get_market_data):
+        ...  # 도착한 순서대로 신호 계산
+
+    result = get_market_data_many(turtle_system, tickers, days=60)
+    result.frames, result.failures
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from . import instrumentation
+
+
+class RateLimiter:
+    """토큰 버킷 방식 초당 요청 수 제한 (스레드 안전)"""
+
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1, rate))
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
+
+
+# 호스트별로 하나씩 공유 (pykrx 는 KRX 정보데이터시스템 한 곳을 호출)
+_limiters = {}
+_limiters_guard = threading.Lock()
+
+
+def limiter_for(host='krx', rate=10, burst=None):
+    with _limiters_guard:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = RateLimiter(rate, burst)
+        return limiter
+
+
+def is_rate_limited(fetch_one):
+    """``fetch_one`` (메서드면 그 객체)이 네트워크 조회 앞에서 직접 속도 제한을 거는지"""
+    owner = getattr(fetch_one, '__self__', fetch_one)
+    return bool(getattr(owner, 'rate_limited', False))
+
+
+@dataclass
+class BatchResult:
+    """일괄 조회 결과: 성공 프레임, 실패 사유, 재시도 횟수, 소요 시간"""
+    frames: dict = field(default_factory=dict)
+    failures: dict = field(default_factory=dict)
+    retries: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self):
+        return not self.failures
+
+
+class EmptyDataError(Exception):
+    """조회는 성공했지만 데이터가 없음 (잘못된 코드, 상장폐지 등) — 재시도하지 않음"""
+
+
+def fetch_with_retry(fetch_one, ticker, days, limiter=None, retries=3, backoff=0.5,
+                     sleep=time.sleep):
+    """한 종목 조회, (프레임, 재시도 횟수) 반환. 재시도 후에도 실패하면 마지막 예외를 올림"""
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            with instrumentation.span('get_market_data'):
+                df = fetch_one(ticker, days)
+        except Exception:
+            if attempt >= retries:
+                instrumentation.count('fetch.failure')
+                raise
+            instrumentation.count('fetch.retry')
+            # 지수 백오프 + 지터 (동시에 실패한 요청들이 한꺼번에 다시 몰리지 않도록)
+            sleep(backoff * (2 ** attempt) * (0.5 + random.random()))
+            attempt += 1
+            continue
+        if df is None or df.empty:
+            raise EmptyDataError(f'{ticker}: 데이터 없음')
+        return df, attempt
+
+
+def iter_market_data(tickers, fetch_one, days=60, max_workers=8, limiter=None,
+                     retries=3, backoff=0.5, stats=None, sleep=time.sleep):
+    """종목별 조회를 동시에 실행하고 끝나는 순서대로 ``(ticker, df, error)`` 를 내보냄.
+
+    ``fetch_one(ticker, days)`` 는 ``turtle_system.get_market_data`` 와 같은 형태입니다.
+    ``limiter`` 는 ``fetch_one`` 호출마다 걸립니다. 주지 않으면 캐시 경유 조회
+    (``is_rate_limited``)는 제한 없이, 나머지는 호스트 공용 ``limiter_for()`` 로 제한합니다.
+    ``stats`` 에 BatchResult 를 넘기면 재시도 횟수를 누적합니다.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return
+
+    if limiter is None and not is_rate_limited(fetch_one):
+        limiter = limiter_for()
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as pool:
+        futures = {
+            pool.submit(fetch_with_retry, fetch_one, ticker, days, limiter, retries, backoff, sleep): ticker
+            for ticker in tickers
+        }
+        try:
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    df, attempts = future.result()
+                except Exception as e:
+                    yield ticker, None, e
+                else:
+                    if stats is not None:
+                        stats.retries += attempts
+                    yield ticker, df, None
+        finally:
+            # 소비자가 중간에 멈추면 아직 시작 안 한 조회는 취소
+            for future in futures:
+                future.cancel()
+
+
+def get_market_data_many(turtle_system, tickers, days=60, on_result=None, **options):
+    """여러 종목을 동시에 받아 BatchResult 로 반환.
+
+    ``turtle_system`` 은 ``get_market_data(ticker, days)`` 를 가진 객체 또는 같은 형태의 함수.
+    ``on_result(ticker, df, error)`` 를 주면 도착하는 대로 호출합니다 (진행률 표시 등).
+    """
+    fetch_one = getattr(turtle_system, 'get_market_data', turtle_system)
+    result = BatchResult()
+    started = time.perf_counter()
+
+    for ticker, df, error in iter_market_data(tickers, fetch_one, days, stats=result, **options):
+        if error is None:
+            result.frames[ticker] = df
+        else:
+            result.failures[ticker] = error
+        if on_result is not None:
+            on_result(ticker, df, error)
+
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def attach(turtle_system, **options):
+    """turtle_system 에 ``get_market_data_many(tickers, days)`` 메서드를 붙임"""
+    fetch_one = turtle_system.get_market_data
+
+    def get_many(tickers, days=60, on_result=None):
+        return get_market_data_many(fetch_one, tickers, days, on_result=on_result, **options)
+
+    turtle_system.get_market_data_many = get_many
+    return turtle_system
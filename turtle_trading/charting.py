@@ -0,0 +1,184 @@
+"""차트 데이터 캐시와 다운샘플링.
+
+차트 분석 탭에서 종목을 바꿀 때마다 Donchian 채널과 신호 위치를 다시
+계산하지 않도록 (종목코드, 마지막 봉 날짜와 값, 매개변수, 점 개수) 단위로 차트
+데이터를 LRU 캐시에 둡니다. 기간이 길어지면 봉은 OHLC 구간 묶음,
+선은 LTTB 로 줄여서 브라우저로 보내는 점 개수를 ``max_points`` 이하로 유지합니다.
+
+    payload = chart_payload(ticker, df)
+    st.line_chart(payload.lines)               # 종가 + Donchian 상단/하단
+    st.plotly_chart(to_plotly(payload, name))  # plotly 가 있으면 캔들 차트
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from . import instrumentation
+from .indicators import TurtleParams, build_panel, compute_indicators
+from .lazy import go
+from .market_cache import OHLCV_COLUMNS
+
+DEFAULT_MAX_POINTS = 400
+
+
+@dataclass
+class ChartPayload:
+    candles: pd.DataFrame    # 시가/고가/저가/종가/거래량 (구간 묶음 후)
+    lines: pd.DataFrame      # 종가/Donchian상단/Donchian하단 (LTTB 또는 구간 대표값)
+    markers: pd.DataFrame    # 진입/청산 신호 발생 봉 (날짜, 가격, 종류)
+    bars: int                # 원본 봉 수
+    bucket: int              # 한 점에 묶인 봉 수 (1 이면 원본)
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets 로 ``threshold`` 개 점의 인덱스 선택"""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # 다음 구간 평균점
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean() if next_end > end else x[-1]
+        avg_y = y[end:next_end].mean() if next_end > end else y[-1]
+        # 이전 선택점-후보-다음 평균점 삼각형 넓이가 가장 큰 후보
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.nanargmax(area)) if end > start else start
+        selected[i + 1] = a
+    return selected
+
+
+def bucket_ohlc(frame, bucket):
+    """``bucket`` 봉씩 묶어 시가=첫값, 고가=최고, 저가=최저, 종가=끝값, 거래량=합"""
+    if bucket <= 1:
+        return frame
+    groups = np.arange(len(frame)) // bucket
+    grouped = frame.groupby(groups)
+    out = pd.DataFrame({
+        '시가': grouped['시가'].first().to_numpy(),
+        '고가': grouped['고가'].max().to_numpy(),
+        '저가': grouped['저가'].min().to_numpy(),
+        '종가': grouped['종가'].last().to_numpy(),
+        '거래량': grouped['거래량'].sum().to_numpy(),
+    }, index=frame.index[::bucket])
+    out.index.name = frame.index.name
+    return out
+
+
+@instrumentation.timed('create_simple_chart.payload')
+def build_payload(frame, params=TurtleParams(), max_points=DEFAULT_MAX_POINTS):
+    """일봉 프레임에서 오버레이/신호를 미리 계산하고 점 개수를 제한한 차트 데이터 생성"""
+    panel = build_panel({'_': frame})
+    ind = compute_indicators(panel, params)
+    index = pd.DatetimeIndex(panel.dates, name='날짜')
+    full = pd.DataFrame({
+        '시가': panel.open[:, 0], '고가': panel.high[:, 0], '저가': panel.low[:, 0],
+        '종가': panel.close[:, 0], '거래량': panel.volume[:, 0],
+    }, index=index)
+    overlay = pd.DataFrame({
+        '종가': panel.close[:, 0],
+        'Donchian상단': ind['upper'][:, 0],
+        'Donchian하단': ind['lower'][:, 0],
+    }, index=index)
+
+    entry = ind['entry'][:, 0]
+    exit_ = ind['exit'][:, 0]
+    markers = pd.concat([
+        pd.DataFrame({'가격': panel.close[entry, 0], '종류': '진입'}, index=index[entry]),
+        pd.DataFrame({'가격': panel.close[exit_, 0], '종류': '청산'}, index=index[exit_]),
+    ]).sort_index()
+
+    bars = len(full)
+    bucket = max(1, -(-bars // max_points))
+    candles = bucket_ohlc(full, bucket)
+    if bucket == 1:
+        lines = overlay
+    else:
+        # 종가는 모양을 살리는 LTTB, 채널은 구간 최고/최저로 묶어 밴드가 가늘어지지 않게
+        keep = lttb(np.arange(bars), overlay['종가'].to_numpy(), max_points)
+        groups = np.arange(bars) // bucket
+        channel = overlay.groupby(groups).agg({'Donchian상단': 'max', 'Donchian하단': 'min'})
+        lines = overlay.iloc[keep][['종가']].copy()
+        lines['Donchian상단'] = channel['Donchian상단'].to_numpy()[groups[keep]]
+        lines['Donchian하단'] = channel['Donchian하단'].to_numpy()[groups[keep]]
+        if len(markers) > max_points:
+            markers = markers.iloc[lttb(np.arange(len(markers)), markers['가격'].to_numpy(), max_points)]
+
+    return ChartPayload(candles, lines, markers, bars, bucket)
+
+
+class ChartCache:
+    """(종목코드, 마지막 봉 날짜와 OHLCV, 매개변수, 점 개수) 키의 LRU 차트 데이터 캐시"""
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, ticker, frame, params=TurtleParams(), max_points=DEFAULT_MAX_POINTS):
+        if frame is None or frame.empty:
+            return None
+        # 장중에는 날짜와 봉 수가 같아도 마지막 봉 값이 바뀌므로 키에 포함
+        last = tuple(None if v != v else v   # NaN 은 자기 자신과 같지 않아 키로 못 씀
+                     for v in frame[[c for c in OHLCV_COLUMNS if c in frame.columns]].iloc[-1].tolist())
+        key = (ticker, frame.index[-1], len(frame), last, params, max_points)
+        with self._lock:
+            payload = self._items.get(key)
+            if payload is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                instrumentation.count('chart_cache.hit')
+                return payload
+            self.misses += 1
+            instrumentation.count('chart_cache.miss')
+
+        payload = build_payload(frame, params, max_points)
+        with self._lock:
+            self._items[key] = payload
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return payload
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+_default_cache = ChartCache()
+
+
+def chart_payload(ticker, frame, params=TurtleParams(), max_points=DEFAULT_MAX_POINTS):
+    """프로세스 공용 캐시를 거쳐 차트 데이터 반환"""
+    return _default_cache.get(ticker, frame, params, max_points)
+
+
+def to_plotly(payload, title=''):
+    """캔들 + Donchian 채널 + 신호 마커 plotly Figure (plotly 는 필요할 때만 import)"""
+    candles = payload.candles
+    fig = go.Figure()
+    fig.add_trace(go.Candlestick(x=candles.index, open=candles['시가'], high=candles['고가'],
+                                 low=candles['저가'], close=candles['종가'], name='가격'))
+    fig.add_trace(go.Scatter(x=payload.lines.index, y=payload.lines['Donchian상단'],
+                             line=dict(color='green', dash='dash'), name='Donchian상단'))
+    fig.add_trace(go.Scatter(x=payload.lines.index, y=payload.lines['Donchian하단'],
+                             line=dict(color='red', dash='dash'), name='Donchian하단'))
+    for kind, symbol, color in (('진입', 'triangle-up', 'green'), ('청산', 'triangle-down', 'red')):
+        points = payload.markers[payload.markers['종류'] == kind]
+        fig.add_trace(go.Scatter(x=points.index, y=points['가격'], mode='markers',
+                                 marker=dict(symbol=symbol, size=10, color=color), name=f'{kind} 신호'))
+    fig.update_layout(title=title, xaxis_rangeslider_visible=False, height=500)
+    return fig
@@ -0,0 +1,145 @@
+"""프로세스 공용 시세 조회 계층.
+
+Streamlit 세션마다 ``st.session_state`` 가 따로라서, 장 시작에 여러 명이
+접속하면 같은 종목을 세션 수만큼 받게 됩니다. 이 모듈의 서비스는 프로세스에
+하나만 만들어 모든 세션이 공유하고,
+
+- 같은 (종목, 기간) 요청이 동시에 들어오면 한 번만 조회하고 나머지는 그 결과를 기다리며 (single-flight)
+- 결과는 크기 제한 LRU 에 두되, 장중에는 짧게, 장 마감 후에는 다음 장 시작까지 보관하고
+- 적중/미스/합쳐진 요청/진행 중 조회 수를 집계합니다.
+
+호출자는 저장된 프레임의 복사본을 받으므로 (turtle_system 처럼) 지표 열을 제자리에
+추가해도 다른 세션이 보는 캐시는 바뀌지 않습니다.
+
+    service = get_service(turtle_system.get_market_data)
+    attach(turtle_system, service)
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from . import instrumentation
+from .batch_fetch import is_rate_limited
+from .market_hours import is_market_open, next_open, now_kst
+
+
+class MarketDataService:
+    """single-flight + TTL LRU 시세 캐시 (스레드 안전)"""
+
+    def __init__(self, fetch_one, maxsize=1024, intraday_ttl=60, clock=now_kst):
+        self.fetch_one = fetch_one
+        self.maxsize = maxsize
+        self.intraday_ttl = intraday_ttl
+        self.clock = clock
+        self._items = OrderedDict()   # key -> (만료 시각, 프레임)
+        self._inflight = {}           # key -> Future
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def ttl_until(self, now):
+        """지금 받은 데이터의 만료 시각: 장중이면 intraday_ttl 초 뒤, 아니면 다음 장 시작"""
+        if is_market_open(now):
+            return now.timestamp() + self.intraday_ttl
+        return next_open(now).timestamp()
+
+    def get_market_data(self, ticker, days=60):
+        """turtle_system.get_market_data 와 같은 형태 (호출마다 새 복사본 반환)"""
+        key = (ticker, days)
+        now = self.clock()
+
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[0] > now.timestamp():
+                self._items.move_to_end(key)
+                self.hits += 1
+                instrumentation.count('data_service.hit')
+                return _copy(item[1])
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                instrumentation.count('data_service.coalesced')
+                owner = False
+            else:
+                self.misses += 1
+                future = self._inflight[key] = Future()
+                owner = True
+
+        if not owner:
+            return _copy(future.result())
+
+        try:
+            frame = self.fetch_one(ticker, days)
+        except BaseException as e:
+            with self._lock:
+                self.errors += 1
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            if frame is not None and not frame.empty:
+                self._items[key] = (self.ttl_until(self.clock()), frame)
+                self._items.move_to_end(key)
+                while len(self._items) > self.maxsize:
+                    self._items.popitem(last=False)
+            del self._inflight[key]
+        future.set_result(frame)
+        return _copy(frame)
+
+    @property
+    def rate_limited(self):
+        """미스가 가는 ``fetch_one`` 이 직접 속도 제한을 걸 때만 True (적중까지 제한하지 않도록)"""
+        return is_rate_limited(self.fetch_one)
+
+    def invalidate(self, ticker=None):
+        with self._lock:
+            if ticker is None:
+                self._items.clear()
+            else:
+                for key in [k for k in self._items if k[0] == ticker]:
+                    del self._items[key]
+
+    @property
+    def metrics(self):
+        with self._lock:
+            total = self.hits + self.misses + self.coalesced
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._inflight),
+                'errors': self.errors,
+                'size': len(self._items),
+                'hit_rate': (self.hits + self.coalesced) / total if total else 0.0,
+            }
+
+
+def _copy(frame):
+    return None if frame is None else frame.copy()
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_service(fetch_one=None, **options):
+    """프로세스에 하나뿐인 서비스 반환 (처음 호출할 때 ``fetch_one`` 으로 생성)"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            if fetch_one is None:
+                raise ValueError('처음 호출할 때는 fetch_one 이 필요합니다')
+            _service = MarketDataService(fetch_one, **options)
+        return _service
+
+
+def attach(turtle_system, service=None):
+    """turtle_system.get_market_data 를 공용 서비스 경유로 교체"""
+    service = service or get_service(turtle_system.get_market_data)
+    turtle_system.get_market_data = service.get_market_data
+    return turtle_system
@@ -0,0 +1,273 @@
+"""전 종목 동시 터틀 지표 계산.
+
+종목마다 DataFrame 을 따로 만드는 대신, 모든 종목을 (날짜 × 종목)
+NumPy 패널 하나로 쌓아서 Donchian 채널, Wilder ATR, 거래량 급증 비율을
+한 번에 계산하고 신호 분석 탭의 ``results_df`` 를 바로 만듭니다.
+
+규칙 (app.py 신호 분석과 동일)
+- Donchian상단: 직전 20일 고가 최고값, 종가가 넘으면 진입신호
+- Donchian하단: 직전 10일 저가 최저값, 종가가 밑돌면 청산신호
+- ATR(N): 20일 Wilder ATR (첫 20개 TR 평균으로 시작)
+- 손절가: 종가 - 2N, 추가매수1: 종가 + 0.5N
+- 거래량급증: 당일 거래량 / 직전 20일 평균 거래량 >= 2
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from . import instrumentation
+from .market_cache import OHLCV_COLUMNS
+
+RESULT_COLUMNS = [
+    '종목코드', '종목명', '현재가', 'ATR(N)', 'Donchian상단', 'Donchian하단',
+    '손절가', '추가매수1', '진입신호', '청산신호', '거래량급증', '거래량', '거래량비율',
+]
+
+
+@dataclass(frozen=True)
+class TurtleParams:
+    """터틀 규칙 매개변수 (사이드바의 Donchian/ATR 기간 설정과 대응)"""
+    entry_period: int = 20
+    exit_period: int = 10
+    atr_period: int = 20
+    stop_multiple: float = 2.0
+    add_step: float = 0.5
+    volume_period: int = 20
+    volume_surge: float = 2.0
+    risk_pct: float = 0.02
+
+    @property
+    def warmup(self):
+        """지표가 모두 채워지는 데 필요한 최소 봉 수"""
+        return max(self.entry_period, self.exit_period, self.atr_period, self.volume_period) + 1
+
+
+@dataclass
+class Panel:
+    """(날짜 × 종목) 정렬된 OHLCV 배열 묶음. 상장 전 구간은 NaN"""
+    dates: np.ndarray
+    tickers: list
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @property
+    def shape(self):
+        return self.close.shape
+
+    def frame(self, ticker):
+        """한 종목을 get_market_data 와 같은 형태의 프레임으로 꺼냄"""
+        j = self.tickers.index(ticker)
+        values = np.column_stack([self.open[:, j], self.high[:, j], self.low[:, j],
+                                  self.close[:, j], self.volume[:, j]])
+        frame = pd.DataFrame(values, index=pd.DatetimeIndex(self.dates, name='날짜'),
+                             columns=OHLCV_COLUMNS)
+        return frame.dropna()
+
+
+@instrumentation.timed('signals.build_panel')
+def build_panel(frames):
+    """{종목코드: OHLCV 프레임} 을 Panel 로 정렬.
+
+    날짜는 전 종목 합집합을 씁니다. 상장 이후 빠진 날(거래정지)은 전일 종가로
+    시가/고가/저가/종가를 채우고 거래량은 0 으로 둡니다.
+    """
+    tickers = [t for t, df in frames.items() if df is not None and len(df)]
+    indexes = [frames[t].index.values.astype('datetime64[ns]') for t in tickers]
+    dates = np.unique(np.concatenate(indexes)) if indexes else np.array([], dtype='datetime64[ns]')
+
+    shape = (len(dates), len(tickers))
+    arrays = {col: np.full(shape, np.nan) for col in OHLCV_COLUMNS}
+    for j, (ticker, index) in enumerate(zip(tickers, indexes)):
+        rows = np.searchsorted(dates, index)
+        df = frames[ticker]
+        if list(df.columns) != OHLCV_COLUMNS:
+            df = df[OHLCV_COLUMNS]
+        values = df.to_numpy(dtype='float64', copy=False)
+        for k, col in enumerate(OHLCV_COLUMNS):
+            arrays[col][rows, j] = values[:, k]
+
+    close = _ffill(arrays['종가'])
+    halted = np.isnan(arrays['종가']) & ~np.isnan(close)
+    for col in ('시가', '고가', '저가'):
+        arrays[col][halted] = close[halted]
+    arrays['거래량'][halted] = 0.0
+
+    return Panel(dates, tickers, arrays['시가'], arrays['고가'], arrays['저가'], close, arrays['거래량'])
+
+
+def _ffill(values):
+    """열 방향 forward-fill (선행 NaN 은 유지)"""
+    mask = np.isnan(values)
+    index = np.where(~mask, np.arange(values.shape[0])[:, None], 0)
+    np.maximum.accumulate(index, axis=0, out=index)
+    filled = values[index, np.arange(values.shape[1])]
+    # 첫 값 이전(상장 전)은 다시 NaN
+    filled[np.cumsum(~mask, axis=0) == 0] = np.nan
+    return filled
+
+
+def rolling_max(values, window):
+    """직전 ``window`` 개 행(당일 제외)의 최고값, 부족하면 NaN"""
+    return _rolling(values, window, np.max)
+
+
+def rolling_min(values, window):
+    """직전 ``window`` 개 행(당일 제외)의 최저값, 부족하면 NaN"""
+    return _rolling(values, window, np.min)
+
+
+def _rolling(values, window, reduce):
+    out = np.full(values.shape, np.nan)
+    if values.shape[0] > window:
+        windows = sliding_window_view(values[:-1], window, axis=0)
+        out[window:] = reduce(windows, axis=-1)
+    return out
+
+
+def window_mean(windows, axis=-1):
+    """``axis`` 방향 평균을 앞에서부터 차례로 더해 계산.
+
+    np.mean 은 배열 모양/메모리 배치에 따라 더하는 순서가 달라져서 종목 수가 다른
+    패널이나 streaming.IndicatorState 와 마지막 비트가 어긋날 수 있습니다.
+    """
+    windows = np.moveaxis(np.asarray(windows, dtype='float64'), axis, -1)
+    total = np.zeros(windows.shape[:-1])
+    for k in range(windows.shape[-1]):
+        total += windows[..., k]
+    return total / windows.shape[-1]
+
+
+def true_range(high, low, close):
+    """TR = max(고가-저가, |고가-전일종가|, |저가-전일종가|), 첫 봉은 고가-저가"""
+    prev_close = np.vstack([np.full((1,) + close.shape[1:], np.nan), close[:-1]])
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return tr
+
+
+def wilder_atr(high, low, close, period):
+    """Wilder ATR. 종목별로 첫 ``period`` 개 TR 평균에서 시작해
+    ``(ATR*(n-1) + TR) / n`` 로 갱신합니다. 시간축만 돌고 종목축은 벡터 연산."""
+    tr = true_range(high, low, close)
+    out = np.full(tr.shape, np.nan)
+    acc = np.zeros(tr.shape[1:])
+    count = np.zeros(tr.shape[1:], dtype=np.int64)
+    atr = np.full(tr.shape[1:], np.nan)
+
+    for t in range(tr.shape[0]):
+        row = tr[t]
+        valid = ~np.isnan(row)
+        seeding = valid & (count < period)
+        rolling = valid & (count >= period)
+
+        atr[rolling] = (atr[rolling] * (period - 1) + row[rolling]) / period
+        acc[seeding] += row[seeding]
+        count[seeding] += 1
+        seeded = seeding & (count == period)
+        atr[seeded] = acc[seeded] / period
+
+        out[t] = np.where(count >= period, atr, np.nan)
+    return out
+
+
+def volume_ratio(volume, period):
+    """당일 거래량 / 직전 ``period`` 일 평균 거래량"""
+    mean = _rolling(volume, period, window_mean)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(mean > 0, volume / mean, np.nan)
+
+
+def compute_indicators(panel, params=TurtleParams()):
+    """패널 전체 구간의 지표 배열 사전 (각 값은 날짜 × 종목)"""
+    atr = wilder_atr(panel.high, panel.low, panel.close, params.atr_period)
+    upper = rolling_max(panel.high, params.entry_period)
+    lower = rolling_min(panel.low, params.exit_period)
+    ratio = volume_ratio(panel.volume, params.volume_period)
+    close = panel.close
+    return {
+        'atr': atr,
+        'upper': upper,
+        'lower': lower,
+        'stop': close - params.stop_multiple * atr,
+        'add1': close + params.add_step * atr,
+        'entry': close > upper,
+        'exit': close < lower,
+        'volume_ratio': ratio,
+        'volume_surge': ratio >= params.volume_surge,
+    }
+
+
+def latest_indicators(panel, params=TurtleParams()):
+    """마지막 봉 기준 지표만 계산 (신호 분석용).
+
+    Donchian/거래량은 마지막 창만 보면 되고, ATR 만 전 구간을 한 번 훑습니다.
+    """
+    close = panel.close[-1]
+    atr = wilder_atr(panel.high, panel.low, panel.close, params.atr_period)[-1]
+
+    def last_window(values, window, reduce):
+        if values.shape[0] <= window:
+            return np.full(values.shape[1], np.nan)
+        return reduce(values[-window - 1:-1], axis=0)
+
+    upper = last_window(panel.high, params.entry_period, np.max)
+    lower = last_window(panel.low, params.exit_period, np.min)
+    mean_volume = last_window(panel.volume, params.volume_period, window_mean)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(mean_volume > 0, panel.volume[-1] / mean_volume, np.nan)
+
+    return {
+        'close': close,
+        'volume': panel.volume[-1],
+        'atr': atr,
+        'upper': upper,
+        'lower': lower,
+        'stop': close - params.stop_multiple * atr,
+        'add1': close + params.add_step * atr,
+        'entry': close > upper,
+        'exit': close < lower,
+        'volume_ratio': ratio,
+        'volume_surge': ratio >= params.volume_surge,
+    }
+
+
+@instrumentation.timed('signals.scan')
+def scan(panel, names=None, params=TurtleParams()):
+    """패널 마지막 봉으로 신호 분석 탭의 ``results_df`` 생성.
+
+    ``names`` 는 {종목코드: 종목명} (tickers_dict). 지표를 채울 만큼 데이터가
+    없는 종목은 결과에서 빠집니다.
+    """
+    names = names or {}
+    latest = latest_indicators(panel, params)
+    ok = np.isfinite(latest['atr']) & np.isfinite(latest['upper']) & np.isfinite(latest['lower'])
+    tickers = np.asarray(panel.tickers, dtype=object)[ok]
+
+    def as_int(values):
+        return np.round(values[ok]).astype(np.int64)
+
+    return pd.DataFrame({
+        '종목코드': tickers,
+        '종목명': [names.get(t, t) for t in tickers],
+        '현재가': as_int(latest['close']),
+        'ATR(N)': latest['atr'][ok],
+        'Donchian상단': as_int(latest['upper']),
+        'Donchian하단': as_int(latest['lower']),
+        '손절가': as_int(latest['stop']),
+        '추가매수1': as_int(latest['add1']),
+        '진입신호': latest['entry'][ok],
+        '청산신호': latest['exit'][ok],
+        '거래량급증': latest['volume_surge'][ok],
+        '거래량': as_int(latest['volume']),
+        '거래량비율': latest['volume_ratio'][ok],
+    }, columns=RESULT_COLUMNS)
+
+
+def scan_frames(frames, names=None, params=TurtleParams()):
+    """{종목코드: 프레임} 에서 바로 ``results_df`` 생성"""
+    return scan(build_panel(frames), names, params)
@@ -0,0 +1,199 @@
+"""구간별 소요 시간/카운터 계측.
+
+스캔이 느릴 때 pykrx 조회, 지표 계산, results_df 생성, 화면 그리기 중
+어디서 시간이 드는지 보기 위한 가벼운 계측 계층입니다.
+
+    with span('get_market_data'):
+        df = turtle_system.get_market_data(ticker, days=60)
+
+    @timed('calculate_position_size')
+    def calculate_position_size(...): ...
+
+    count('cache_hit')
+    summary()                 # 구간별 count/p50/p95/max (ms)
+    export_jsonl('metrics.jsonl')
+    result, text = profile(run_scan)    # cProfile 로 한 번 실행
+    result, top = sample(run_scan)      # py-spy 처럼 스택 샘플링 (오버헤드 적음)
+
+구간별로 최근 ``RESERVOIR`` 개 기록만 메모리에 둡니다.
+"""
+
+import cProfile
+import functools
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+RESERVOIR = 2048
+
+_lock = threading.Lock()
+_durations = defaultdict(lambda: deque(maxlen=RESERVOIR))
+_events = deque(maxlen=RESERVOIR * 4)
+_counters = defaultdict(int)
+enabled = True
+
+
+def record(name, seconds, **tags):
+    if not enabled:
+        return
+    with _lock:
+        _durations[name].append(seconds)
+        _events.append({'type': 'span', 'name': name, 'ms': seconds * 1000, 'ts': time.time(), **tags})
+
+
+@contextmanager
+def span(name, **tags):
+    """with 블록 소요 시간 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started, **tags)
+
+
+def timed(name=None):
+    """함수 호출 시간 기록 데코레이터"""
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(label, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def instrument(obj, *methods, prefix=None):
+    """객체의 메서드를 계측 버전으로 교체 (예: ``instrument(turtle_system, 'get_market_data')``)"""
+    for method in methods:
+        label = f'{prefix}.{method}' if prefix else method
+        setattr(obj, method, timed(label)(getattr(obj, method)))
+    return obj
+
+
+def count(name, value=1):
+    if not enabled:
+        return
+    with _lock:
+        _counters[name] += value
+        _events.append({'type': 'counter', 'name': name, 'value': value, 'ts': time.time()})
+
+
+def summary():
+    """{구간: {count, p50_ms, p95_ms, max_ms, total_ms}}, 카운터는 'counters' 키"""
+    with _lock:
+        durations = {name: np.array(values) * 1000 for name, values in _durations.items() if values}
+        counters = dict(_counters)
+    stages = {
+        name: {
+            'count': int(len(ms)),
+            'p50_ms': float(np.percentile(ms, 50)),
+            'p95_ms': float(np.percentile(ms, 95)),
+            'max_ms': float(ms.max()),
+            'total_ms': float(ms.sum()),
+        }
+        for name, ms in sorted(durations.items())
+    }
+    return {'stages': stages, 'counters': counters}
+
+
+def export_jsonl(path_or_file):
+    """쌓인 이벤트를 JSON Lines 로 내보냄 (파일 경로면 덮어씀, 또는 쓰기 가능한 파일 객체)"""
+    with _lock:
+        events = list(_events)
+    if hasattr(path_or_file, 'write'):
+        for event in events:
+            path_or_file.write(json.dumps(event, ensure_ascii=False) + '\n')
+    else:
+        with open(path_or_file, 'w', encoding='utf-8') as f:
+            for event in events:
+                f.write(json.dumps(event, ensure_ascii=False) + '\n')
+    return len(events)
+
+
+def reset():
+    with _lock:
+        _durations.clear()
+        _events.clear()
+        _counters.clear()
+
+
+def profile(func, *args, sort='cumulative', limit=30, **kwargs):
+    """``func`` 를 cProfile 로 한 번 실행하고 (결과, 통계 문자열) 반환"""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args, **kwargs)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(limit)
+    return result, out.getvalue()
+
+
+def sample(func, *args, interval=0.005, limit=30, **kwargs):
+    """``func`` 실행 중 호출 스레드 스택을 주기적으로 찍어 (결과, [(위치, 비율)]) 반환.
+
+    cProfile 보다 오버헤드가 작아서 실제에 가까운 스캔 시간을 유지합니다.
+    """
+    target = threading.get_ident()
+    samples = defaultdict(int)
+    done = threading.Event()
+
+    def sampler():
+        while not done.wait(interval):
+            frame = sys._current_frames().get(target)
+            seen = set()
+            # 스택에 있는 함수마다 1 (누적 시간 비율)
+            while frame is not None:
+                code = frame.f_code
+                key = f'{code.co_filename}:{code.co_firstlineno}({code.co_name})'
+                if key not in seen:
+                    seen.add(key)
+                    samples[key] += 1
+                frame = frame.f_back
+            samples['<total>'] += 1
+
+    thread = threading.Thread(target=sampler, name='sampler', daemon=True)
+    thread.start()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        done.set()
+        thread.join()
+
+    total = samples.pop('<total>', 0) or 1
+    top = sorted(samples.items(), key=lambda item: -item[1])[:limit]
+    return result, [(key, hits / total) for key, hits in top]
+
+
+def render_admin_panel(st):
+    """관리자 탭: 구간별 p50/p95 표, 카운터, JSONL 다운로드 (``st`` 는 streamlit 모듈)"""
+    import pandas as pd
+
+    data = summary()
+    st.subheader('⏱️ 구간별 소요 시간')
+    if data['stages']:
+        table = pd.DataFrame.from_dict(data['stages'], orient='index')
+        st.dataframe(table.round(2), use_container_width=True)
+    else:
+        st.info('아직 기록된 구간이 없습니다.')
+
+    if data['counters']:
+        st.subheader('🔢 카운터')
+        st.json(data['counters'])
+
+    buffer = io.StringIO()
+    export_jsonl(buffer)
+    st.download_button('📄 metrics.jsonl 다운로드', buffer.getvalue(), file_name='metrics.jsonl',
+                       mime='application/x-ndjson')
+    if st.button('🧹 기록 초기화'):
+        reset()
+        st.rerun()
@@ -0,0 +1,72 @@
+"""무거운 모듈 지연 import.
+
+pykrx 는 import 만으로 requests/lxml/bs4/matplotlib 까지 끌어오고, plotly 도
+수백 ms 가 걸립니다. 첫 화면에는 필요 없으니 실제로 속성을 처음 쓸 때
+import 하고, 첫 화면이 그려진 뒤에는 백그라운드에서 미리 불러둘 수 있습니다.
+
+    from turtle_trading.lazy import go, stock
+
+    stock.get_market_ohlcv_by_date(...)   # 이때 pykrx 를 import
+    warm_imports()                         # 첫 화면 뒤에 호출하면 백그라운드에서 미리 import
+"""
+
+import importlib
+import sys
+import threading
+
+HEAVY_MODULES = ('pykrx.stock', 'plotly.graph_objects')
+
+
+class LazyModule:
+    """속성에 처음 접근할 때 ``name`` 모듈을 import 하는 대리 객체"""
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self._name)
+            self.__dict__['_module'] = module
+        return module
+
+    @property
+    def loaded(self):
+        return self.__dict__['_module'] is not None or self._name in sys.modules
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f'<lazy module {self._name!r} ({state})>'
+
+
+def lazy_import(name):
+    """이미 import 돼 있으면 모듈 그대로, 아니면 LazyModule 반환"""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def warm_imports(names=HEAVY_MODULES):
+    """``names`` 를 데몬 스레드에서 import (없는 패키지는 건너뜀), 스레드 반환"""
+    def run():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+
+    thread = threading.Thread(target=run, name='warm-imports', daemon=True)
+    thread.start()
+    return thread
+
+
+stock = lazy_import('pykrx.stock')
+go = lazy_import('plotly.graph_objects')
@@ -0,0 +1,235 @@
+"""진입 신호/보유중 포지션 목록의 페이지 나누기와 지연 렌더링.
+
+돌파가 많은 날 진입 신호마다 펼쳐진 expander(지표 4개 + 포지션 계산 +
+입력 3개 + 리스크 분석)를 모두 그리면 위젯이 수백 개가 되고, 입력 하나를
+바꿀 때마다 스캔과 모든 카드가 다시 실행됩니다. 여기서는
+
+- 목록을 ``page_size`` 개씩 나눠 현재 페이지 카드만 그리고
+- 카드는 접힌 상태로 두고, expander 안의 코드는 접혀 있어도 실행되므로
+  포지션 계산은 "포지션 계산" 토글을 켠 카드에서만 하고
+- 카드를 fragment 로 감싸 ``qty_{종목코드}`` 같은 입력을 바꾸면 그 카드만 다시 실행합니다
+  (streamlit 1.37+ 는 st.fragment, 1.33~1.36 은 st.experimental_fragment 사용.
+  requirements.txt 의 1.28 처럼 둘 다 없으면 일반 함수로 동작해 지금처럼 전체가 다시 실행됨)
+
+    render_entry_signals(st, entry_signals, total_capital, used_capital, on_add=add_position)
+    render_positions(st, active_positions, on_close=close_position)
+"""
+
+import functools
+import math
+from dataclasses import dataclass
+
+from .sizing import calculate_position_size
+
+PAGE_SIZE = 10
+RISK_WARN = 2.0
+RISK_LIMIT = 2.5
+
+
+@dataclass
+class Page:
+    rows: object      # 현재 페이지 DataFrame
+    number: int       # 0 부터
+    pages: int
+    total: int
+
+
+def paginate(df, page=0, page_size=PAGE_SIZE):
+    """``df`` 의 ``page`` 번째 (0 부터) 페이지. 범위를 벗어나면 처음/끝 페이지로 맞춤"""
+    total = len(df)
+    pages = max(1, math.ceil(total / page_size))
+    page = min(max(0, int(page)), pages - 1)
+    rows = df.iloc[page * page_size:(page + 1) * page_size]
+    return Page(rows, page, pages, total)
+
+
+def fragment(func):
+    """st.fragment (1.37+) 또는 st.experimental_fragment (1.33+) 로 감싸는 데코레이터.
+
+    streamlit 은 첫 호출 때 찾아서 import 시간을 늘리지 않습니다.
+    """
+    wrapped = None
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal wrapped
+        if wrapped is None:
+            import streamlit as st
+
+            decorator = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+            wrapped = decorator(func) if decorator else func
+        return wrapped(*args, **kwargs)
+    return wrapper
+
+
+@functools.lru_cache(maxsize=4096)
+def _position_size(total_capital, price, atr, risk_pct, stop_multiple, add_step):
+    return calculate_position_size(total_capital, price, atr, risk_pct, stop_multiple, add_step)
+
+
+def cached_position_size(total_capital, price, atr, risk_pct=0.02, stop_multiple=2.0, add_step=0.5):
+    """calculate_position_size 메모이즈 버전 (같은 카드 재실행 때 다시 계산하지 않음)"""
+    result = _position_size(float(total_capital), float(price), float(atr),
+                            risk_pct, stop_multiple, add_step)
+    return dict(result) if result else result
+
+
+def page_controls(st, key, total, page_size=PAGE_SIZE):
+    """이전/다음 버튼과 페이지 표시, 현재 페이지 번호(0 부터) 반환.
+
+    페이지 번호는 ``st.session_state[f'{key}_page']`` 에 두고 버튼 콜백에서 바꿔서
+    버튼을 누른 그 실행에서 바로 새 페이지를 그립니다.
+    """
+    state_key = f'{key}_page'
+    pages = max(1, math.ceil(total / page_size))
+    page = min(max(0, st.session_state.get(state_key, 0)), pages - 1)
+    st.session_state[state_key] = page
+    if pages == 1:
+        return page
+
+    def move(step):
+        st.session_state[state_key] = min(max(0, st.session_state[state_key] + step), pages - 1)
+
+    prev_col, label_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        st.button('◀ 이전', key=f'{key}_prev', disabled=page == 0, on_click=move, args=(-1,))
+    with label_col:
+        start = page * page_size
+        st.caption(f'{page + 1} / {pages} 페이지 ({start + 1}-{min(start + page_size, total)} / {total})')
+    with next_col:
+        st.button('다음 ▶', key=f'{key}_next', disabled=page >= pages - 1, on_click=move, args=(1,))
+    return page
+
+
+def _toggle(st, label, key):
+    toggle = getattr(st, 'toggle', None) or st.checkbox
+    return toggle(label, key=key)
+
+
+@fragment
+def entry_card(row, total_capital, used_capital=0, on_add=None):
+    """진입 신호 종목 하나의 카드 (fragment 단위로 다시 실행)"""
+    import streamlit as st
+
+    code = row['종목코드']
+    with st.expander(f"🟢 {row['종목명']} - 진입 신호!", expanded=False):
+        info_col1, info_col2, info_col3, info_col4 = st.columns(4)
+        with info_col1:
+            st.metric("현재가", f"{row['현재가']:,}원")
+        with info_col2:
+            st.metric("ATR(N)", f"{row['ATR(N)']:.1f}")
+        with info_col3:
+            st.metric("손절가", f"{row['손절가']:,}원")
+        with info_col4:
+            st.metric("거래량", f"{row['거래량']:,}")
+
+        if not _toggle(st, "💰 포지션 계산", key=f"calc_{code}"):
+            return
+
+        position_calc = cached_position_size(total_capital, row['현재가'], row['ATR(N)'])
+        if not position_calc:
+            st.error("포지션 계산에 실패했습니다.")
+            return
+
+        calc_col1, calc_col2 = st.columns(2)
+        with calc_col1:
+            st.info(f"""
+            **🎯 추천 포지션 (2% 룰)**
+            - 수량: {position_calc['shares']:,}주
+            - 투자금액: {position_calc['investment_amount']:,}원
+            - 최대손실: {position_calc['max_loss']:,}원
+            """)
+        with calc_col2:
+            st.info(f"""
+            **📊 리스크 분석**
+            - 리스크 비율: {position_calc['risk_percentage']:.2f}%
+            - 손절가: {position_calc['stop_loss']:,}원
+            - 1차추가: {position_calc['add_buy_1']:,}원
+            """)
+
+        pos_col1, pos_col2, pos_col3 = st.columns([2, 2, 1])
+        with pos_col1:
+            actual_price = st.number_input("실제 매수가", value=int(row['현재가']), step=100,
+                                           key=f"price_{code}")
+        with pos_col2:
+            quantity = st.number_input("매수 수량", min_value=1,
+                                       value=position_calc['shares'] if position_calc['shares'] > 0 else 10,
+                                       step=1, key=f"qty_{code}",
+                                       help=f"추천 수량: {position_calc['shares']}주")
+        with pos_col3:
+            st.markdown("<br>", unsafe_allow_html=True)
+            if st.button("➕ 포지션 추가", key=f"add_{code}", type="primary") and actual_price > 0 and quantity > 0:
+                actual_investment = actual_price * quantity
+                remaining_capital = total_capital - used_capital
+                if actual_investment > remaining_capital:
+                    st.error(f"""
+                    ❌ **투자금 부족!**
+                    - 필요금액: {actual_investment:,}원
+                    - 남은금액: {remaining_capital:,}원
+                    - 부족금액: {actual_investment - remaining_capital:,}원
+                    """)
+                elif on_add is not None:
+                    on_add(row, actual_price, quantity)
+                    st.success(f"✅ {row['종목명']} 포지션 추가!")
+                    st.rerun()
+
+        if actual_price > 0 and quantity > 0:
+            actual_max_loss = quantity * (actual_price - position_calc['stop_loss'])
+            actual_risk_pct = (actual_max_loss / total_capital) * 100
+            if actual_risk_pct > RISK_LIMIT:
+                st.error(f"⚠️ 리스크가 {actual_risk_pct:.2f}%로 권장치(2%)를 초과합니다!")
+            elif actual_risk_pct > RISK_WARN:
+                st.warning(f"⚠️ 리스크가 {actual_risk_pct:.2f}%입니다.")
+            else:
+                st.success(f"✅ 리스크 {actual_risk_pct:.2f}% - 적절한 포지션입니다.")
+
+
+def render_entry_signals(st, entry_signals, total_capital, used_capital=0, on_add=None,
+                         page_size=PAGE_SIZE, key='entry'):
+    """진입 신호 목록을 페이지 단위로 그림. ``on_add(row, 매수가, 수량)`` 은 포지션 추가 콜백"""
+    if entry_signals.empty:
+        st.info("🔍 현재 진입 신호가 없습니다.")
+        return
+    st.success(f"🎯 **진입 신호 발생: {len(entry_signals)}개 종목**")
+    page = paginate(entry_signals, page_controls(st, key, len(entry_signals), page_size), page_size)
+    for _, row in page.rows.iterrows():
+        entry_card(row, total_capital, used_capital, on_add)
+
+
+@fragment
+def position_card(position, on_close=None):
+    """보유중 포지션 하나의 카드 (fragment 단위로 다시 실행)"""
+    import streamlit as st
+
+    profit_emoji = "🟢" if position['손익'] >= 0 else "🔴"
+    profit_text = f"{position['손익']:+,}원 ({position['손익률']:+.2f}%)"
+    with st.expander(f"{profit_emoji} {position['종목명']} | {position['수량']}주 | {profit_text}"):
+        detail_col1, detail_col2, detail_col3 = st.columns(3)
+        with detail_col1:
+            st.write(f"**진입일**: {position['진입일']}")
+            st.write(f"**진입가**: {position['진입가']:,}원")
+            st.write(f"**현재가**: {position['현재가']:,}원")
+        with detail_col2:
+            st.write(f"**수량**: {position['수량']:,}주")
+            st.write(f"**투자금액**: {position['투자금액']:,}원")
+            st.write(f"**ATR(N)**: {position['ATR(N)']}")
+        with detail_col3:
+            st.write(f"**손절가**: {position['손절가']:,}원")
+            if position['다음매수가'] > 0:
+                st.write(f"**다음매수가**: {position['다음매수가']:,}원")
+            else:
+                st.write("**최종단계**: 추가매수 없음")
+
+        if st.button("❌ 청산", key=f"close_{position['포지션ID']}") and on_close is not None:
+            on_close(position)
+            st.success(f"{position['종목명']} 포지션 청산 완료!")
+            st.rerun()
+
+
+def render_positions(st, positions, on_close=None, page_size=PAGE_SIZE, key='active'):
+    """보유중 포지션 목록을 페이지 단위로 그림. ``on_close(position)`` 은 청산 콜백"""
+    if positions.empty:
+        return
+    page = paginate(positions, page_controls(st, key, len(positions), page_size), page_size)
+    for _, position in page.rows.iterrows():
+        position_card(position, on_close)
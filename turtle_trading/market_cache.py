@@ -0,0 +1,337 @@
+"""종목별 OHLCV 로컬 캐시.
+
+pykrx 에서 받은 일봉을 종목 단위 NumPy 파일(날짜, OHLCV)로 저장하고
+memory-map 으로 읽습니다. 다음 조회부터는 마지막 캐시 날짜 이후 봉만
+받아오므로, 같은 관심종목을 하루에 여러 번 스캔해도 네트워크 왕복이
+거의 생기지 않습니다.
+
+    cache = OHLCVCache('.cache/ohlcv')
+    attach(turtle_system, cache)   # turtle_system.get_market_data 를 캐시 경유로 교체
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, time as dtime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from . import instrumentation
+from .batch_fetch import limiter_for
+from .lazy import stock
+from .market_hours import MARKET_CLOSE, is_market_open, last_session, last_weekday, now_kst
+
+OHLCV_COLUMNS = ['시가', '고가', '저가', '종가', '거래량']
+
+# 캐시 첫 날짜 앞으로 이 정도 공백은 휴장일로 보고 다시 받지 않음
+HOLIDAY_GAP_DAYS = 5
+# 용량을 넘으면 max_bytes 의 이 비율까지 정리 (저장할 때마다 정리가 반복되지 않도록)
+EVICT_TARGET = 0.9
+
+
+def pykrx_fetch(ticker, start, end):
+    """pykrx 일봉 조회 (start, end 는 date/datetime, 양 끝 포함)"""
+    return stock.get_market_ohlcv_by_date(
+        start.strftime('%Y%m%d'), end.strftime('%Y%m%d'), ticker
+    )
+
+
+def _session_close(day, tzinfo=None):
+    return datetime.combine(day, dtime(*MARKET_CLOSE), tzinfo=tzinfo)
+
+
+class OHLCVCache:
+    """종목코드 + 거래일 키의 영속 OHLCV 저장소.
+
+    - 파일: ``{root}/{ticker}.dates.npy`` (datetime64[D]), ``{ticker}.ohlcv.npy`` (float64, N×5)
+    - 조회: 캐시 마지막 날짜부터 오늘까지만 추가로 받아 병합 (마지막 봉은 장중 갱신 대비 덮어씀)
+    - 최신성: 장중에는 ``refresh_seconds`` 마다 마지막 봉을 다시 받고, 장 마감 뒤/주말에는
+      마지막 봉이 ``last_session(clock())`` 이면 받지 않음 (시각은 모두 ``clock``, 기본 KST 기준).
+      마감 뒤에 받았는데 그 거래일 봉이 없으면 평일 휴장일로 보고 그날은 다시 받지 않음
+    - 속도 제한: ``limiter`` 는 ``fetcher`` 를 부르기 직전에만 걸어서 캐시 적중은 기다리지 않음
+      (기본 pykrx 조회면 호스트 공용 ``limiter_for()``, 다른 fetcher 는 주지 않으면 제한 없음)
+    - 정리: ``max_age_days`` 동안 안 읽힌 파일 삭제 후, 총 용량이 ``max_bytes`` 이하가 될 때까지 오래된 순 삭제
+      (총 용량은 시작할 때 한 번 세고 이후 저장/삭제 때 누적, 넘으면 ``EVICT_TARGET`` 비율까지 줄임).
+      다른 스레드가 조회 중인 종목은 건너뜀
+    """
+
+    # 네트워크 조회 앞에서 직접 limiter 를 걸므로 일괄 조회가 다시 제한하지 않음
+    rate_limited = True
+
+    def __init__(self, root='.cache/ohlcv', fetcher=None, max_bytes=256 * 1024 * 1024,
+                 max_age_days=30, refresh_seconds=60, clock=now_kst, limiter=None):
+        self.root = root
+        self.fetcher = fetcher or pykrx_fetch
+        if limiter is None and self.fetcher is pykrx_fetch:
+            limiter = limiter_for()
+        self.limiter = limiter
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.refresh_seconds = refresh_seconds
+        self.clock = clock
+
+        # 같은 프로세스 안에서는 신호 분석과 차트 탭이 같은 프레임을 공유
+        self._frames = {}
+        self._checked_at = {}
+        self._covered_from = {}
+        self._empty_tail = {}     # 종목코드 → 봉이 없던 거래일 (평일 휴장일)
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+        # 캐시 적중/네트워크 조회 횟수
+        self.hits = 0
+        self.fetches = 0
+
+        os.makedirs(self.root, exist_ok=True)
+        self._bytes_guard = threading.Lock()
+        self._bytes = self._total_bytes()
+
+    # ---------------------------------------------------------------- 조회
+
+    def get_market_data(self, ticker, days=60):
+        """turtle_system.get_market_data 와 같은 형태로 최근 ``days`` 일(달력 기준) 일봉 반환 (새 프레임)"""
+        end = self.clock()
+        start = end - timedelta(days=days)
+        frame = self._get_range(ticker, start, end)
+        if frame is None:
+            return None
+        return frame.loc[frame.index >= pd.Timestamp(start.date())]
+
+    def get_range(self, ticker, start, end):
+        """[start, end] 구간을 덮도록 캐시를 보충한 뒤 전체 캐시 프레임의 복사본 반환"""
+        frame = self._get_range(ticker, start, end)
+        return None if frame is None else frame.copy()
+
+    def _get_range(self, ticker, start, end):
+        # 캐시 프레임을 그대로 반환 (memory-map 이라 읽기 전용일 수 있음, 밖으로 내보낼 때는 복사)
+        with self._lock_for(ticker):
+            frame = self._frames.get(ticker)
+            if frame is None:
+                frame = self._load(ticker)
+
+            start_day = pd.Timestamp(start.date())
+            end_day = pd.Timestamp(last_weekday(end.date()))
+            now = self.clock()
+
+            pieces = []
+            tail, fetched_tail = None, False
+            if frame is None or frame.empty:
+                tail = self._fetch(ticker, start_day, end_day)
+                pieces.append(tail)
+                fetched_tail = True
+                self._covered_from[ticker] = start_day
+            else:
+                # 앞쪽 과거 구간 보충 (연휴 정도의 공백은 이미 덮인 것으로 봄)
+                covered = self._covered_from.get(ticker, frame.index[0] - timedelta(days=HOLIDAY_GAP_DAYS))
+                if start_day < covered:
+                    pieces.append(self._fetch(ticker, start_day, frame.index[0] - timedelta(days=1)))
+                    self._covered_from[ticker] = start_day
+
+                # 뒤쪽 최신 구간 보충
+                if not self._tail_fresh(ticker, frame.index[-1], now) and frame.index[-1] <= end_day:
+                    tail = self._fetch(ticker, frame.index[-1], end_day)
+                    pieces.append(tail)
+                    fetched_tail = True
+
+            if fetched_tail and not is_market_open(now):
+                # 마감 뒤에 물었는데 마지막 거래일 봉이 없음 → 평일 휴장일, 그날은 다시 묻지 않음
+                session = pd.Timestamp(last_session(now))
+                if end_day >= session and (tail is None or tail.index[-1] < session):
+                    self._empty_tail[ticker] = session
+
+            pieces = [p for p in pieces if p is not None and not p.empty]
+            if pieces:
+                frame = pd.concat(([frame] if frame is not None else []) + pieces)
+                frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+                self._save(ticker, frame)
+            elif frame is not None:
+                self.hits += 1
+                instrumentation.count('ohlcv_cache.hit')
+
+            if frame is None:
+                return None
+
+            self._frames[ticker] = frame
+            self._checked_at[ticker] = now
+            return frame
+
+    def _tail_fresh(self, ticker, last_bar, now):
+        """마지막 봉을 다시 받지 않아도 되는지"""
+        checked = self._checked_at.get(ticker)
+        if is_market_open(now):
+            # 장중: 최근 refresh_seconds 안에 확인했으면 건너뜀
+            return checked is not None and (now - checked).total_seconds() < self.refresh_seconds
+        session = last_session(now)
+        if last_bar < pd.Timestamp(session):
+            return self._empty_tail.get(ticker) == pd.Timestamp(session)
+        # 마감 전에 받은 봉은 장중 값일 수 있으므로 마감 뒤 한 번 더 받음
+        # (디스크에서 읽은 프레임은 확인 시각을 모르므로 마감 봉으로 봄)
+        return checked is None or checked >= _session_close(session, now.tzinfo)
+
+    def peek(self, ticker):
+        """네트워크 조회 없이 현재 캐시된 프레임의 복사본 반환 (없으면 None)"""
+        frame = self._frames.get(ticker)
+        if frame is None:
+            frame = self._load(ticker)
+            if frame is not None:
+                self._frames[ticker] = frame
+        return None if frame is None else frame.copy()
+
+    # ---------------------------------------------------------------- 정리
+
+    def evict(self, max_bytes=None):
+        """오래되었거나 용량(기본 ``max_bytes``)을 넘는 캐시 파일 삭제, 삭제한 종목 목록 반환.
+
+        종목 잠금을 잡은 뒤 지우고, 잠금이 이미 잡혀 있는(조회 중이거나 방금 저장해서
+        ``_save`` 가 부른) 종목은 건너뜁니다. 서로의 종목을 기다리는 교착을 피하려고
+        기다리지 않습니다.
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = []
+        for name in os.listdir(self.root):
+            if not name.endswith('.dates.npy'):
+                continue
+            ticker = name[:-len('.dates.npy')]
+            paths = self._paths(ticker)
+            try:
+                accessed = os.path.getmtime(paths[0])
+                size = sum(os.path.getsize(p) for p in paths)
+            except OSError:
+                continue
+            entries.append((accessed, size, ticker))
+
+        removed = []
+        cutoff = time.time() - self.max_age_days * 86400
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for accessed, size, ticker in entries:
+            if accessed >= cutoff and total <= max_bytes:
+                break
+            lock = self._lock_for(ticker)
+            if not lock.acquire(blocking=False):
+                continue
+            try:
+                self._remove(ticker)
+            finally:
+                lock.release()
+            total -= size
+            removed.append(ticker)
+        # 다른 프로세스가 쓴 파일까지 반영되도록 목록을 훑은 김에 다시 맞춤
+        with self._bytes_guard:
+            self._bytes = self._total_bytes()
+        return removed
+
+    def clear(self):
+        for name in os.listdir(self.root):
+            if name.endswith('.dates.npy'):
+                ticker = name[:-len('.dates.npy')]
+                with self._lock_for(ticker):
+                    self._remove(ticker)
+
+    # ---------------------------------------------------------------- 내부
+
+    def _lock_for(self, ticker):
+        with self._locks_guard:
+            lock = self._locks.get(ticker)
+            if lock is None:
+                lock = self._locks[ticker] = threading.Lock()
+            return lock
+
+    def _paths(self, ticker):
+        base = os.path.join(self.root, ticker)
+        return base + '.dates.npy', base + '.ohlcv.npy'
+
+    def _fetch(self, ticker, start, end):
+        if start > end:
+            return None
+        if self.limiter is not None:
+            self.limiter.acquire()
+        self.fetches += 1
+        instrumentation.count('ohlcv_cache.fetch')
+        with instrumentation.span('pykrx.fetch'):
+            df = self.fetcher(ticker, start, end)
+        if df is None or df.empty:
+            return None
+        df = df[OHLCV_COLUMNS].astype('float64')
+        df.index = pd.DatetimeIndex(df.index).normalize()
+        df.index.name = '날짜'
+        return df
+
+    def _load(self, ticker):
+        dates_path, values_path = self._paths(ticker)
+        if not os.path.exists(dates_path):
+            return None
+        try:
+            dates = np.load(dates_path, mmap_mode='r')
+            values = np.load(values_path, mmap_mode='r')
+        except (OSError, ValueError):
+            self._remove(ticker)
+            return None
+        if len(dates) != len(values) or values.ndim != 2 or values.shape[1] != len(OHLCV_COLUMNS):
+            # 두 파일을 교체하는 사이에 중단돼 짝이 안 맞음 → 버리고 다시 받음
+            self._remove(ticker)
+            return None
+        # 접근 시각 갱신 (정리 기준)
+        os.utime(dates_path)
+        index = pd.DatetimeIndex(np.asarray(dates, dtype='datetime64[ns]'), name='날짜')
+        return pd.DataFrame(values, index=index, columns=OHLCV_COLUMNS)
+
+    def _save(self, ticker, frame):
+        dates_path, values_path = self._paths(ticker)
+        dates = frame.index.values.astype('datetime64[D]')
+        values = np.ascontiguousarray(frame[OHLCV_COLUMNS].to_numpy(dtype='float64'))
+        old_size = _file_sizes(dates_path, values_path)
+        # 임시 파일에 쓴 뒤 교체해서 다른 세션이 반쯤 쓴 파일을 읽지 않도록 함
+        # (두 교체 사이에 중단되면 길이가 달라지고 _load 가 버림)
+        for path, array in ((values_path, values), (dates_path, dates)):
+            tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp, path)
+        with self._bytes_guard:
+            self._bytes += _file_sizes(dates_path, values_path) - old_size
+            over = self._bytes > self.max_bytes
+        if over:
+            self.evict(int(self.max_bytes * EVICT_TARGET))
+
+    def _total_bytes(self):
+        total = 0
+        for name in os.listdir(self.root):
+            try:
+                total += os.path.getsize(os.path.join(self.root, name))
+            except OSError:
+                pass
+        return total
+
+    def _remove(self, ticker):
+        removed = 0
+        for path in self._paths(ticker):
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            removed += size
+        with self._bytes_guard:
+            self._bytes -= removed
+        self._frames.pop(ticker, None)
+        self._checked_at.pop(ticker, None)
+        self._covered_from.pop(ticker, None)
+        self._empty_tail.pop(ticker, None)
+
+
+def _file_sizes(*paths):
+    total = 0
+    for path in paths:
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    return total
+
+
+def attach(turtle_system, cache):
+    """turtle_system.get_market_data 를 캐시 경유 조회로 교체"""
+    turtle_system.get_market_data = cache.get_market_data
+    return turtle_system
@@ -0,0 +1,44 @@
+"""KRX 정규장 시간 계산 (평일 09:00~15:30 KST, 공휴일은 고려하지 않음)"""
+
+from datetime import datetime, timedelta, timezone
+
+KST = timezone(timedelta(hours=9))
+MARKET_OPEN = (9, 0)
+MARKET_CLOSE = (15, 30)
+
+
+def now_kst():
+    return datetime.now(KST)
+
+
+def is_market_open(now):
+    """평일 정규장 시간인지"""
+    if now.weekday() >= 5:
+        return False
+    minutes = now.hour * 60 + now.minute
+    return MARKET_OPEN[0] * 60 + MARKET_OPEN[1] <= minutes < MARKET_CLOSE[0] * 60 + MARKET_CLOSE[1]
+
+
+def next_open(now):
+    """다음 정규장 시작 시각"""
+    candidate = now.replace(hour=MARKET_OPEN[0], minute=MARKET_OPEN[1], second=0, microsecond=0)
+    if candidate <= now:
+        candidate += timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+def last_weekday(day):
+    """주말이면 직전 금요일로 당겨서 반환"""
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+def last_session(now):
+    """장이 끝난 마지막 거래일 (평일 마감 전이면 전 거래일)"""
+    day = now.date()
+    if now.weekday() < 5 and (now.hour, now.minute) < MARKET_CLOSE:
+        day -= timedelta(days=1)
+    return last_weekday(day)
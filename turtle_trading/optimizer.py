@@ -0,0 +1,167 @@
+"""Donchian/ATR 매개변수 탐색.
+
+진입/청산 Donchian 기간, ATR 기간, 손절 배수, 리스크 비율 조합을 격자 또는
+무작위로 만들어 벡터 백테스트 엔진으로 평가합니다. 작업은
+ProcessPoolExecutor 로 모든 코어에 나누고, OHLCV 패널은 피클로 복사하지 않고
+공유 메모리로 넘깁니다. 끝난 조합부터 바로 내보내므로 화면에서 순위를
+갱신하며 보여줄 수 있습니다.
+
+    combos = grid(entry_period=[20, 55], exit_period=[10, 20], atr_period=[20],
+                  stop_multiple=[1.5, 2.0], risk_pct=[0.01, 0.02])
+    board = Leaderboard('Sharpe')
+    for result in sweep(panel, combos):
+        board.add(result)
+        placeholder.dataframe(board.frame(10))
+"""
+
+import heapq
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .backtest import run_vectorized
+from .indicators import Panel, TurtleParams, compute_indicators
+
+SEARCH_SPACE = {
+    'entry_period': [20, 30, 40, 55],
+    'exit_period': [10, 15, 20],
+    'atr_period': [14, 20],
+    'stop_multiple': [1.5, 2.0, 2.5, 3.0],
+    'risk_pct': [0.005, 0.01, 0.02],
+}
+
+_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def grid(**space):
+    """모든 조합 (지정하지 않은 항목은 TurtleParams 기본값)"""
+    space = space or SEARCH_SPACE
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+
+def random_combos(n, space=None, seed=0):
+    """탐색 공간에서 중복 없이 ``n`` 개 무작위 조합"""
+    combos = grid(**(space or SEARCH_SPACE))
+    return random.Random(seed).sample(combos, min(n, len(combos)))
+
+
+@dataclass
+class SweepResult:
+    params: dict
+    stats: dict
+
+
+class SharedPanel:
+    """Panel 의 OHLCV 배열을 공유 메모리 한 덩어리에 올림 (with 문으로 해제)"""
+
+    def __init__(self, panel):
+        shape = panel.close.shape
+        size = max(1, len(_FIELDS) * int(np.prod(shape)) * 8)
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        block = np.ndarray((len(_FIELDS),) + shape, dtype='float64', buffer=self.shm.buf)
+        for k, name in enumerate(_FIELDS):
+            block[k] = getattr(panel, name)
+        # 워커에 넘길 작은 설명자 (배열 본체는 이름으로 붙음)
+        self.descriptor = (self.shm.name, shape, panel.dates, list(panel.tickers))
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_panel(descriptor):
+    """설명자로 공유 메모리에 붙어 복사 없는 Panel 생성. (Panel, SharedMemory) 반환"""
+    name, shape, dates, tickers = descriptor
+    shm = shared_memory.SharedMemory(name=name)
+    block = np.ndarray((len(_FIELDS),) + tuple(shape), dtype='float64', buffer=shm.buf)
+    return Panel(dates, tickers, *block), shm
+
+
+# ---------------------------------------------------------------- 워커
+
+_worker = {}
+
+
+def _init_worker(descriptor, capital):
+    panel, shm = attach_panel(descriptor)
+    _worker.update(panel=panel, shm=shm, capital=capital, indicators={})
+
+
+def _evaluate(batch):
+    panel = _worker['panel']
+    cache = _worker['indicators']
+    results = []
+    for combo in batch:
+        params = replace(TurtleParams(), **combo)
+        # 지표는 기간 조합에만 의존하므로 손절 배수/리스크만 다른 조합끼리 재사용
+        key = (params.entry_period, params.exit_period, params.atr_period)
+        indicators = cache.get(key)
+        if indicators is None:
+            if len(cache) >= 8:
+                cache.pop(next(iter(cache)))
+            indicators = cache[key] = compute_indicators(panel, params)
+        result = run_vectorized(panel, params, _worker['capital'], indicators)
+        results.append(SweepResult(combo, result.stats))
+    return results
+
+
+def _batches(combos, size):
+    # 같은 기간 조합이 한 워커에 모이도록 정렬 후 자름
+    ordered = sorted(combos, key=lambda c: (c.get('entry_period', 0), c.get('exit_period', 0),
+                                            c.get('atr_period', 0)))
+    return [ordered[i:i + size] for i in range(0, len(ordered), size)]
+
+
+def sweep(panel, combos, max_workers=None, capital=100_000_000, batch_size=4):
+    """조합들을 프로세스 풀에서 평가하고 끝나는 순서대로 SweepResult 를 내보냄"""
+    max_workers = max_workers or os.cpu_count() or 1
+    with SharedPanel(panel) as shared:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(shared.descriptor, capital)) as pool:
+            futures = [pool.submit(_evaluate, batch) for batch in _batches(combos, batch_size)]
+            try:
+                for future in as_completed(futures):
+                    yield from future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+
+class Leaderboard:
+    """목표 지표 기준 상위 조합 유지"""
+
+    def __init__(self, objective='Sharpe', size=50):
+        self.objective = objective
+        self.size = size
+        self.count = 0
+        self._heap = []
+
+    def add(self, result):
+        self.count += 1
+        score = result.stats.get(self.objective, float('-inf'))
+        item = (score, self.count, result)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, item)
+        else:
+            heapq.heappushpop(self._heap, item)
+
+    def top(self, k=None):
+        ranked = sorted(self._heap, key=lambda item: (-item[0], item[1]))
+        return [item[2] for item in ranked[:k]]
+
+    def frame(self, k=None):
+        rows = [{**r.params, **r.stats} for r in self.top(k)]
+        return pd.DataFrame(rows)
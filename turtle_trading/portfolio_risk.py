@@ -0,0 +1,240 @@
+"""포트폴리오 단위 리스크 한도.
+
+한 건의 매수만 보는 2% 룰과 투자금 부족 확인에 더해, 보유 중인 전체 포지션
+기준으로 터틀의 유닛 한도를 확인합니다.
+
+- 한 종목 최대 4유닛
+- 높은 상관(>= 0.7) 종목 묶음 최대 6유닛
+- 느슨한 상관(>= 0.4) 종목 묶음 최대 10유닛
+- 전체 최대 12유닛
+- 전체 heat (손절까지 남은 위험 금액 합 / 총자본) 한도
+
+포지션 하나(포지션ID)가 1유닛입니다. 종목 간 상관계수는 최근 ``window`` 일
+수익률로 한 번에 행렬 계산하고, 새 봉이 들어오면 누적 합만 갱신합니다.
+이력이 짧거나 없어 상관을 모르는 종목은 상관 묶음에 넣어 셉니다.
+
+    engine = PortfolioRiskEngine(total_capital)
+    engine.set_prices(panel)                  # 보유 + 후보 종목 일봉 패널
+    engine.load_positions(store.open_positions())
+    decision = engine.check('005930', price, quantity, stop_loss)
+    if not decision.allowed: st.error('\\n'.join(decision.reasons))
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .position_store import STATUS_CLOSED
+
+
+@dataclass(frozen=True)
+class RiskLimits:
+    per_ticker: int = 4
+    close_cluster: int = 6
+    loose_cluster: int = 10
+    total_units: int = 12
+    max_heat: float = 0.20
+    close_corr: float = 0.7
+    loose_corr: float = 0.4
+
+
+@dataclass
+class RiskDecision:
+    allowed: bool
+    reasons: list = field(default_factory=list)
+    metrics: dict = field(default_factory=dict)
+
+
+class RollingCorrelation:
+    """최근 ``window`` 개 수익률의 상관행렬. 새 수익률 한 줄은 O(종목²) 로 반영.
+
+    수익률이 없는 칸(NaN)은 빼고 두 종목이 모두 있는 날끼리만 계산하며, 함께 있는 날이
+    ``min_periods`` 보다 적거나 변동이 없는 쌍은 상관을 모름(NaN)으로 둡니다.
+    """
+
+    def __init__(self, tickers, returns, window=60, min_periods=20):
+        self.tickers = list(tickers)
+        self.position = {t: i for i, t in enumerate(self.tickers)}
+        self.window = window
+        self.min_periods = min_periods
+        returns = np.asarray(returns, dtype='float64').reshape(-1, len(self.tickers))[-window:]
+        n = len(self.tickers)
+        # 링 버퍼 (NaN 을 0 으로 바꾼 값, 값이 있는지 여부)
+        self.values = np.zeros((window, n))
+        self.valid = np.zeros((window, n))
+        self.count = len(returns)
+        self.values[:self.count], self.valid[:self.count] = _split(returns)
+        self.head = self.count % window
+        self._recompute()
+        self.updates = 0
+
+    def _recompute(self):
+        # 쌍별 누적 합: 함께 있는 날 수, i 의 합/제곱합 (j 가 있는 날), 곱의 합
+        x = self.values[:self.count]
+        m = self.valid[:self.count]
+        self.pairs = m.T @ m
+        self.sum = x.T @ m
+        self.square = (x * x).T @ m
+        self.prod = x.T @ x
+
+    def _add(self, x, m, sign):
+        self.pairs += sign * np.outer(m, m)
+        self.sum += sign * np.outer(x, m)
+        self.square += sign * np.outer(x * x, m)
+        self.prod += sign * np.outer(x, x)
+
+    def update(self, row):
+        """수익률 한 줄 (종목 순서 동일, 없으면 NaN) 추가"""
+        x, m = _split(row)
+        if self.count >= self.window:
+            self._add(self.values[self.head], self.valid[self.head], -1)
+        else:
+            self.count += 1
+        self.values[self.head] = x
+        self.valid[self.head] = m
+        self.head = (self.head + 1) % self.window
+        self._add(x, m, 1)
+        self.updates += 1
+        # 빼기를 반복하면 오차가 쌓이므로 창 길이마다 다시 계산
+        if self.updates % self.window == 0:
+            self._recompute()
+
+    def matrix(self):
+        """상관행렬 (모르는 쌍은 NaN, 대각은 1)"""
+        n = self.pairs
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = self.sum / n                      # [i, j]: j 가 있는 날 i 의 평균
+            var = self.square / n - mean * mean
+            cov = self.prod / n - mean * mean.T
+            corr = cov / np.sqrt(np.clip(var, 0, None) * np.clip(var.T, 0, None))
+        corr[(n < max(2, self.min_periods)) | ~np.isfinite(corr)] = np.nan
+        np.fill_diagonal(corr, 1.0)
+        return np.clip(corr, -1.0, 1.0)
+
+    def row(self, ticker):
+        i = self.position.get(ticker)
+        return None if i is None else self.matrix()[i]
+
+
+def _split(returns):
+    returns = np.asarray(returns, dtype='float64')
+    valid = np.isfinite(returns)
+    return np.where(valid, returns, 0.0), valid.astype('float64')
+
+
+class PortfolioRiskEngine:
+    """보유 포지션 + 상관행렬로 추가 매수 가능 여부 판단"""
+
+    def __init__(self, total_capital, limits=RiskLimits(), window=60, min_periods=20):
+        self.total_capital = total_capital
+        self.limits = limits
+        self.window = window
+        self.min_periods = min_periods
+        self.correlation = None
+        self._corr = None
+        self._last_close = None
+        self.units = {}       # 종목코드 -> 유닛 수
+        self.heat = 0.0       # 손절까지 남은 위험 금액 합
+        self.used_capital = 0.0
+
+    # ---------------------------------------------------------------- 입력
+
+    def set_prices(self, panel):
+        """indicators.Panel 종가로 상관행렬 초기화"""
+        close = panel.close
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = close[1:] / close[:-1] - 1
+        self.correlation = RollingCorrelation(panel.tickers, returns, self.window, self.min_periods)
+        self._last_close = close[-1].copy()
+        self._corr = None
+
+    def on_bar(self, closes):
+        """새 종가 한 줄({종목코드: 종가} 또는 종목 순서 배열) 반영"""
+        if self.correlation is None:
+            return
+        if isinstance(closes, dict):
+            closes = np.array([closes.get(t, np.nan) for t in self.correlation.tickers], dtype='float64')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = closes / self._last_close - 1
+        self.correlation.update(returns)
+        self._last_close = np.where(np.isnan(closes), self._last_close, closes)
+        self._corr = None
+
+    def load_positions(self, positions):
+        """PositionStore.open_positions() 형태의 dict 목록으로 보유 현황 집계.
+
+        청산신호 포지션도 청산할 때까지는 들고 있으므로 유닛/위험 금액/사용 투자금에 모두
+        포함합니다 (청산완료 행은 건너뜀).
+        """
+        units = {}
+        heat = 0.0
+        used = 0.0
+        for p in positions:
+            if p['상태'] == STATUS_CLOSED:
+                continue
+            units[p['종목코드']] = units.get(p['종목코드'], 0) + 1
+            heat += max(0.0, (p['현재가'] - p['손절가']) * p['수량'])
+            used += p['투자금액']
+        self.units = units
+        self.heat = heat
+        self.used_capital = used
+
+    # ---------------------------------------------------------------- 판단
+
+    def correlations_with(self, ticker):
+        """(``ticker`` 외 보유 종목 목록, 각 종목과의 상관계수 배열), 모르는 상관은 NaN"""
+        held = [t for t in self.units if t != ticker]
+        corr = np.full(len(held), np.nan)
+        if self.correlation is not None and ticker in self.correlation.position:
+            if self._corr is None:
+                self._corr = self.correlation.matrix()
+            row = self._corr[self.correlation.position[ticker]]
+            for k, t in enumerate(held):
+                i = self.correlation.position.get(t)
+                if i is not None:
+                    corr[k] = row[i]
+        return held, corr
+
+    def check(self, ticker, price, quantity, stop_loss, units=1):
+        """``ticker`` 를 ``units`` 유닛 더 살 때 한도 확인"""
+        limits = self.limits
+        reasons = []
+        held_units = np.array(list(self.units.values()), dtype=np.int64)
+        total = int(held_units.sum()) + units
+        same = self.units.get(ticker, 0) + units
+
+        # 상관을 모르는 종목(이력 부족/없음)은 안전하게 같은 묶음으로 셈
+        held, corr = self.correlations_with(ticker)
+        counts = np.array([self.units[t] for t in held], dtype=np.int64)
+        unknown = np.isnan(corr)
+        close = same + int(counts[unknown | (corr >= limits.close_corr)].sum())
+        loose = same + int(counts[unknown | (corr >= limits.loose_corr)].sum())
+
+        investment = price * quantity
+        new_heat = self.heat + max(0.0, (price - stop_loss) * quantity)
+        heat_pct = new_heat / self.total_capital if self.total_capital else float('inf')
+        remaining = self.total_capital - self.used_capital
+
+        if same > limits.per_ticker:
+            reasons.append(f'종목 유닛 한도 초과: {same}/{limits.per_ticker}')
+        if close > limits.close_cluster:
+            reasons.append(f'높은 상관 종목 유닛 한도 초과: {close}/{limits.close_cluster}')
+        if loose > limits.loose_cluster:
+            reasons.append(f'느슨한 상관 종목 유닛 한도 초과: {loose}/{limits.loose_cluster}')
+        if total > limits.total_units:
+            reasons.append(f'전체 유닛 한도 초과: {total}/{limits.total_units}')
+        if heat_pct > limits.max_heat:
+            reasons.append(f'포트폴리오 heat 초과: {heat_pct:.1%}/{limits.max_heat:.0%}')
+        if investment > remaining:
+            reasons.append(f'투자금 부족: 필요 {investment:,.0f}원 / 남은 {remaining:,.0f}원')
+
+        return RiskDecision(not reasons, reasons, {
+            'ticker_units': same,
+            'close_cluster_units': close,
+            'loose_cluster_units': loose,
+            'total_units': total,
+            'heat_pct': heat_pct * 100,
+            'remaining_capital': remaining,
+            'correlation_known': not unknown.any(),
+            'unknown_correlation': [t for t, u in zip(held, unknown) if u],
+        })
@@ -0,0 +1,365 @@
+"""포지션 영속 저장소 (SQLite, WAL).
+
+``st.session_state.user_positions`` 의 dict 목록 대신 쓰는 저장소입니다.
+화면 코드가 그대로 쓸 수 있도록 읽고 쓰는 값은 기존과 같은 한글 키 dict
+(포지션ID, 종목코드, 상태, ...) 이고, 내부 테이블은 타입이 있는 컬럼과
+상태/종목/포지션ID 인덱스를 가집니다. 세션이 끝나거나 앱이 재시작돼도
+기록이 남습니다.
+
+    store = PositionStore('data/positions.db')
+    store.add_position('005930', '삼성전자', 71000, 10, 1450.0)
+    pd.DataFrame(store.active())
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import pandas as pd
+
+STATUS_OPEN = '보유중'
+STATUS_STOP = '청산신호(손절)'
+STATUS_EXIT = '청산신호(익절)'
+STATUS_CLOSED = '청산완료'
+
+# (한글 키, 컬럼명, SQLite 타입)
+FIELDS = [
+    ('포지션ID', 'position_id', 'TEXT PRIMARY KEY'),
+    ('종목코드', 'ticker', 'TEXT NOT NULL'),
+    ('종목명', 'name', 'TEXT NOT NULL'),
+    ('진입일', 'entry_date', 'TEXT NOT NULL'),
+    ('진입가', 'entry_price', 'REAL NOT NULL'),
+    ('현재가', 'current_price', 'REAL NOT NULL'),
+    ('수량', 'quantity', 'INTEGER NOT NULL'),
+    ('투자금액', 'investment', 'REAL NOT NULL'),
+    ('ATR(N)', 'atr', 'REAL NOT NULL'),
+    ('손절가', 'stop_loss', 'REAL NOT NULL'),
+    ('다음매수가', 'next_add', 'REAL NOT NULL DEFAULT 0'),
+    ('손익', 'pnl', 'REAL NOT NULL DEFAULT 0'),
+    ('손익률', 'pnl_pct', 'REAL NOT NULL DEFAULT 0'),
+    ('상태', 'status', 'TEXT NOT NULL'),
+    ('청산일', 'closed_date', 'TEXT'),
+    ('청산가', 'close_price', 'REAL'),
+]
+KEYS = [f[0] for f in FIELDS]
+TO_COLUMN = {f[0]: f[1] for f in FIELDS}
+TO_KEY = {f[1]: f[0] for f in FIELDS}
+COLUMNS = [f[1] for f in FIELDS]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS positions (
+    {', '.join(f'{column} {kind}' for _, column, kind in FIELDS)},
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_positions_status ON positions(status);
+CREATE INDEX IF NOT EXISTS ix_positions_ticker ON positions(ticker, status);
+CREATE TABLE IF NOT EXISTS indicator_state (
+    ticker TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class MigrationReport:
+    inserted: int = 0                               # 새로 저장
+    duplicates: int = 0                             # 포지션ID 가 이미 있어 건너뜀
+    rejected: list = field(default_factory=list)    # [(포지션 dict, 사유)] 필수 값 누락 등
+
+    def __int__(self):
+        return self.inserted
+
+
+class PositionStore:
+    """포지션 테이블 접근 (스레드 안전, 여러 Streamlit 세션이 공유 가능)"""
+
+    def __init__(self, path='data/positions.db'):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    # ---------------------------------------------------------------- 쓰기
+
+    def add(self, position):
+        """한글 키 dict 하나 저장 (포지션ID 가 이미 있으면 False)"""
+        return self.add_many([position]) == 1
+
+    def add_many(self, positions):
+        """여러 건 한 트랜잭션으로 저장, 새로 들어간 건수 반환.
+
+        포지션ID 중복만 건너뜁니다. 포지션ID 가 없으면 ValueError, 다른 필수 값이
+        빠졌으면 sqlite3.IntegrityError 로 전체를 되돌립니다.
+        """
+        positions = list(positions)
+        missing = [i for i, p in enumerate(positions) if not p.get('포지션ID')]
+        if missing:
+            # TEXT 기본키는 NULL 을 막지 않음
+            raise ValueError(f'포지션ID 없음: {missing[:10]}번째 행')
+        now = _now()
+        rows = [[_to_db(p.get(key)) for key in KEYS] + [now] for p in positions]
+        placeholders = ', '.join('?' * (len(COLUMNS) + 1))
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute('BEGIN')
+            try:
+                self._conn.executemany(
+                    f'INSERT INTO positions ({", ".join(COLUMNS)}, updated_at) VALUES ({placeholders}) '
+                    'ON CONFLICT(position_id) DO NOTHING',
+                    rows,
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+            return self._conn.total_changes - before
+
+    def import_positions(self, positions):
+        """외부 포지션 dict 목록을 행 단위로 저장하고 MigrationReport 반환.
+
+        add_many 와 달리 잘못된 행이 있어도 전체를 되돌리지 않고 ``rejected`` 에
+        남깁니다. 없는 키는 컬럼 기본값(다음매수가/손익/손익률 = 0)을 씁니다.
+        """
+        report = MigrationReport()
+        now = _now()
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                for position in positions or []:
+                    if not position.get('포지션ID'):
+                        report.rejected.append((position, '포지션ID 없음'))
+                        continue
+                    values = {TO_COLUMN[k]: _to_db(v) for k, v in position.items()
+                              if k in TO_COLUMN and v is not None}
+                    columns = [*values, 'updated_at']
+                    before = self._conn.total_changes
+                    try:
+                        self._conn.execute(
+                            f'INSERT INTO positions ({", ".join(columns)}) '
+                            f'VALUES ({", ".join("?" * len(columns))}) '
+                            'ON CONFLICT(position_id) DO NOTHING',
+                            [*values.values(), now],
+                        )
+                    except sqlite3.IntegrityError as e:
+                        # 실패한 문장만 되돌려지고 트랜잭션은 계속됨
+                        report.rejected.append((position, str(e)))
+                        continue
+                    if self._conn.total_changes > before:
+                        report.inserted += 1
+                    else:
+                        report.duplicates += 1
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return report
+
+    def add_position(self, ticker, name, price, quantity, atr, stop_multiple=2.0, add_step=0.5):
+        """PositionManager.add_position 과 같은 규칙으로 새 보유 포지션 생성"""
+        now = datetime.now()
+        position = {
+            '포지션ID': f'{ticker}-{now:%Y%m%d%H%M%S%f}',
+            '종목코드': ticker,
+            '종목명': name,
+            '진입일': now.strftime('%Y-%m-%d'),
+            '진입가': price,
+            '현재가': price,
+            '수량': quantity,
+            '투자금액': price * quantity,
+            'ATR(N)': atr,
+            '손절가': int(round(price - stop_multiple * atr)),
+            '다음매수가': int(round(price + add_step * atr)),
+            '손익': 0,
+            '손익률': 0.0,
+            '상태': STATUS_OPEN,
+        }
+        self.add(position)
+        return position
+
+    def update(self, position_id, **changes):
+        """한글 키로 일부 값 수정 (예: ``update(pid, 현재가=72000, 상태='보유중')``)"""
+        return self.update_many([dict(changes, 포지션ID=position_id)])
+
+    def update_many(self, rows, expected_status=None):
+        """``[{'포지션ID': ..., 바꿀 키: 값}, ...]`` 한 트랜잭션으로 반영, 바뀐 건수 반환"""
+        return len(self.apply_changes(rows, expected_status))
+
+    def apply_changes(self, rows, expected_status=None):
+        """update_many 와 같고 실제로 바뀐 포지션ID 목록 반환.
+
+        ``expected_status`` ({포지션ID: 상태}) 를 주면 저장소 상태가 그 값일 때만 씀
+        (읽은 뒤 다른 세션이 청산한 포지션을 시세 갱신이 덮어쓰지 않도록).
+        """
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                applied = self._update_rows(rows, expected_status)
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+            return applied
+
+    def _update_rows(self, rows, expected_status=None):
+        # 호출하는 쪽이 잠금과 트랜잭션을 잡고 있어야 함
+        now = _now()
+        applied = []
+        for row in rows:
+            changes = {TO_COLUMN[k]: _to_db(v) for k, v in row.items() if k != '포지션ID'}
+            if not changes:
+                continue
+            assignments = ', '.join(f'{column} = ?' for column in changes)
+            sql = f'UPDATE positions SET {assignments}, updated_at = ? WHERE position_id = ?'
+            args = [*changes.values(), now, row['포지션ID']]
+            if expected_status is not None:
+                sql += ' AND status = ?'
+                args.append(expected_status.get(row['포지션ID']))
+            if self._conn.execute(sql, args).rowcount:
+                applied.append(row['포지션ID'])
+        return applied
+
+    def close_position(self, position_id, price=None, date=None):
+        """청산 처리. 가격을 안 주면 마지막 현재가로 청산.
+
+        조회와 수정을 한 트랜잭션에서 해서 그 사이 다른 세션의 변경을 덮어쓰지
+        않습니다. 이미 청산완료된 포지션은 그대로 반환합니다.
+        """
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                position = self.get(position_id)
+                if position is not None and position['상태'] != STATUS_CLOSED:
+                    price = position['현재가'] if price is None else price
+                    entry = position['진입가']
+                    changes = {
+                        '상태': STATUS_CLOSED,
+                        '현재가': price,
+                        '청산가': price,
+                        '청산일': date or datetime.now().strftime('%Y-%m-%d'),
+                        '손익': (price - entry) * position['수량'],
+                        '손익률': (price / entry - 1) * 100 if entry else 0.0,
+                    }
+                    self._update_rows([dict(changes, 포지션ID=position_id)])
+                    position = self.get(position_id)
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return position
+
+    def delete_all(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM positions')
+
+    # ---------------------------------------------------------------- 읽기
+
+    def get(self, position_id):
+        """포지션ID 로 조회 (기본키 인덱스)"""
+        rows = self._select('WHERE position_id = ?', [position_id])
+        return rows[0] if rows else None
+
+    def by_status(self, status):
+        return self._select('WHERE status = ? ORDER BY entry_date, position_id', [status])
+
+    def by_ticker(self, ticker, status=None):
+        if status is None:
+            return self._select('WHERE ticker = ? ORDER BY entry_date', [ticker])
+        return self._select('WHERE ticker = ? AND status = ? ORDER BY entry_date', [ticker, status])
+
+    def active(self):
+        return self.by_status(STATUS_OPEN)
+
+    def signals(self):
+        """청산신호 상태 (손절/익절) 포지션"""
+        return self._select('WHERE status IN (?, ?) ORDER BY entry_date', [STATUS_STOP, STATUS_EXIT])
+
+    def closed(self):
+        return self.by_status(STATUS_CLOSED)
+
+    def open_positions(self):
+        """아직 청산 완료되지 않은 모든 포지션 (보유중 + 청산신호)"""
+        return self._select('WHERE status != ? ORDER BY entry_date', [STATUS_CLOSED])
+
+    def all(self):
+        return self._select('ORDER BY entry_date, position_id')
+
+    def used_capital(self):
+        """청산 완료되지 않은 포지션(보유중 + 청산신호) 투자금 합계 (투자금 부족 확인용)"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT COALESCE(SUM(investment), 0) FROM positions WHERE status != ?', [STATUS_CLOSED]
+            ).fetchone()
+        return row[0]
+
+    def count(self, status=None):
+        with self._lock:
+            if status is None:
+                return self._conn.execute('SELECT COUNT(*) FROM positions').fetchone()[0]
+            return self._conn.execute('SELECT COUNT(*) FROM positions WHERE status = ?', [status]).fetchone()[0]
+
+    def frame(self, status=None):
+        """화면 표시용 DataFrame (기존 pd.DataFrame(user_positions) 와 같은 컬럼)"""
+        rows = self.all() if status is None else self.by_status(status)
+        return pd.DataFrame(rows, columns=KEYS)
+
+    def iter_chunks(self, status=None, chunk_size=5000):
+        """포지션ID 순으로 ``chunk_size`` 건씩 나눠 읽음 (내보내기용, 전체를 메모리에 올리지 않음)"""
+        last = ''
+        while True:
+            if status is None:
+                rows = self._select('WHERE position_id > ? ORDER BY position_id LIMIT ?', [last, chunk_size])
+            else:
+                rows = self._select('WHERE status = ? AND position_id > ? ORDER BY position_id LIMIT ?',
+                                    [status, last, chunk_size])
+            if not rows:
+                return
+            yield rows
+            last = rows[-1]['포지션ID']
+
+    def _select(self, clause, args=()):
+        with self._lock:
+            cursor = self._conn.execute(f'SELECT {", ".join(COLUMNS)} FROM positions {clause}', args)
+            return [{TO_KEY[k]: row[k] for k in row.keys()} for row in cursor.fetchall()]
+
+    # ---------------------------------------------------------------- 지표 상태
+
+    def save_indicator_state(self, ticker, state):
+        """streaming.IndicatorState 를 종목별로 저장"""
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO indicator_state (ticker, state, updated_at) VALUES (?, ?, ?)',
+                [ticker, json.dumps(state.to_dict()), _now()],
+            )
+
+    def load_indicator_state(self, ticker):
+        from .streaming import IndicatorState
+
+        with self._lock:
+            row = self._conn.execute('SELECT state FROM indicator_state WHERE ticker = ?', [ticker]).fetchone()
+        return None if row is None else IndicatorState.from_dict(json.loads(row['state']))
+
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def _to_db(value):
+    # numpy/pandas 스칼라를 SQLite 가 받는 파이썬 값으로
+    if isinstance(value, pd.Timestamp):
+        return value.strftime('%Y-%m-%d')
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
@@ -0,0 +1,170 @@
+"""보유 포지션 현재가 일괄 갱신.
+
+"🔄 현재가 업데이트" 에서 포지션마다 시세를 따로 받는 대신
+- 보유 종목코드를 중복 없이 모아 한 번에 동시 조회하고
+- 손익/손익률/손절가/다음매수가/상태를 전 포지션에 대해 벡터 연산으로 계산하고
+- 값이 바뀐 행만 저장소에 쓰고
+- 손절/청산 수준을 새로 넘은 포지션 목록을 돌려줍니다.
+
+손절가는 같은 종목의 피라미딩 유닛 중 가장 최근 진입 기준 (진입가 - 2N) 으로
+끌어올리고 내리지는 않습니다. 다음매수가는 종목별 마지막 진입가 + 0.5N,
+4유닛이 차면 0 입니다.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from . import instrumentation
+from .batch_fetch import get_market_data_many
+from .indicators import TurtleParams, build_panel, latest_indicators
+from .position_store import STATUS_CLOSED, STATUS_EXIT, STATUS_OPEN, STATUS_STOP
+
+MAX_UNITS = 4
+UPDATED_KEYS = ['현재가', '손익', '손익률', '손절가', '다음매수가', '상태']
+
+
+@dataclass
+class UpdateReport:
+    updated: int = 0                                   # 저장소에 쓴 행 수
+    crossed: list = field(default_factory=list)        # 새로 손절/청산 신호가 난 포지션 (손절가, 청산기준 포함)
+    add_ready: list = field(default_factory=list)      # 다음매수가에 도달한 종목
+    failures: dict = field(default_factory=dict)       # 시세 조회 실패 종목
+
+    def __int__(self):
+        return self.updated
+
+
+def latest_levels(frames, params=TurtleParams()):
+    """{종목코드: 일봉} 에서 종목별 최신 종가와 청산 기준(직전 N일 저가) 표"""
+    panel = build_panel(frames)
+    if not panel.tickers:
+        return pd.DataFrame(columns=['현재가', '청산기준'])
+    latest = latest_indicators(panel, params)
+    return pd.DataFrame({'현재가': latest['close'], '청산기준': latest['lower']},
+                        index=pd.Index(panel.tickers, name='종목코드'))
+
+
+def apply_prices(positions, levels, params=TurtleParams()):
+    """포지션 DataFrame 에 최신 가격을 반영한 새 DataFrame 반환 (전 행 벡터 연산)"""
+    df = positions.copy()
+    live = df['상태'] != STATUS_CLOSED
+    priced = live & df['종목코드'].isin(levels.index)
+
+    price = df['종목코드'].map(levels['현재가'])
+    lower = df['종목코드'].map(levels['청산기준'])
+    df.loc[priced, '현재가'] = price[priced]
+
+    entry = df['진입가'].astype('float64')
+    qty = df['수량'].astype('float64')
+    current = df['현재가'].astype('float64')
+    df.loc[live, '손익'] = ((current - entry) * qty)[live]
+    df.loc[live, '손익률'] = ((current / entry - 1) * 100)[live]
+
+    # 종목별 마지막 진입 (진입일, 포지션ID 순)
+    open_rows = df[live].sort_values(['진입일', '포지션ID'])
+    last = open_rows.groupby('종목코드').tail(1).set_index('종목코드')
+    units = open_rows.groupby('종목코드').size()
+    atr = last['ATR(N)'].astype('float64')
+
+    ticker_stop = np.round(last['진입가'] - params.stop_multiple * atr)
+    ticker_next = np.where(units.reindex(last.index) < MAX_UNITS,
+                           np.round(last['진입가'] + params.add_step * atr), 0)
+    ticker_next = pd.Series(ticker_next, index=last.index)
+
+    new_stop = df['종목코드'].map(ticker_stop)
+    df.loc[live, '손절가'] = np.fmax(df['손절가'].astype('float64'), new_stop)[live]
+    df.loc[live, '다음매수가'] = df['종목코드'].map(ticker_next)[live]
+
+    # 보유중 포지션만 청산신호로 바뀜. 이미 신호가 난 포지션은 가격이 회복돼도 청산할 때까지 유지
+    stop_hit = current <= df['손절가']
+    exit_hit = current < lower
+    status = np.select([stop_hit, exit_hit], [STATUS_STOP, STATUS_EXIT], STATUS_OPEN)
+    flagged = (priced & (df['상태'] == STATUS_OPEN)).to_numpy()
+    df.loc[flagged, '상태'] = status[flagged]
+    return df
+
+
+def diff_rows(before, after, keys=UPDATED_KEYS):
+    """바뀐 값만 담은 ``[{'포지션ID': ..., 키: 새 값}]`` 목록"""
+    changes = []
+    old = before.set_index('포지션ID')[keys]
+    new = after.set_index('포지션ID')[keys]
+    changed = ~((old == new) | (old.isna() & new.isna()))
+    for position_id in new.index[changed.any(axis=1)]:
+        row = {'포지션ID': position_id}
+        for key in new.columns[changed.loc[position_id].to_numpy()]:
+            row[key] = new.at[position_id, key]
+        changes.append(row)
+    return changes
+
+
+@instrumentation.timed('update_positions')
+def update_positions(store, turtle_system, params=TurtleParams(), days=40, **fetch_options):
+    """저장소의 미청산 포지션 전체를 최신 시세로 갱신하고 UpdateReport 반환.
+
+    ``turtle_system`` 은 ``get_market_data(ticker, days)`` 를 가진 객체 또는 같은 형태의 함수.
+    """
+    report = UpdateReport()
+    positions = pd.DataFrame(store.open_positions())
+    if positions.empty:
+        return report
+
+    tickers = positions['종목코드'].unique().tolist()
+    batch = get_market_data_many(turtle_system, tickers, days=days, **fetch_options)
+    report.failures = batch.failures
+
+    levels = latest_levels(batch.frames, params)
+    after = apply_prices(positions, levels, params)
+    changes = diff_rows(positions, after)
+    # 시세를 받는 동안 다른 세션이 청산했으면 그 포지션은 건너뜀 (읽은 상태 그대로일 때만 씀)
+    read_status = positions.set_index('포지션ID')['상태']
+    applied = set(store.apply_changes(changes, expected_status=read_status.to_dict()))
+    report.updated = len(applied)
+
+    # 보유중 → 청산신호 로 바뀐 포지션
+    was_open = read_status == STATUS_OPEN
+    for row in changes:
+        if row['포지션ID'] not in applied:
+            continue
+        if row.get('상태') in (STATUS_STOP, STATUS_EXIT) and was_open.get(row['포지션ID'], False):
+            position = after.loc[after['포지션ID'] == row['포지션ID']].iloc[0]
+            report.crossed.append({
+                '포지션ID': row['포지션ID'],
+                '종목코드': position['종목코드'],
+                '종목명': position['종목명'],
+                '상태': position['상태'],
+                '현재가': position['현재가'],
+                '손절가': position['손절가'],
+                '청산기준': float(levels.at[position['종목코드'], '청산기준']),
+            })
+
+    ready = after[(after['상태'] == STATUS_OPEN) & (after['다음매수가'] > 0)
+                  & (after['현재가'] >= after['다음매수가'])]
+    report.add_ready = ready.drop_duplicates('종목코드')[['종목코드', '종목명', '현재가', '다음매수가']].to_dict('records')
+    return report
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _default_executor():
+    # import 할 때가 아니라 처음 백그라운드 갱신을 요청할 때 스레드 풀 생성
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='position-update')
+        return _executor
+
+
+def start_update(store, turtle_system, executor=None, **options):
+    """update_positions 를 백그라운드에서 실행하고 Future 반환 (화면은 결과만 확인).
+
+    ``executor`` 를 주지 않으면 모듈 공용 단일 스레드 풀을 씁니다.
+    """
+    executor = executor or _default_executor()
+    return executor.submit(update_positions, store, turtle_system, **options)
@@ -0,0 +1,143 @@
+"""앱 시작 전 캐시 예열.
+
+컨테이너가 막 뜬 직후 첫 사용자가 종목 색인 생성과 일봉 조회를 기다리지 않도록
+Streamlit 서버(= 헬스체크)보다 먼저 디스크 캐시를 채웁니다.
+
+    python -m turtle_trading.prewarm && streamlit run app.py
+
+- 마지막 거래일 종목 색인 (symbols.load_or_build)
+- 보유/청산신호 포지션 종목, 최근 스냅샷의 진입 신호 종목, ``--tickers`` 의 일봉 (OHLCVCache)
+
+pykrx/plotly import 는 프로세스마다 따로라서 CLI 에서 해 봐야 Streamlit 서버는
+빨라지지 않습니다. 앱 안에서 ``start(...)`` 로 백그라운드 실행하면 같은 프로세스라
+import 도 함께 미리 합니다.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import instrumentation
+from .lazy import HEAVY_MODULES
+
+
+def warm_tickers(store_path='data/positions.db', screens_root='data/screens', extra=()):
+    """예열할 종목코드: 미청산 포지션 + 최근 스냅샷 진입 신호 + ``extra`` (중복 제거, 순서 유지)"""
+    tickers = list(extra)
+    if store_path and os.path.exists(store_path):
+        from .position_store import PositionStore
+
+        store = PositionStore(store_path)
+        try:
+            tickers += [p['종목코드'] for p in store.open_positions()]
+        finally:
+            store.close()
+
+    from .screen import latest_snapshot
+
+    snapshot = latest_snapshot(screens_root) if screens_root else None
+    if snapshot is not None:
+        entry = snapshot.arrays['entry']
+        tickers += [str(code) for code in snapshot.arrays['code'][entry]]
+    return list(dict.fromkeys(tickers))
+
+
+def prewarm(tickers=(), symbols_root='.cache/symbols', cache_root='.cache/ohlcv',
+            store_path='data/positions.db', screens_root='data/screens', days=60,
+            imports=(), fetcher=None, fetch_listings=None, **fetch_options):
+    """색인/일봉 캐시(와 ``imports`` 모듈)를 채우고 단계별 소요 시간 dict 반환.
+
+    단계가 실패해도 멈추지 않고 ``stats['failures']`` 에 남깁니다.
+    """
+    stats = {'failures': {}}
+
+    started = time.perf_counter()
+    for name in imports:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            stats['failures'][name] = str(e)
+    stats['imports'] = time.perf_counter() - started
+
+    from .symbols import load_or_build, pykrx_listings
+
+    started = time.perf_counter()
+    stats['symbol_count'] = 0
+    try:
+        with instrumentation.span('prewarm.symbols'):
+            index = load_or_build(symbols_root, fetch_listings=fetch_listings or pykrx_listings)
+        stats['symbol_count'] = len(index.codes)
+    except Exception as e:  # 색인은 앱이 처음 쓸 때 다시 만들면 됨
+        stats['failures']['symbols'] = str(e)
+    stats['symbols'] = time.perf_counter() - started
+
+    from .batch_fetch import get_market_data_many
+    from .market_cache import OHLCVCache, pykrx_fetch
+
+    started = time.perf_counter()
+    stats['tickers'] = 0
+    try:
+        tickers = warm_tickers(store_path, screens_root, tickers)
+        cache = OHLCVCache(cache_root, fetcher=fetcher or pykrx_fetch)
+        with instrumentation.span('prewarm.ohlcv'):
+            batch = get_market_data_many(cache, tickers, days=days, **fetch_options)
+        stats['tickers'] = len(tickers)
+        stats['failures'].update({t: str(e) for t, e in batch.failures.items()})
+    except Exception as e:
+        stats['failures']['ohlcv'] = str(e)
+    stats['ohlcv'] = time.perf_counter() - started
+    return stats
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _default_executor():
+    # import 할 때가 아니라 처음 start() 를 부를 때 스레드 풀 생성
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prewarm')
+        return _executor
+
+
+def start(executor=None, **options):
+    """prewarm 을 백그라운드에서 실행하고 Future 반환 (앱 프로세스이므로 무거운 모듈도 import)"""
+    options.setdefault('imports', HEAVY_MODULES)
+    return (executor or _default_executor()).submit(prewarm, **options)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='앱 시작 전 종목 색인/일봉 디스크 캐시 예열')
+    parser.add_argument('--tickers', nargs='*', default=[], help='추가로 받아둘 종목코드')
+    parser.add_argument('--symbols', default='.cache/symbols', help='종목 색인 경로')
+    parser.add_argument('--cache', default='.cache/ohlcv', help='일봉 캐시 경로')
+    parser.add_argument('--store', default='data/positions.db', help='포지션 DB 경로')
+    parser.add_argument('--screens', default='data/screens', help='스냅샷 경로')
+    parser.add_argument('--days', type=int, default=60)
+    parser.add_argument('--ready-file', help='끝나면 단계별 시간을 JSON 으로 기록할 파일')
+    args = parser.parse_args(argv)
+
+    stats = prewarm(args.tickers, args.symbols, args.cache, args.store, args.screens, args.days)
+    failures = stats.pop('failures')
+    print(f"예열 완료: 종목 색인 {stats['symbol_count']}개 ({stats['symbols']:.1f}s), "
+          f"일봉 {stats['tickers']}종목 ({stats['ohlcv']:.1f}s)")
+    for name, error in failures.items():
+        print(f'  실패 {name}: {error}', file=sys.stderr)
+
+    if args.ready_file:
+        os.makedirs(os.path.dirname(os.path.abspath(args.ready_file)), exist_ok=True)
+        with open(args.ready_file, 'w', encoding='utf-8') as f:
+            json.dump({**stats, 'failures': sorted(failures)}, f, ensure_ascii=False)
+    # 일부 종목 실패는 앱이 다시 받으면 되므로 시작을 막지 않음
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
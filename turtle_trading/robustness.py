@@ -0,0 +1,281 @@
+"""터틀 규칙 견고성 검증 (몬테카를로, 워크포워드).
+
+백테스트 한 번의 결과는 거래 순서에 따라 크게 달라집니다. 여기서는
+
+- 몬테카를로: 거래별 R 배수(손익 / 첫 유닛 리스크)를 복원추출해 거래 순서를
+  바꾼 자산 곡선 수천 개를 (경로 × 거래) NumPy 배열 한 번으로 계산하고,
+  경로별 최대 낙폭과 파산(자본이 ``ruin`` 비율 아래로 떨어짐) 확률 분포를 냅니다.
+  경로는 조각으로 나눠 ProcessPoolExecutor 로 코어마다 돌립니다.
+- 워크포워드: 학습 구간에서 optimizer.sweep 으로 고른 매개변수를 바로 다음
+  검증 구간에 적용하는 것을 창을 밀며 반복해 표본 외 성과만 이어 붙입니다.
+
+자산 변화는 calculate_position_size 의 2% 룰과 같은 고정 비율 모델
+(거래마다 자본 × risk_pct × R)입니다.
+
+    mc = monte_carlo(r_multiples(result.trades), n_paths=10_000)
+    mc.summary()            # 최대 낙폭/최종 수익률 분위수, 파산 확률
+    wf = walk_forward(panel, grid(entry_period=[20, 55], exit_period=[10, 20]))
+    wf.windows, wf.equity, wf.stats
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+import pandas as pd
+
+from . import instrumentation
+from .backtest import TRADING_DAYS, run_vectorized, summarize
+from .indicators import Panel, TurtleParams, compute_indicators
+from .optimizer import Leaderboard, sweep
+
+DRAWDOWN_LEVELS = (0.1, 0.2, 0.3, 0.5)
+PATH_CHUNK = 2500
+
+
+def r_multiples(trades):
+    """거래별 R 배수 (손익 / 첫 유닛 손절 리스크) 배열.
+
+    리스크는 거래마다 진입 때의 손절폭(``Trade.stop_distance``)을 쓰므로 창마다
+    stop_multiple 이 다른 워크포워드 거래도 섞어 쓸 수 있습니다.
+    """
+    return np.asarray([trade.r_multiple for trade in trades
+                       if trade.stop_distance * trade.fills[0][2] > 0], dtype='float64')
+
+
+# ---------------------------------------------------------------- 몬테카를로
+
+def _sample_indices(rng, n_source, n_paths, n_trades, block):
+    """(경로 × 거래) 복원추출 인덱스. ``block`` > 1 이면 연속 구간 단위 (연승/연패 유지)"""
+    if block <= 1:
+        return rng.integers(0, n_source, size=(n_paths, n_trades))
+    n_blocks = -(-n_trades // block)
+    starts = rng.integers(0, n_source, size=(n_paths, n_blocks, 1))
+    index = (starts + np.arange(block)) % n_source
+    return index.reshape(n_paths, -1)[:, :n_trades]
+
+
+def simulate_paths(r, n_paths, n_trades=None, risk_pct=0.02, ruin=0.5, block=1, seed=0):
+    """경로 ``n_paths`` 개를 한 번에 계산해 (최대 낙폭, 최종 배수, 파산 여부, 최저 배수) 배열 반환"""
+    r = np.asarray(r, dtype='float64')
+    n_trades = n_trades or len(r)
+    rng = np.random.default_rng(seed)
+    index = _sample_indices(rng, len(r), n_paths, n_trades, block)
+
+    # 자본 배수 곡선 (시작 1.0), 한 거래 손실이 자본을 넘으면 0 에서 멈춤
+    growth = np.maximum(1.0 + risk_pct * r[index], 0.0)
+    equity = np.cumprod(growth, axis=1)
+    peak = np.maximum.accumulate(np.maximum(equity, 1.0), axis=1)
+    drawdown = (equity / peak - 1.0).min(axis=1)
+    lowest = equity.min(axis=1)
+    return drawdown, equity[:, -1], lowest <= ruin, lowest
+
+
+def _simulate_chunk(args):
+    return simulate_paths(*args)
+
+
+@dataclass
+class MonteCarloResult:
+    max_drawdown: np.ndarray   # 경로별 최대 낙폭 (음수)
+    final: np.ndarray          # 경로별 최종 자본 배수
+    ruined: np.ndarray         # 경로별 파산 여부
+    lowest: np.ndarray         # 경로별 최저 자본 배수
+    n_trades: int
+    ruin: float
+    trades_per_year: float = None
+
+    @property
+    def n_paths(self):
+        return len(self.final)
+
+    @property
+    def ruin_probability(self):
+        return float(self.ruined.mean()) if self.n_paths else 0.0
+
+    def drawdown_probabilities(self, levels=DRAWDOWN_LEVELS):
+        """{낙폭 수준: 그 이상 낙폭을 겪는 경로 비율}"""
+        return {level: float((self.max_drawdown <= -level).mean()) for level in levels}
+
+    def summary(self, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95)):
+        """최대 낙폭/최종 수익률 분위수 표와 파산 확률"""
+        table = pd.DataFrame({
+            'MDD': np.quantile(self.max_drawdown, quantiles),
+            'Return': np.quantile(self.final - 1.0, quantiles),
+        }, index=pd.Index(quantiles, name='quantile'))
+        if self.trades_per_year:
+            years = self.n_trades / self.trades_per_year
+            table['CAGR'] = np.quantile(np.maximum(self.final, 0.0) ** (1 / years) - 1, quantiles)
+        return {
+            'paths': self.n_paths,
+            'trades': self.n_trades,
+            'ruin': self.ruin,
+            'ruin_probability': self.ruin_probability,
+            'drawdown_probability': self.drawdown_probabilities(),
+            'quantiles': table,
+        }
+
+    def histogram(self, bins=40):
+        """최대 낙폭 분포 (차트용 DataFrame: 구간 시작, 경로 수)"""
+        counts, edges = np.histogram(self.max_drawdown, bins=bins)
+        return pd.DataFrame({'MDD': edges[:-1], 'paths': counts})
+
+
+@instrumentation.timed('robustness.monte_carlo')
+def monte_carlo(r, n_paths=10_000, n_trades=None, risk_pct=0.02, ruin=0.5, block=1, seed=0,
+                max_workers=None, chunk=PATH_CHUNK, trades_per_year=None):
+    """R 배수 표본을 복원추출한 자산 경로 ``n_paths`` 개의 낙폭/파산 분포.
+
+    ``n_trades`` 는 경로당 거래 수 (기본: 원래 거래 수), ``ruin`` 은 파산으로 보는
+    자본 배수 (0.5 = 시작 자본의 절반). 경로는 ``chunk`` 개씩 나눠 프로세스 풀에서
+    계산하고, 조각이 하나뿐이거나 ``max_workers=1`` 이면 현재 프로세스에서 계산합니다.
+    """
+    r = np.asarray(r, dtype='float64')
+    if not len(r):
+        raise ValueError('R 배수 표본이 없습니다 (거래 없음)')
+    n_trades = n_trades or len(r)
+
+    sizes = [min(chunk, n_paths - start) for start in range(0, n_paths, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(r, size, n_trades, risk_pct, ruin, block, s) for size, s in zip(sizes, seeds)]
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(jobs) == 1:
+        parts = [_simulate_chunk(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+            parts = list(pool.map(_simulate_chunk, jobs))
+
+    drawdown, final, ruined, lowest = (np.concatenate(arrays) for arrays in zip(*parts))
+    return MonteCarloResult(drawdown, final, ruined, lowest, n_trades, ruin, trades_per_year)
+
+
+def trades_per_year(trades):
+    """거래 기간 기준 연간 거래 수 (CAGR 환산용)"""
+    if len(trades) < 2:
+        return None
+    first = min(t.entry_date for t in trades)
+    last = max(t.exit_date for t in trades)
+    years = (last - first).days / 365.25
+    return len(trades) / years if years > 0 else None
+
+
+# ---------------------------------------------------------------- 워크포워드
+
+def slice_panel(panel, start, end):
+    """``[start, end)`` 봉 구간 Panel (배열은 복사하지 않는 view)"""
+    return Panel(panel.dates[start:end], panel.tickers, panel.open[start:end], panel.high[start:end],
+                 panel.low[start:end], panel.close[start:end], panel.volume[start:end])
+
+
+def windows(n_bars, train_bars, test_bars, step=None):
+    """(학습 시작, 학습 끝 = 검증 시작, 검증 끝) 봉 번호 목록"""
+    step = step or test_bars
+    out = []
+    start = 0
+    while start + train_bars < n_bars:
+        test_end = min(start + train_bars + test_bars, n_bars)
+        out.append((start, start + train_bars, test_end))
+        if test_end == n_bars:
+            break
+        start += step
+    return out
+
+
+@dataclass
+class WalkForwardResult:
+    windows: pd.DataFrame      # 창별 선택 매개변수, 학습/검증 성과
+    equity: pd.Series          # 검증 구간만 이어 붙인 자산 곡선
+    trades: list               # 검증 구간 거래
+    capital: float
+    params: list = field(default_factory=list)   # 창별 TurtleParams
+
+    @property
+    def stats(self):
+        stats = summarize(self.trades, self.equity, self.capital)
+        if len(self.windows):
+            # 학습 대비 검증 샤프 비율 (1 에 가까울수록 과최적화가 적음)
+            train = self.windows['train_Sharpe'].mean()
+            stats['Efficiency'] = float(self.windows['test_Sharpe'].mean() / train) if train else 0.0
+        return stats
+
+    def monte_carlo(self, **options):
+        """검증 구간 거래로 몬테카를로 (risk_pct 기본값은 창별 선택값의 중앙값)"""
+        risk_pct = float(np.median([p.risk_pct for p in self.params])) if self.params else 0.02
+        options.setdefault('risk_pct', risk_pct)
+        options.setdefault('trades_per_year', trades_per_year(self.trades))
+        return monte_carlo(r_multiples(self.trades), **options)
+
+
+@instrumentation.timed('robustness.walk_forward')
+def walk_forward(panel, combos, train_bars=2 * TRADING_DAYS, test_bars=TRADING_DAYS // 2, step=None,
+                 objective='Sharpe', capital=100_000_000, max_workers=None, on_window=None):
+    """창마다 학습 구간 최적 조합(``objective`` 최대)을 골라 다음 검증 구간에 적용.
+
+    검증 구간은 지표 준비 기간(warmup)만큼 앞 봉을 붙여 계산하고, 그 봉들의 진입신호는
+    지웁니다. 검증 구간 자산 곡선은 수익률로 이어 붙여 ``capital`` 에서 시작합니다.
+    ``on_window(row)`` 는 창 하나가 끝날 때마다 호출됩니다.
+    """
+    rows = []
+    chosen = []
+    trades = []
+    pieces = []
+    level = float(capital)
+
+    for train_start, test_start, test_end in windows(panel.shape[0], train_bars, test_bars, step):
+        board = Leaderboard(objective, size=1)
+        for result in sweep(slice_panel(panel, train_start, test_start), combos, max_workers, capital):
+            board.add(result)
+        if not board.top():
+            continue
+        best = board.top(1)[0]
+        params = replace(TurtleParams(), **best.params)
+
+        warm_start = max(0, test_start - params.warmup)
+        test_panel = slice_panel(panel, warm_start, test_end)
+        indicators = compute_indicators(test_panel, params)
+        indicators['entry'][:test_start - warm_start] = False
+        test = run_vectorized(test_panel, params, capital, indicators)
+        period = pd.DatetimeIndex(panel.dates[test_start:test_end])
+        test_trades = test.trades
+        equity = test.equity.loc[period[0]:]
+        # warmup 봉에서는 진입하지 않으므로 검증 구간 직전 평가금액은 capital
+        returns = equity.to_numpy() / np.concatenate([[capital], equity.to_numpy()[:-1]])
+        path = level * np.cumprod(returns)
+        level = float(path[-1])
+        pieces.append(pd.Series(path, index=equity.index))
+
+        test_stats = summarize(test_trades, equity, capital)
+        row = {
+            'train_start': pd.Timestamp(panel.dates[train_start]),
+            'test_start': period[0],
+            'test_end': period[-1],
+            **best.params,
+            **{f'train_{k}': v for k, v in best.stats.items()},
+            **{f'test_{k}': v for k, v in test_stats.items()},
+        }
+        rows.append(row)
+        chosen.append(params)
+        trades.extend(test_trades)
+        if on_window is not None:
+            on_window(row)
+
+    equity = pd.concat(pieces) if pieces else pd.Series(dtype='float64')
+    equity.name = 'equity'
+    return WalkForwardResult(pd.DataFrame(rows), equity, trades, capital, chosen)
+
+
+def ruin_table(r, risk_levels=(0.005, 0.01, 0.02, 0.03), ruin=0.5, **options):
+    """리스크 비율별 파산 확률/낙폭 중앙값 (2% 룰이 얼마나 여유 있는지 비교)"""
+    rows = []
+    for risk_pct in risk_levels:
+        result = monte_carlo(r, risk_pct=risk_pct, ruin=ruin, **options)
+        rows.append({
+            'risk_pct': risk_pct,
+            'ruin_probability': result.ruin_probability,
+            'MDD_p50': float(np.median(result.max_drawdown)),
+            'MDD_p05': float(np.quantile(result.max_drawdown, 0.05)),
+            'Return_p50': float(np.median(result.final) - 1.0),
+        })
+    return pd.DataFrame(rows)
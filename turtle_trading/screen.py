@@ -0,0 +1,418 @@
+"""장 마감 후 전 종목 스캔 스냅샷.
+
+신호 분석 탭의 ``results_df`` 와 종목별 증분 지표 상태(IndicatorState)를
+거래일마다 한 번 계산해서 버전이 붙은 디렉터리에 열 단위 NumPy 배열로
+저장합니다. 앱은 시작할 때 스냅샷을 memory-map 으로 열어 진입신호/청산신호/
+거래량급증 요약을 바로 보여주고, 실시간 스캔은 스냅샷 이후 새 봉만 반영합니다.
+
+    # 장 마감 후 (cron 등)
+    python -m turtle_trading.screen --root data/screens
+
+    # 앱
+    snapshot = latest_snapshot('data/screens')
+    snapshot.summary()                    # {'종목수', '진입신호', '청산신호', '거래량급증'}
+    results_df = snapshot.results()
+    results_df, states = refresh_from(snapshot, turtle_system, tickers)
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from . import instrumentation
+from .batch_fetch import RateLimiter, get_market_data_many
+from .indicators import RESULT_COLUMNS, TurtleParams, build_panel, scan, true_range, wilder_atr
+from .market_cache import OHLCV_COLUMNS
+from .streaming import IndicatorState
+
+SNAPSHOT_VERSION = 1
+# 증분 갱신 때 스냅샷 마지막 날짜 앞으로 더 받는 달력 일수 (마지막 봉이 꼭 포함되도록)
+SNAPSHOT_OVERLAP_DAYS = 5
+# 기본 스캔 대상 시장 (종목 색인은 KONEX 도 담지만 스캔은 --markets 로 넣을 때만)
+SCREEN_MARKETS = ('KOSPI', 'KOSDAQ')
+
+# results_df 열 → 파일 이름
+RESULT_FILES = dict(zip(RESULT_COLUMNS, [
+    'code', 'name', 'close', 'atr', 'upper', 'lower',
+    'stop', 'add1', 'entry', 'exit', 'surge', 'volume', 'volume_ratio',
+]))
+INT_COLUMNS = ['현재가', 'Donchian상단', 'Donchian하단', '손절가', '추가매수1', '거래량']
+BOOL_COLUMNS = ['진입신호', '청산신호', '거래량급증']
+
+STATE_ARRAYS = ['state_ticker', 'state_count', 'state_prev_close', 'state_tr_sum', 'state_atr',
+                'state_high_index', 'state_high', 'state_low_index', 'state_low', 'state_volume']
+
+
+# ---------------------------------------------------------------- 지표 상태
+
+def states_from_panel(panel, params=TurtleParams()):
+    """패널 끝 시점의 종목별 IndicatorState 를 배치 계산 결과로 바로 만듦.
+
+    종목마다 전 구간을 replay 하지 않고 ATR/TR 누적은 패널 배열에서, 채널 덱과
+    거래량 창은 마지막 구간 값만 넣어 채웁니다 (replay 결과와 같은 상태).
+    """
+    n = panel.shape[0]
+    atr = wilder_atr(panel.high, panel.low, panel.close, params.atr_period)[-1]
+    tr = true_range(panel.high, panel.low, panel.close)
+    count = np.isfinite(panel.close).sum(axis=0)
+    start = n - count   # 상장 후 구간은 거래정지도 채워져 있어서 끝까지 이어짐
+
+    # ATR 시작값용 TR 누적 (IndicatorState 와 같은 순서로 더함)
+    tr_sum = np.zeros(len(panel.tickers))
+    for k in range(params.atr_period):
+        rows = np.minimum(start + k, n - 1)
+        value = tr[rows, np.arange(len(panel.tickers))]
+        tr_sum += np.where(k < count, value, 0.0)
+
+    last_date = pd.Timestamp(panel.dates[-1]) if n else None
+    states = {}
+    for j, ticker in enumerate(panel.tickers):
+        c = int(count[j])
+        if c == 0:
+            continue
+        state = IndicatorState(params)
+        state.count = c
+        state.last_date = last_date
+        state.prev_close = float(panel.close[-1, j])
+        state.tr_sum = float(tr_sum[j])
+        state.atr = float(atr[j])
+        for idx in range(max(0, c - params.entry_period), c):
+            state.highs.push(idx, float(panel.high[start[j] + idx, j]))
+        for idx in range(max(0, c - params.exit_period), c):
+            state.lows.push(idx, float(panel.low[start[j] + idx, j]))
+        state.volumes.extend(panel.volume[n - min(c, params.volume_period):, j].tolist())
+        states[ticker] = state
+    return states
+
+
+def _pack(rows, width, fill, dtype):
+    out = np.full((len(rows), width), fill, dtype=dtype)
+    for i, row in enumerate(rows):
+        if row:
+            out[i, :len(row)] = row
+    return out
+
+
+def _state_arrays(states, params):
+    tickers = list(states)
+    items = [states[t] for t in tickers]
+    return {
+        'state_ticker': np.array(tickers, dtype='U'),
+        'state_count': np.array([s.count for s in items], dtype=np.int64),
+        'state_prev_close': np.array([s.prev_close for s in items], dtype='float64'),
+        'state_tr_sum': np.array([s.tr_sum for s in items], dtype='float64'),
+        'state_atr': np.array([s.atr for s in items], dtype='float64'),
+        'state_high_index': _pack([[i for i, _ in s.highs.items] for s in items], params.entry_period, -1, np.int64),
+        'state_high': _pack([[v for _, v in s.highs.items] for s in items], params.entry_period, np.nan, 'float64'),
+        'state_low_index': _pack([[i for i, _ in s.lows.items] for s in items], params.exit_period, -1, np.int64),
+        'state_low': _pack([[v for _, v in s.lows.items] for s in items], params.exit_period, np.nan, 'float64'),
+        'state_volume': _pack([list(s.volumes) for s in items], params.volume_period, np.nan, 'float64'),
+    }
+
+
+# ---------------------------------------------------------------- 스냅샷
+
+class Snapshot:
+    """memory-map 으로 연 스캔 스냅샷 (results_df 열 + 종목별 지표 상태)"""
+
+    def __init__(self, path, arrays, meta):
+        self.path = path
+        self.arrays = arrays
+        self.meta = meta
+        self.params = TurtleParams(**meta['params'])
+        self.trading_day = meta['trading_day']
+        self._rows = None
+
+    def __len__(self):
+        return len(self.arrays['code'])
+
+    def summary(self):
+        """신호 분석 요약 지표 (DataFrame 을 만들지 않고 배열에서 바로 셈)"""
+        return {
+            '종목수': len(self),
+            '진입신호': int(np.count_nonzero(self.arrays['entry'])),
+            '청산신호': int(np.count_nonzero(self.arrays['exit'])),
+            '거래량급증': int(np.count_nonzero(self.arrays['surge'])),
+        }
+
+    def results(self):
+        """``results_df`` 와 같은 열의 DataFrame"""
+        data = {}
+        for column, name in RESULT_FILES.items():
+            values = np.asarray(self.arrays[name])
+            data[column] = values.astype(object) if values.dtype.kind == 'U' else values.copy()
+        return pd.DataFrame(data, columns=RESULT_COLUMNS)
+
+    def state(self, ticker):
+        """종목의 IndicatorState (스냅샷에 없으면 None)"""
+        if self._rows is None:
+            self._rows = {str(t): i for i, t in enumerate(self.arrays['state_ticker'])}
+        i = self._rows.get(ticker)
+        if i is None:
+            return None
+        a = self.arrays
+        state = IndicatorState(self.params)
+        state.count = int(a['state_count'][i])
+        state.last_date = pd.Timestamp(self.meta['last_date'])
+        state.prev_close = float(a['state_prev_close'][i])
+        state.tr_sum = float(a['state_tr_sum'][i])
+        state.atr = float(a['state_atr'][i])
+        for window, key in ((state.highs, 'state_high'), (state.lows, 'state_low')):
+            index = a[f'{key}_index'][i]
+            keep = index >= 0
+            window.items.extend(zip(index[keep].tolist(), a[key][i][keep].tolist()))
+        volumes = a['state_volume'][i][:min(state.count, self.params.volume_period)]
+        state.volumes.extend(volumes.tolist())
+        return state
+
+    def states(self):
+        return {str(t): self.state(str(t)) for t in self.arrays['state_ticker']}
+
+
+def write_snapshot(results, states, root='data/screens', trading_day=None, params=TurtleParams(),
+                   keep=5, elapsed=None):
+    """``{root}/{거래일}-v{버전}/`` 에 스냅샷을 원자적으로 저장하고 경로 반환"""
+    last_date = max((s.last_date for s in states.values() if s.last_date is not None), default=None)
+    if trading_day is None:
+        trading_day = (last_date or pd.Timestamp.now()).strftime('%Y%m%d')
+
+    arrays = {}
+    for column, name in RESULT_FILES.items():
+        values = results[column].to_numpy()
+        if column in ('종목코드', '종목명'):
+            arrays[name] = np.array([str(v) for v in values], dtype='U')
+        elif column in INT_COLUMNS:
+            arrays[name] = values.astype(np.int64)
+        elif column in BOOL_COLUMNS:
+            arrays[name] = values.astype(bool)
+        else:
+            arrays[name] = values.astype('float64')
+    arrays.update(_state_arrays(states, params))
+
+    meta = {
+        'version': SNAPSHOT_VERSION,
+        'trading_day': trading_day,
+        'last_date': None if last_date is None else str(last_date.date()),
+        'params': params.__dict__,
+        'rows': len(results),
+        'states': len(states),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'elapsed': elapsed,
+    }
+
+    path = os.path.join(root, f'{trading_day}-v{SNAPSHOT_VERSION}')
+    tmp = path + '.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    for name, values in arrays.items():
+        np.save(os.path.join(tmp, f'{name}.npy'), values)
+    with open(os.path.join(tmp, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+
+    for old in _versions(root)[:-keep]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+    return path
+
+
+def load_snapshot(path):
+    with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f'스냅샷 버전이 다릅니다: {meta.get("version")}')
+    names = list(RESULT_FILES.values()) + STATE_ARRAYS
+    arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r') for name in names}
+    return Snapshot(path, arrays, meta)
+
+
+def _versions(root):
+    if not os.path.isdir(root):
+        return []
+    suffix = f'-v{SNAPSHOT_VERSION}'
+    return sorted(d for d in os.listdir(root) if d.endswith(suffix))
+
+
+def latest_snapshot(root='data/screens'):
+    """가장 최근 거래일 스냅샷, 없으면 None"""
+    versions = _versions(root)
+    return load_snapshot(os.path.join(root, versions[-1])) if versions else None
+
+
+# ---------------------------------------------------------------- 증분 갱신
+
+def _result_row(ticker, name, state, volume):
+    last = state.last
+    return {
+        '종목코드': ticker,
+        '종목명': name,
+        '현재가': int(np.round(last['close'])),
+        'ATR(N)': last['atr'],
+        'Donchian상단': int(np.round(last['upper'])),
+        'Donchian하단': int(np.round(last['lower'])),
+        '손절가': int(np.round(last['stop'])),
+        '추가매수1': int(np.round(last['add1'])),
+        '진입신호': bool(last['entry']),
+        '청산신호': bool(last['exit']),
+        '거래량급증': bool(last['volume_surge']),
+        '거래량': int(np.round(volume)),
+        '거래량비율': last['volume_ratio'],
+    }
+
+
+def refresh(snapshot, frames, names=None):
+    """스냅샷 이후 새 봉만 반영한 ``(results_df, {종목코드: IndicatorState})`` 반환.
+
+    ``frames`` 는 {종목코드: 최근 일봉}. 스냅샷에 있는 종목은 마지막 날짜 이후
+    봉만 상태에 넣고, 스냅샷에 없는 종목은 받은 일봉 전체로 상태를 만듭니다.
+    받은 일봉이 스냅샷 마지막 날짜를 포함하지 않으면 (그 사이 봉이 빠졌을 수
+    있으므로) 스냅샷 상태를 버리고 받은 일봉 전체로 다시 만듭니다.
+    ``frames`` 에 없는 종목은 스냅샷 값을 그대로 둡니다.
+    """
+    names = names or {}
+    results = snapshot.results()
+    position = {t: i for i, t in enumerate(results['종목코드'])}
+    rows = {}
+    states = {}
+
+    for ticker, frame in frames.items():
+        if frame is None or frame.empty:
+            continue
+        state = snapshot.state(ticker)
+        if state is None or frame.index[0] > state.last_date:
+            state = IndicatorState(snapshot.params)
+            new = frame
+        else:
+            new = frame[frame.index > state.last_date]
+        if new.empty:
+            continue
+        # replay 는 봉별 DataFrame 을 만들어서 몇 봉짜리 증분에는 update 를 바로 부름
+        for date, values in zip(new.index, new[OHLCV_COLUMNS].to_numpy(dtype='float64')):
+            state.update(dict(zip(OHLCV_COLUMNS, values)), date)
+        states[ticker] = state
+        if state.ready:
+            name = names.get(ticker) or (results.at[position[ticker], '종목명'] if ticker in position else ticker)
+            rows[ticker] = _result_row(ticker, name, state, new['거래량'].iloc[-1])
+
+    if rows:
+        updated = pd.DataFrame([rows[t] for t in rows if t in position], columns=RESULT_COLUMNS)
+        if not updated.empty:
+            index = [position[t] for t in updated['종목코드']]
+            for column in RESULT_COLUMNS:
+                results.loc[index, column] = updated[column].to_numpy()
+        added = pd.DataFrame([rows[t] for t in rows if t not in position], columns=RESULT_COLUMNS)
+        if not added.empty:
+            results = pd.concat([results, added], ignore_index=True)
+    return results, states
+
+
+def refresh_from(snapshot, turtle_system, tickers=None, days=10, names=None, today=None, **fetch_options):
+    """스냅샷 이후 봉만 받아 갱신 (``tickers`` 가 없으면 스냅샷 전 종목).
+
+    조회 기간(달력 일수)은 스냅샷 마지막 날짜부터 오늘까지를 덮도록 ``days`` 보다
+    길게 잡습니다. 스냅샷에 없는 종목과, 받은 일봉이 스냅샷 마지막 날짜에 닿지 않는
+    종목(거래정지 등)은 지표를 처음부터 채울 만큼 (``params.warmup`` 이상) 받습니다.
+    """
+    if tickers is None:
+        tickers = [str(t) for t in snapshot.arrays['state_ticker']]
+    known = set(str(t) for t in snapshot.arrays['state_ticker'])
+    old = [t for t in tickers if t in known]
+    new = [t for t in tickers if t not in known]
+    warmup = max(days, snapshot.params.warmup * 3)
+
+    last_date = snapshot.meta.get('last_date')
+    if last_date is None:
+        new, old = new + old, []
+    else:
+        last_date = pd.Timestamp(last_date)
+        today = pd.Timestamp(today or pd.Timestamp.now()).normalize()
+        days = max(days, (today - last_date).days + SNAPSHOT_OVERLAP_DAYS)
+
+    frames = {}
+    if old:
+        frames.update(get_market_data_many(turtle_system, old, days=days, **fetch_options).frames)
+        # 스냅샷 마지막 봉과 겹치지 않으면 사이 봉을 알 수 없으므로 처음부터 다시 계산
+        new += [t for t in old if t in frames and frames[t].index[0] > last_date]
+    if new:
+        frames.update(get_market_data_many(turtle_system, new, days=max(days, warmup), **fetch_options).frames)
+    return refresh(snapshot, frames, names)
+
+
+# ---------------------------------------------------------------- 야간 스캔
+
+@instrumentation.timed('screen.run')
+def run_screen(turtle_system, tickers, names=None, days=300, params=TurtleParams(),
+               root='data/screens', keep=5, on_result=None, **fetch_options):
+    """전 종목을 받아 스캔하고 스냅샷을 저장, ``(경로, BatchResult)`` 반환"""
+    started = time.perf_counter()
+    batch = get_market_data_many(turtle_system, tickers, days=days, on_result=on_result, **fetch_options)
+    panel = build_panel(batch.frames)
+    results = scan(panel, names, params)
+    states = states_from_panel(panel, params)
+    path = write_snapshot(results, states, root, params=params, keep=keep,
+                          elapsed=round(time.perf_counter() - started, 3))
+    return path, batch
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='장 마감 후 전 종목 터틀 신호 스캔')
+    parser.add_argument('--root', default='data/screens', help='스냅샷 저장 경로')
+    parser.add_argument('--cache', default='.cache/ohlcv', help='일봉 캐시 경로')
+    parser.add_argument('--symbols', default='.cache/symbols', help='종목 색인 경로')
+    parser.add_argument('--days', type=int, default=300, help='종목별 조회 일수')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=10, help='초당 최대 조회 수 (KRX 부하 제한)')
+    parser.add_argument('--keep', type=int, default=5, help='남겨둘 스냅샷 수')
+    parser.add_argument('--markets', nargs='+', default=list(SCREEN_MARKETS),
+                        help='스캔할 시장 (기본 KOSPI KOSDAQ, KONEX 는 직접 지정)')
+    parser.add_argument('--synthetic', type=int, metavar='N',
+                        help='pykrx 대신 합성 데이터 N 종목으로 실행 (점검용)')
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        from .synthetic import FakeKrx
+
+        source = FakeKrx()
+        tickers = [f'{i:06d}' for i in range(args.synthetic)]
+        names = {t: f'종목{t}' for t in tickers}
+    else:
+        from .market_cache import OHLCVCache, pykrx_fetch
+        from .symbols import load_or_build
+
+        index = load_or_build(args.symbols)
+        markets = set(args.markets)
+        listings = [(code, name) for code, name, market, delisted in index.listings()
+                    if not delisted and market in markets]
+        tickers = [code for code, _ in listings]
+        names = dict(listings)
+        # 캐시에 있는 봉은 속도 제한 없이, pykrx 조회만 --rate 로 제한
+        source = OHLCVCache(args.cache, fetcher=pykrx_fetch, limiter=RateLimiter(args.rate))
+
+    done = [0]
+
+    def progress(ticker, df, error):
+        done[0] += 1
+        if done[0] % 100 == 0 or done[0] == len(tickers):
+            print(f'\r조회 {done[0]}/{len(tickers)}', end='', file=sys.stderr, flush=True)
+
+    path, batch = run_screen(source, tickers, names, days=args.days, root=args.root, keep=args.keep,
+                             on_result=progress, max_workers=args.workers)
+    print(file=sys.stderr)
+
+    snapshot = load_snapshot(path)
+    summary = snapshot.summary()
+    print(f"{path}: {summary['종목수']}종목, 진입신호 {summary['진입신호']}, "
+          f"청산신호 {summary['청산신호']}, 거래량급증 {summary['거래량급증']} "
+          f"(실패 {len(batch.failures)}, {batch.elapsed:.1f}s)")
+    return 0 if snapshot.summary()['종목수'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
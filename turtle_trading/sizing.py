@@ -0,0 +1,46 @@
+"""터틀 포지션 사이징 (2% 룰).
+
+신호 분석 탭의 ``turtle_system.calculate_position_size`` 와 같은 결과 dict 를
+돌려줘서 백테스트, 최적화, 리스크 엔진이 화면과 같은 규칙을 씁니다.
+"""
+
+from . import instrumentation
+
+
+def unit_shares(total_capital, price, atr, risk_pct=0.02, stop_multiple=2.0):
+    """1유닛 수량만 계산 (백테스트 내부 루프용, 계산 불가면 0)"""
+    if not (price > 0 and atr > 0):
+        return 0
+    shares = int((total_capital * risk_pct) // (stop_multiple * atr))
+    return max(0, min(shares, int(total_capital // price)))
+
+
+@instrumentation.timed('calculate_position_size')
+def calculate_position_size(total_capital, price, atr, risk_pct=0.02, stop_multiple=2.0, add_step=0.5):
+    """1유닛 매수 수량과 손절/추가매수 가격 계산.
+
+    - 수량 = (총자본 × risk_pct) / (stop_multiple × N), 총자본으로 살 수 있는 수량을 넘지 않음
+    - 손절가 = 가격 - stop_multiple × N
+    - 추가매수 k차 = 가격 + k × add_step × N (k = 1, 2, 3)
+
+    계산할 수 없으면 (가격/ATR 이 0 이하 또는 NaN) None.
+    """
+    if not (price > 0 and atr > 0):
+        return None
+
+    stop_distance = stop_multiple * atr
+    shares = unit_shares(total_capital, price, atr, risk_pct, stop_multiple)
+
+    stop_loss = int(round(price - stop_distance))
+    max_loss = int(round(shares * stop_distance))
+
+    return {
+        'shares': shares,
+        'investment_amount': int(round(shares * price)),
+        'max_loss': max_loss,
+        'risk_percentage': max_loss / total_capital * 100 if total_capital else 0.0,
+        'stop_loss': stop_loss,
+        'add_buy_1': int(round(price + add_step * atr)),
+        'add_buy_2': int(round(price + 2 * add_step * atr)),
+        'add_buy_3': int(round(price + 3 * add_step * atr)),
+    }
@@ -0,0 +1,174 @@
+"""종목별 증분 지표 상태.
+
+새 일봉 하나가 들어올 때마다 Wilder ATR 누적값과 20일 고가/10일 저가
+단조 덱(monotonic deque)만 갱신해서 진입신호/청산신호/손절가를 상수
+시간에 다시 계산합니다. 상태는 dict 로 직렬화해서 포지션과 함께 저장할
+수 있습니다.
+
+    state = IndicatorState()
+    state.replay(df)            # 과거 일봉으로 초기화
+    signal = state.update(bar)  # 오늘 봉 하나로 갱신
+
+``replay`` 결과는 indicators.compute_indicators 와 비트 단위로 같습니다.
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from .indicators import TurtleParams, build_panel, compute_indicators
+from .market_cache import OHLCV_COLUMNS
+
+SIGNAL_KEYS = ['atr', 'upper', 'lower', 'stop', 'add1', 'entry', 'exit', 'volume_ratio', 'volume_surge']
+
+
+class MonotonicWindow:
+    """최근 ``size`` 개 값의 최고(또는 최저)값을 상수 시간에 유지하는 덱"""
+
+    def __init__(self, size, maximum=True):
+        self.size = size
+        self.maximum = maximum
+        self.items = deque()  # (봉 번호, 값), 값이 단조 감소(최고값용) 또는 증가(최저값용)
+
+    def push(self, index, value):
+        items = self.items
+        if self.maximum:
+            while items and items[-1][1] <= value:
+                items.pop()
+        else:
+            while items and items[-1][1] >= value:
+                items.pop()
+        items.append((index, value))
+        while items[0][0] <= index - self.size:
+            items.popleft()
+
+    def value(self):
+        return self.items[0][1]
+
+
+class IndicatorState:
+    """한 종목의 터틀 지표 증분 계산 상태"""
+
+    def __init__(self, params=TurtleParams()):
+        self.params = params
+        self.count = 0            # 지금까지 받은 봉 수
+        self.last_date = None
+        self.prev_close = math.nan
+        self.tr_sum = 0.0         # ATR 시작값용 TR 누적
+        self.atr = math.nan
+        self.highs = MonotonicWindow(params.entry_period, maximum=True)
+        self.lows = MonotonicWindow(params.exit_period, maximum=False)
+        self.volumes = deque(maxlen=params.volume_period)
+        self.last = None          # 마지막 update 결과
+
+    @property
+    def ready(self):
+        """모든 지표가 채워졌는지"""
+        return self.count >= self.params.warmup
+
+    def update(self, bar, date=None):
+        """일봉 하나 반영 후 신호 dict 반환.
+
+        ``bar`` 는 시가/고가/저가/종가/거래량 키를 가진 dict 또는 Series.
+        Donchian 과 거래량 평균은 당일을 뺀 직전 구간 기준입니다.
+        """
+        p = self.params
+        high = float(bar['고가'])
+        low = float(bar['저가'])
+        close = float(bar['종가'])
+        volume = float(bar['거래량'])
+        t = self.count
+
+        # ATR (indicators.wilder_atr 와 같은 순서의 연산)
+        if math.isnan(self.prev_close):
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        if t >= p.atr_period:
+            self.atr = (self.atr * (p.atr_period - 1) + tr) / p.atr_period
+        else:
+            self.tr_sum += tr
+            if t + 1 == p.atr_period:
+                self.atr = self.tr_sum / p.atr_period
+
+        # 직전 구간 채널/거래량 (당일 봉을 넣기 전에 읽음)
+        upper = self.highs.value() if t >= p.entry_period else math.nan
+        lower = self.lows.value() if t >= p.exit_period else math.nan
+        if t >= p.volume_period:
+            # indicators.window_mean 과 같은 순서(앞에서부터)로 더해야 배치와 비트 단위로 같음
+            total = 0.0
+            for v in self.volumes:
+                total += v
+            mean_volume = total / p.volume_period
+            volume_ratio = volume / mean_volume if mean_volume > 0 else math.nan
+        else:
+            volume_ratio = math.nan
+
+        self.highs.push(t, high)
+        self.lows.push(t, low)
+        self.volumes.append(volume)
+        self.prev_close = close
+        self.count = t + 1
+        self.last_date = date
+
+        self.last = {
+            'date': date,
+            'close': close,
+            'atr': self.atr,
+            'upper': upper,
+            'lower': lower,
+            'stop': close - p.stop_multiple * self.atr,
+            'add1': close + p.add_step * self.atr,
+            'entry': close > upper,
+            'exit': close < lower,
+            'volume_ratio': volume_ratio,
+            'volume_surge': volume_ratio >= p.volume_surge,
+        }
+        return self.last
+
+    def replay(self, bars):
+        """일봉 프레임 전체를 순서대로 반영하고 봉별 신호를 DataFrame 으로 반환"""
+        rows = [self.update(bar, date) for date, bar in zip(bars.index, bars[OHLCV_COLUMNS].to_dict('records'))]
+        return pd.DataFrame(rows, columns=['date', 'close'] + SIGNAL_KEYS).set_index('date')
+
+    # ---------------------------------------------------------------- 직렬화
+
+    def to_dict(self):
+        return {
+            'params': self.params.__dict__,
+            'count': self.count,
+            'last_date': None if self.last_date is None else str(pd.Timestamp(self.last_date).date()),
+            'prev_close': self.prev_close,
+            'tr_sum': self.tr_sum,
+            'atr': self.atr,
+            'highs': [list(item) for item in self.highs.items],
+            'lows': [list(item) for item in self.lows.items],
+            'volumes': list(self.volumes),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls(TurtleParams(**data['params']))
+        state.count = data['count']
+        state.last_date = None if data['last_date'] is None else pd.Timestamp(data['last_date'])
+        state.prev_close = data['prev_close']
+        state.tr_sum = data['tr_sum']
+        state.atr = data['atr']
+        state.highs.items.extend((i, v) for i, v in data['highs'])
+        state.lows.items.extend((i, v) for i, v in data['lows'])
+        state.volumes.extend(data['volumes'])
+        return state
+
+
+def matches_batch(bars, params=TurtleParams()):
+    """한 종목 일봉으로 증분 계산과 배치 계산 결과가 비트 단위로 같은지 확인"""
+    streamed = IndicatorState(params).replay(bars)
+    batch = compute_indicators(build_panel({'_': bars}), params)
+    for key in SIGNAL_KEYS:
+        a = streamed[key].to_numpy(dtype='float64')
+        b = batch[key][:, 0].astype('float64')
+        if not np.array_equal(a, b, equal_nan=True):
+            return False
+    return True
@@ -0,0 +1,342 @@
+"""종목명/종목코드 색인.
+
+신호 분석 입력창의 자유 형식 입력(삼성전자, 005930, NAVER, lg화학 ...)을
+매번 시장 전체 목록을 받아 비교하지 않고, 거래일마다 한 번 만든 색인으로
+바로 찾습니다. 색인은 버전이 붙은 디렉터리에 NumPy 배열로 저장하고
+memory-map 으로 읽습니다.
+
+- 이름 → 코드, 코드 → 이름
+- 정규화(공백/대소문자/전각) 이름, 초성(ㅅㅅㅈㅈ) 검색, 접두어 검색
+- 이름이 바뀌었거나 상장폐지된 종목의 예전 이름 별칭
+- 못 찾은 입력에 대한 유사 이름 제안
+
+    index = load_or_build('.cache/symbols')
+    tickers_dict, unresolved = index.resolve(user_input)
+"""
+
+import difflib
+import json
+import os
+import re
+import shutil
+import time
+import unicodedata
+
+import numpy as np
+
+from .lazy import stock
+from .market_hours import last_weekday, now_kst
+
+INDEX_VERSION = 1
+MARKETS = ('KOSPI', 'KOSDAQ', 'KONEX')
+# 새 목록의 종목 수가 이전 색인 상장 종목의 이 비율보다 적으면 조회 실패로 봄
+MIN_LISTING_RATIO = 0.9
+# 조회가 실패한 거래일은 이 간격(초)이 지나야 다시 받음
+RETRY_SECONDS = 15 * 60
+# resolve 가 유사 이름 제안을 붙이는 못 찾은 입력 수 (나머지는 suggest 로 필요할 때)
+SUGGEST_FIRST = 20
+# 자모 유사도 비교 기준 (difflib.get_close_matches 의 cutoff)
+SUGGEST_CUTOFF = 0.6
+
+_HANGUL_BASE = 0xAC00
+_CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+_JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+_JONGSEONG = ' ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ'
+_CODE = re.compile(r'^[0-9A-Z]{6}$')
+_STRIP = re.compile(r'\(주\)|[\s\-_.·,()]')
+_failed_at = {}   # (root, 거래일) → 마지막 조회 실패 시각
+
+
+def normalize(name):
+    """비교용 이름: 전각/반각 통일, 대문자, 공백과 (주) 등 제거"""
+    # 호환 자모(ㅅ, ㅈ ...)는 NFKC 가 조합형 자모로 바꿔 버리므로 그대로 둠
+    text = ''.join(ch if '\u3131' <= ch <= '\u318e' else unicodedata.normalize('NFKC', ch) for ch in str(name))
+    return _STRIP.sub('', text.upper())
+
+
+def to_jamo(text):
+    """한글 음절을 자모로 분해 (오타/부분 입력 유사도 비교용)"""
+    out = []
+    for ch in text:
+        offset = ord(ch) - _HANGUL_BASE
+        if 0 <= offset < 11172:
+            out.append(_CHOSEONG[offset // 588])
+            out.append(_JUNGSEONG[(offset % 588) // 28])
+            if offset % 28:
+                out.append(_JONGSEONG[offset % 28])
+        else:
+            out.append(ch)
+    return ''.join(out)
+
+
+def to_choseong(text):
+    """한글 음절은 초성만 남김 (삼성전자 → ㅅㅅㅈㅈ)"""
+    return ''.join(
+        _CHOSEONG[(ord(ch) - _HANGUL_BASE) // 588] if 0 <= ord(ch) - _HANGUL_BASE < 11172 else ch
+        for ch in text
+    )
+
+
+def _is_choseong_query(text):
+    return bool(text) and all(ch in _CHOSEONG for ch in text)
+
+
+def last_trading_day():
+    """오늘이 주말이면 직전 금요일 (YYYYMMDD, 공휴일은 고려하지 않음)"""
+    return last_weekday(now_kst().date()).strftime('%Y%m%d')
+
+
+class SymbolIndex:
+    """종목 색인. 배열은 정렬 상태로 보관하고 이분 탐색으로 찾습니다."""
+
+    ARRAYS = ('codes', 'names', 'markets', 'delisted', 'keys', 'key_codes')
+
+    def __init__(self, codes, names, markets, delisted, keys, key_codes, meta=None):
+        # 코드순 정렬된 종목 정보
+        self.codes = codes
+        self.names = names
+        self.markets = markets
+        self.delisted = delisted
+        # 정규화 이름(별칭 포함)순 정렬된 검색 키 → 코드
+        self.keys = keys
+        self.key_codes = key_codes
+        self.meta = meta or {}
+        self._jamo = None
+        self._choseong = None
+        self._jamo_buckets = None
+
+    @classmethod
+    def build(cls, listings, aliases=(), trading_day=None):
+        """``listings``: (코드, 이름, 시장, 상장폐지여부) 목록, ``aliases``: (예전 이름, 코드) 목록"""
+        listings = sorted(listings, key=lambda item: item[0])
+        codes = np.array([item[0] for item in listings], dtype='U6')
+        names = np.array([item[1] for item in listings], dtype=str)
+        markets = np.array([item[2] for item in listings], dtype=str)
+        delisted = np.array([bool(item[3]) for item in listings], dtype=bool)
+
+        pairs = {}
+        # 별칭을 먼저 넣고 현재 이름이 덮어쓰도록 (같은 이름이면 상장 종목 우선)
+        for name, code in aliases:
+            pairs[normalize(name)] = code
+        for code, name, _, _ in sorted(listings, key=lambda item: not item[3]):
+            pairs[normalize(name)] = code
+        ordered = sorted(pairs.items())
+        keys = np.array([k for k, _ in ordered], dtype=str)
+        key_codes = np.array([c for _, c in ordered], dtype='U6')
+
+        meta = {
+            'version': INDEX_VERSION,
+            'trading_day': trading_day or last_trading_day(),
+            'count': int(len(codes)),
+        }
+        return cls(codes, names, markets, delisted, keys, key_codes, meta)
+
+    # ---------------------------------------------------------------- 조회
+
+    def name_of(self, code):
+        i = np.searchsorted(self.codes, code)
+        if i < len(self.codes) and self.codes[i] == code:
+            return str(self.names[i])
+        return None
+
+    def code_of(self, name):
+        key = normalize(name)
+        i = np.searchsorted(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return str(self.key_codes[i])
+        return None
+
+    def is_delisted(self, code):
+        i = np.searchsorted(self.codes, code)
+        return bool(i < len(self.codes) and self.codes[i] == code and self.delisted[i])
+
+    def prefix(self, text, limit=10):
+        """정규화 이름이 ``text`` 로 시작하는 종목 코드 목록"""
+        key = normalize(text)
+        if not key:
+            return []
+        lo = np.searchsorted(self.keys, key, side='left')
+        hi = np.searchsorted(self.keys, key + '\U0010ffff', side='left')
+        return list(dict.fromkeys(str(c) for c in self.key_codes[lo:min(hi, lo + limit * 3)]))[:limit]
+
+    def resolve_one(self, text):
+        """입력 한 줄 → 종목코드 (못 찾으면 None)"""
+        text = text.strip()
+        if not text:
+            return None
+        upper = unicodedata.normalize('NFKC', text).upper()
+        if _CODE.match(upper) and self.name_of(upper) is not None:
+            return upper
+        return self.code_of(text)
+
+    def resolve(self, text_or_lines, include_delisted=False, suggest_first=SUGGEST_FIRST):
+        """여러 줄 입력을 ``({코드: 이름}, {못 찾은 입력: 제안 목록})`` 으로 변환.
+
+        제안은 처음 ``suggest_first`` 개의 못 찾은 입력에만 붙이고 나머지는 빈 목록
+        (필요하면 ``suggest`` 로 따로 조회).
+        """
+        lines = text_or_lines.splitlines() if isinstance(text_or_lines, str) else text_or_lines
+        tickers = {}
+        unresolved = {}
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            code = self.resolve_one(line)
+            if code is None or (self.is_delisted(code) and not include_delisted):
+                if line not in unresolved:
+                    unresolved[line] = self.suggest(line) if len(unresolved) < suggest_first else []
+            else:
+                tickers[code] = self.name_of(code)
+        return tickers, unresolved
+
+    def suggest(self, text, limit=5):
+        """비슷한 종목 제안: 접두어 → 초성 → 자모 유사도 순, ``[(코드, 이름)]``"""
+        key = normalize(text)
+        found = self.prefix(key, limit)
+
+        if len(found) < limit and _is_choseong_query(key):
+            for name_key, code in self._choseong_keys():
+                if name_key.startswith(key):
+                    found.append(code)
+                    if len(found) >= limit:
+                        break
+
+        if len(found) < limit and key:
+            jamo = to_jamo(key)
+            candidates = self._jamo_candidates(jamo)
+            for match in difflib.get_close_matches(jamo, candidates, n=limit, cutoff=SUGGEST_CUTOFF):
+                found.append(self._jamo[match])
+
+        codes = [c for c in dict.fromkeys(found) if not self.is_delisted(c)][:limit]
+        return [(c, self.name_of(c)) for c in codes]
+
+    def _choseong_keys(self):
+        if self._choseong is None:
+            self._choseong = [(to_choseong(str(k)), str(c)) for k, c in zip(self.keys, self.key_codes)]
+        return self._choseong
+
+    def _jamo_candidates(self, jamo):
+        """첫 자모가 같고 길이로 보아 cutoff 를 넘을 수 있는 자모 키만 추림"""
+        if self._jamo is None:
+            self._jamo = {to_jamo(str(k)): str(c) for k, c in zip(self.keys, self.key_codes)}
+            self._jamo_buckets = {}
+            for jamo_key in self._jamo:
+                self._jamo_buckets.setdefault(jamo_key[0], []).append(jamo_key)
+        # 유사도 2M/(a+b) 는 M <= min(a, b) 이므로 길이 차가 크면 cutoff 를 넘지 못함
+        low = len(jamo) * SUGGEST_CUTOFF / (2 - SUGGEST_CUTOFF)
+        high = len(jamo) * (2 - SUGGEST_CUTOFF) / SUGGEST_CUTOFF
+        return [k for k in self._jamo_buckets.get(jamo[0], ()) if low <= len(k) <= high]
+
+    # ---------------------------------------------------------------- 저장
+
+    def save(self, root):
+        """``{root}/{거래일}-v{버전}/`` 에 저장하고 경로 반환"""
+        path = os.path.join(root, f"{self.meta['trading_day']}-v{INDEX_VERSION}")
+        tmp = path + '.tmp'
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        for name in self.ARRAYS:
+            np.save(os.path.join(tmp, f'{name}.npy'), getattr(self, name))
+        with open(os.path.join(tmp, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r') for name in cls.ARRAYS}
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        return cls(meta=meta, **arrays)
+
+    def listings(self):
+        return list(zip(map(str, self.codes), map(str, self.names), map(str, self.markets), map(bool, self.delisted)))
+
+
+def pykrx_listings(trading_day):
+    """pykrx 로 전 시장 상장 종목 (코드, 이름, 시장, False) 목록"""
+    listings = []
+    for market in MARKETS:
+        for code in stock.get_market_ticker_list(trading_day, market=market):
+            listings.append((code, stock.get_market_ticker_name(code), market, False))
+    return listings
+
+
+def merge_with_previous(listings, previous):
+    """이전 색인에만 있는 종목은 상장폐지로 남기고, 바뀐 예전 이름은 별칭으로 반환"""
+    current = {code: name for code, name, _, _ in listings}
+    aliases = []
+    merged = list(listings)
+    if previous is not None:
+        for code, name, market, _ in previous.listings():
+            if code not in current:
+                merged.append((code, name, market, True))
+            elif current[code] != name:
+                aliases.append((name, code))
+        # 예전 색인이 갖고 있던 별칭도 유지
+        for key, code in zip(previous.keys, previous.key_codes):
+            if str(code) in current and normalize(current[str(code)]) != str(key):
+                aliases.append((str(key), str(code)))
+    return merged, aliases
+
+
+def _versions(root):
+    if not os.path.isdir(root):
+        return []
+    suffix = f'-v{INDEX_VERSION}'
+    return sorted(d for d in os.listdir(root) if d.endswith(suffix))
+
+
+def listing_looks_complete(listings, previous, min_ratio=MIN_LISTING_RATIO):
+    """받은 목록이 비었거나 이전 색인보다 크게 줄었으면 False (pykrx 일시 오류로 잘린 응답)"""
+    if not listings:
+        return False
+    if previous is None:
+        return True
+    listed = int(np.count_nonzero(~np.asarray(previous.delisted, dtype=bool)))
+    return len(listings) >= listed * min_ratio
+
+
+def load_or_build(root='.cache/symbols', trading_day=None, fetch_listings=pykrx_listings, keep=3,
+                  retry_seconds=RETRY_SECONDS, clock=time.monotonic):
+    """거래일(기본 ``last_trading_day()``) 색인이 있으면 읽고, 없으면 새로 만들어 저장 (오래된 버전은 ``keep`` 개만 유지).
+
+    목록 조회가 실패하거나 비었거나 크게 줄었으면 이전 색인을 그대로 돌려주고 오늘 색인은
+    쓰지 않습니다. 실패한 거래일은 ``retry_seconds`` 가 지난 뒤 호출에서만 다시 받습니다.
+    이전 색인도 없으면 기다리지 않고 매번 받아 보고, 실패하면 예외를 올립니다.
+    """
+    trading_day = trading_day or last_trading_day()
+    path = os.path.join(root, f'{trading_day}-v{INDEX_VERSION}')
+    if os.path.exists(os.path.join(path, 'meta.json')):
+        return SymbolIndex.load(path)
+
+    versions = _versions(root)
+    previous = SymbolIndex.load(os.path.join(root, versions[-1])) if versions else None
+    attempt = (os.path.abspath(root), trading_day)
+    failed_at = _failed_at.get(attempt)
+    if previous is not None and failed_at is not None and clock() - failed_at < retry_seconds:
+        return previous
+
+    try:
+        listings = list(fetch_listings(trading_day))
+    except Exception:
+        _failed_at[attempt] = clock()
+        if previous is None:
+            raise
+        return previous
+    if not listing_looks_complete(listings, previous):
+        _failed_at[attempt] = clock()
+        if previous is None:
+            raise ValueError(f'{trading_day} 종목 목록을 받지 못했습니다')
+        return previous
+    _failed_at.pop(attempt, None)
+    listings, aliases = merge_with_previous(listings, previous)
+    index = SymbolIndex.build(listings, aliases, trading_day)
+    os.makedirs(root, exist_ok=True)
+    index.save(root)
+
+    for old in _versions(root)[:-keep]:
+        shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+    return index
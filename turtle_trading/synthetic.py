@@ -0,0 +1,127 @@
+"""pykrx 를 대신하는 가짜 시세 소스.
+
+네트워크 없이 배치 조회, 백테스트, 벤치마크를 돌릴 때 씁니다.
+같은 종목코드는 항상 같은 랜덤워크 일봉을 돌려줍니다.
+"""
+
+import threading
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from .market_cache import OHLCV_COLUMNS
+
+BASE_DATE = pd.Timestamp('2000-01-03')
+
+
+def business_days(start, end):
+    """[start, end] 평일 DatetimeIndex (pd.bdate_range 보다 훨씬 빠름)"""
+    days = np.arange(np.datetime64(pd.Timestamp(start).date()),
+                     np.datetime64(pd.Timestamp(end).date()) + 1, dtype='datetime64[D]')
+    return pd.DatetimeIndex(days[np.is_busday(days)].astype('datetime64[ns]'), name='날짜')
+
+
+def synthetic_ohlcv(ticker, dates, seed=0):
+    """종목코드로 시드를 정해 ``dates`` 길이의 일봉 프레임 생성"""
+    rng = np.random.default_rng(zlib.crc32(ticker.encode()) + seed)
+    n = len(dates)
+
+    # 추세 구간이 섞인 로그 랜덤워크
+    drift = np.repeat(rng.normal(0, 0.002, n // 60 + 1), 60)[:n]
+    returns = drift + rng.normal(0, 0.018, n)
+    close = np.round(rng.uniform(5000, 200000) * np.exp(np.cumsum(returns)), -1)
+    open_ = np.round(close * (1 + rng.normal(0, 0.006, n)), -1)
+    spread = np.abs(rng.normal(0, 0.012, n)) * close
+    high = np.round(np.maximum(open_, close) + spread, -1)
+    low = np.round(np.maximum(np.minimum(open_, close) - spread, 10), -1)
+    volume = np.round(rng.lognormal(12, 0.6, n))
+
+    return pd.DataFrame(
+        np.column_stack([open_, high, low, close, volume]),
+        index=pd.DatetimeIndex(dates, name='날짜'),
+        columns=OHLCV_COLUMNS,
+    )
+
+
+def synthetic_universe(n_tickers, n_days, seed=0, end='2025-12-30'):
+    """``n_tickers`` 개 종목 × ``n_days`` 영업일 프레임 사전 (벤치마크용)"""
+    end = pd.Timestamp(end)
+    dates = business_days(end - pd.Timedelta(days=n_days * 7 // 5 + 7), end)[-n_days:]
+    return {
+        f'{i:06d}': synthetic_ohlcv(f'{i:06d}', dates, seed)
+        for i in range(n_tickers)
+    }
+
+
+class FakeKrx:
+    """``pykrx_fetch(ticker, start, end)`` 와 같은 호출 형태의 가짜 데이터 소스.
+
+    - ``latency``: 호출마다 지연(초)
+    - ``fail_rate``: 일시적 오류(ConnectionError) 발생 확률
+    - ``missing``: 빈 프레임을 돌려줄 종목코드 (상장폐지/오타 흉내)
+    """
+
+    # 네트워크를 쓰지 않으므로 호스트 속도 제한이 필요 없음
+    rate_limited = True
+
+    def __init__(self, latency=0.0, fail_rate=0.0, missing=(), seed=0):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.missing = set(missing)
+        self.seed = seed
+        self.calls = 0
+        self._series = {}
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker, start, end):
+        with self._lock:
+            self.calls += 1
+            failed = self._rng.random() < self.fail_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            raise ConnectionError(f'가짜 네트워크 오류: {ticker}')
+        if ticker in self.missing:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+        # 기준일부터 생성해서 잘라야 조회 구간이 달라도 같은 값이 나옴
+        end = pd.Timestamp(end).normalize()
+        frame = self._series.get(ticker)
+        if frame is None or frame.index[-1] < end - pd.Timedelta(days=3):
+            dates = business_days(BASE_DATE, max(end, pd.Timestamp.now().normalize()))
+            frame = self._series[ticker] = synthetic_ohlcv(ticker, dates, self.seed)
+        return frame.loc[pd.Timestamp(start).normalize():end]
+
+    def get_market_data(self, ticker, days=60):
+        """turtle_system.get_market_data 와 같은 형태"""
+        end = pd.Timestamp.now().normalize()
+        return self(ticker, end - pd.Timedelta(days=days), end)
+
+
+class PriceFeed:
+    """종목별 마지막 종가만 바꿀 수 있는 25일짜리 평평한 일봉 (turtle_system.get_market_data 형태).
+
+    포지션 갱신/장중 감시를 특정 가격에서 확인할 때 씁니다. ``before_return`` 을 주면
+    일봉을 돌려주기 직전에 호출합니다 (조회 중 다른 세션의 변경 흉내).
+    """
+
+    # 네트워크를 쓰지 않으므로 호스트 속도 제한이 필요 없음
+    rate_limited = True
+
+    def __init__(self, **prices):
+        self.prices = prices
+        self.calls = 0
+        self.before_return = None
+
+    def get_market_data(self, ticker, days=60):
+        self.calls += 1
+        if self.before_return is not None:
+            self.before_return()
+        index = pd.bdate_range('2026-09-01', periods=25, name='날짜')
+        close = np.full(25, 100.0)
+        close[-1] = self.prices[ticker]
+        return pd.DataFrame({'시가': close, '고가': close + 1, '저가': close - 1,
+                             '종가': close, '거래량': 1000.0}, index=index)
@@ -0,0 +1,181 @@
+"""장중 보유 포지션 감시.
+
+KRX 정규장(평일 09:00~15:30 KST) 동안 정해진 간격으로 미청산 포지션 시세를
+받아 손절/청산 조건을 확인하고, 새로 발생한 신호를 알림 큐에 넣습니다.
+Streamlit 화면은 rerun 마다 ``queue.drain()`` 으로 쌓인 알림을 가져가면 됩니다.
+같은 종목, 같은 종류 알림이 여러 번 생기면 큐에는 가장 최근 것 하나만 남습니다
+(가져가기 전의 손절 알림을 뒤이은 추가매수 알림이 지우지 않음).
+
+    watcher = MarketWatcher(store, turtle_system, interval=60)
+    watcher.start()
+    ...
+    for alert in watcher.queue.drain():
+        st.error(f"🚨 {alert.name} - {alert.kind} 신호!")
+
+시계(``clock``)와 대기(``sleep``)를 주입할 수 있어서 SimulatedClock 과
+synthetic.FakeKrx 로 실제 시간을 기다리지 않고 돌려볼 수 있습니다.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from .market_hours import is_market_open, next_open, now_kst
+from .position_store import STATUS_STOP
+from .position_update import update_positions
+
+
+@dataclass
+class Alert:
+    ticker: str
+    name: str
+    kind: str          # '손절' / '익절' / '추가매수'
+    price: float
+    level: float       # 넘은 가격 (손절가/청산기준/다음매수가)
+    time: datetime
+    position_ids: tuple = ()
+
+
+class AlertQueue:
+    """(종목코드, 종류) 기준으로 합쳐지는 알림 큐 (스레드 안전)"""
+
+    def __init__(self):
+        self._pending = OrderedDict()
+        self._cond = threading.Condition()
+        self.published = 0
+        self.coalesced = 0
+
+    def publish(self, alert):
+        with self._cond:
+            self.published += 1
+            key = (alert.ticker, alert.kind)
+            if key in self._pending:
+                # 아직 안 가져간 같은 종목/종류 알림은 최신 것으로 교체
+                self.coalesced += 1
+                del self._pending[key]
+            self._pending[key] = alert
+            self._cond.notify_all()
+
+    def drain(self):
+        """쌓인 알림을 모두 꺼내 발생 순서대로 반환"""
+        with self._cond:
+            alerts = list(self._pending.values())
+            self._pending.clear()
+            return alerts
+
+    def wait(self, timeout=None):
+        """알림이 생길 때까지 대기 후 drain (별도 워커 프로세스에서 구독할 때)"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending, timeout)
+        return self.drain()
+
+    def __len__(self):
+        with self._cond:
+            return len(self._pending)
+
+
+class SimulatedClock:
+    """테스트용 시계. ``sleep`` 하면 실제로 기다리지 않고 시각만 넘어감"""
+
+    def __init__(self, start):
+        self.current = start
+
+    def __call__(self):
+        return self.current
+
+    def sleep(self, seconds):
+        self.current += timedelta(seconds=seconds)
+
+    def advance(self, **delta):
+        self.current += timedelta(**delta)
+
+
+class MarketWatcher:
+    """장중 주기적으로 포지션을 갱신하고 새 청산/추가매수 신호를 알림 큐로 보냄"""
+
+    def __init__(self, store, turtle_system, interval=60, queue=None, clock=now_kst,
+                 sleep=None, **update_options):
+        self.store = store
+        self.turtle_system = turtle_system
+        self.interval = interval
+        self.queue = queue or AlertQueue()
+        self.clock = clock
+        self.update_options = update_options
+        self.polls = 0
+        self.errors = 0
+        self.last_error = None
+        self._stop = threading.Event()
+        self._sleep = sleep or self._stop.wait
+        self._thread = None
+        self._notified = {}   # (종목코드, 종류) -> 알린 가격 수준, 같은 신호 반복 방지
+
+    def poll_once(self):
+        """한 번 갱신하고 새로 보낸 알림 목록 반환"""
+        now = self.clock()
+        report = update_positions(self.store, self.turtle_system, **self.update_options)
+        self.polls += 1
+        alerts = []
+
+        for ticker, rows in _group(report.crossed).items():
+            stop = rows[0]['상태'] == STATUS_STOP
+            kind, level = ('손절', rows[0]['손절가']) if stop else ('익절', rows[0]['청산기준'])
+            alerts.append(Alert(ticker, rows[0]['종목명'], kind, rows[0]['현재가'], level,
+                                now, tuple(r['포지션ID'] for r in rows)))
+
+        active = set()
+        for row in report.add_ready:
+            key = (row['종목코드'], '추가매수')
+            active.add(key)
+            if self._notified.get(key) != row['다음매수가']:
+                self._notified[key] = row['다음매수가']
+                alerts.append(Alert(row['종목코드'], row['종목명'], '추가매수', row['현재가'],
+                                    row['다음매수가'], now))
+        # 가격이 다시 내려간 종목은 다음에 넘으면 다시 알림
+        for key in [k for k in self._notified if k not in active]:
+            del self._notified[key]
+
+        for alert in alerts:
+            self.queue.publish(alert)
+        return alerts
+
+    def step(self):
+        """장중이면 갱신, 다음 대기 시간(초) 반환"""
+        now = self.clock()
+        if not is_market_open(now):
+            return min(self.interval * 10, max(1.0, (next_open(now) - now).total_seconds()))
+        try:
+            self.poll_once()
+        except Exception as e:  # 시세 오류로 감시 스레드가 죽지 않도록
+            self.errors += 1
+            self.last_error = e
+        return self.interval
+
+    def run(self, max_steps=None):
+        steps = 0
+        while not self._stop.is_set() and (max_steps is None or steps < max_steps):
+            self._sleep(self.step())
+            steps += 1
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name='market-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+
+def _group(rows):
+    groups = OrderedDict()
+    for row in rows:
+        groups.setdefault(row['종목코드'], []).append(row)
+    return groups